@@ -0,0 +1,115 @@
+"""
+Benchmark: object-dtype cleaners vs typed, rule-table cleaners.
+
+Usage:
+    python -m benchmarks.bench_cleaning --years 30
+
+The previous implementations are kept here as the reference. Both are
+checked to keep the same rows, then timed and their peak traced memory
+(tracemalloc) is reported.
+"""
+
+import argparse
+import time
+import tracemalloc
+import warnings
+
+import pandas as pd
+
+from benchmarks.synthetic import daily_frame, hourly_frame
+from src.celan_and_validate.clean_and_validate import (
+    MAX_TEMP,
+    MIN_TEMP,
+    clean_and_validate_days,
+    clean_and_validate_hours,
+)
+from src.utils.utils import rename_index_to_time
+
+
+def clean_hours_object(df_hourly, temp_col="temp"):
+    """Previous `clean_and_validate_hours`."""
+    df_hourly = rename_index_to_time(df_hourly)
+    df_hourly["time"] = pd.to_datetime(
+        df_hourly["time"], format="%Y-%m-%d %H:%M:%S", errors="coerce"
+    )
+    df_hourly["time"] = df_hourly["time"].where(df_hourly["time"].notna(), None)
+    cols_to_check = df_hourly.columns.difference(["time"])
+    mask = (df_hourly[cols_to_check].isna()) | (df_hourly[cols_to_check] == 0)
+    df_hourly = df_hourly[~mask.all(axis=1)]
+    df_hourly.replace({pd.NA: None}, inplace=True)
+    if temp_col in df_hourly.columns:
+        df_hourly = df_hourly[
+            (df_hourly[temp_col] >= MIN_TEMP) & (df_hourly[temp_col] <= MAX_TEMP)
+        ]
+    if "coco" in df_hourly.columns:
+        df_hourly["coco"] = pd.to_numeric(df_hourly["coco"], errors="coerce").astype(
+            "Int64"
+        )
+    return df_hourly
+
+
+def clean_days_object(df, temp_col="tavg"):
+    """Previous `clean_and_validate_days`."""
+    df = rename_index_to_time(df)
+    df["time"] = pd.to_datetime(df["time"]).dt.date
+    df = df.where(pd.notna(df), None)
+    df = df.astype(object)
+    cols_to_check = df.columns.difference(["time"])
+    mask = (df[cols_to_check].isna()) | (df[cols_to_check] == 0)
+    df = df[~mask.all(axis=1)]
+    df.replace({pd.NA: None}, inplace=True)
+    if temp_col in df.columns:
+        df = df[(df[temp_col] >= MIN_TEMP) & (df[temp_col] <= MAX_TEMP)]
+    return df
+
+
+def measure(func, df):
+    """Return (best seconds of 3, peak traced bytes, result)."""
+    timings = []
+    for _ in range(3):
+        frame = df.copy()
+        start = time.perf_counter()
+        result = func(frame)
+        timings.append(time.perf_counter() - start)
+
+    frame = df.copy()
+    tracemalloc.start()
+    func(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=30)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    cases = [
+        (
+            "hourly",
+            hourly_frame(args.years * 8760),
+            clean_hours_object,
+            clean_and_validate_hours,
+        ),
+        (
+            "daily",
+            daily_frame(args.years * 365),
+            clean_days_object,
+            clean_and_validate_days,
+        ),
+    ]
+    for name, df, old_func, new_func in cases:
+        t_old, m_old, old = measure(old_func, df)
+        t_new, m_new, new = measure(new_func, df)
+        assert old.index.equals(new.index), f"{name}: kept rows differ"
+        print(
+            f"{name:>6}: {len(df)} rows | object {t_old:6.3f}s {m_old / 2**20:7.1f} MiB "
+            f"| typed {t_new:6.3f}s {m_new / 2**20:7.1f} MiB "
+            f"| {t_old / t_new:4.1f}x faster, {m_old / m_new:4.1f}x less memory"
+        )
+
+
+if __name__ == "__main__":
+    main()
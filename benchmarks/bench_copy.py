@@ -0,0 +1,137 @@
+"""
+Benchmark: CSV COPY path vs binary COPY writer for hourly frames.
+
+Usage:
+    python -m benchmarks.bench_copy --years 30
+    python -m benchmarks.bench_copy --years 30 --db   # also COPY into Postgres
+
+Client side, both encoders are timed and their peak traced memory is
+reported. With `--db` both are also copied into a temporary table, the
+binary one through `copy_binary` (uses the DB_* settings of
+`src.utils.connect_db`).
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import hourly_frame
+from src.celan_and_validate.clean_and_validate import clean_and_validate_hours
+from src.utils.binary_copy import (
+    HOURLY_COPY_TYPES,
+    IteratorReader,
+    copy_binary,
+    iter_binary_copy,
+)
+from src.utils.constants import COLS_HOURLY
+
+STATION_ID = 15120
+
+
+def csv_stream(df):
+    """The previous CSV COPY encoding: object frame + CSV text."""
+    df_out = df.assign(station_id=STATION_ID)[COLS_HOURLY]
+    df_out = df_out.astype(object).where(pd.notna(df_out), None)
+    buffer = io.StringIO()
+    df_out.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    return buffer
+
+
+def binary_stream(df):
+    return io.BufferedReader(
+        IteratorReader(
+            iter_binary_copy(
+                df, COLS_HOURLY, HOURLY_COPY_TYPES, {"station_id": STATION_ID}
+            )
+        ),
+        buffer_size=1 << 16,
+    )
+
+
+def drain(stream):
+    """Read a stream to the end and return its size in bytes."""
+    size = 0
+    while True:
+        block = stream.read(1 << 16)
+        if not block:
+            return size
+        size += len(block)
+
+
+def measure(func, df):
+    """
+    Return (seconds, peak traced bytes, encoded bytes) of a full encode.
+    Time and memory are measured in separate runs, tracing slows Python down.
+    """
+    start = time.perf_counter()
+    size = drain(func(df))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    drain(func(df))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def copy_into_db(df):
+    from src.utils.connect_db import connect_to_db
+
+    conn = connect_to_db()
+    cols = ", ".join(COLS_HOURLY)
+    results = {}
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TEMP TABLE bench_hourly AS "
+            f"SELECT {cols} FROM weather_data_hourly WITH NO DATA;"
+        )
+        start = time.perf_counter()
+        cur.copy_expert(
+            f"COPY bench_hourly ({cols}) FROM STDIN WITH (FORMAT CSV, NULL '');",
+            csv_stream(df),
+        )
+        results["csv"] = time.perf_counter() - start
+
+        cur.execute("TRUNCATE bench_hourly;")
+        start = time.perf_counter()
+        copy_binary(
+            cur,
+            "bench_hourly",
+            df,
+            COLS_HOURLY,
+            HOURLY_COPY_TYPES,
+            constants={"station_id": STATION_ID},
+        )
+        results["binary"] = time.perf_counter() - start
+    conn.rollback()
+    conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--db", action="store_true", help="also COPY into Postgres")
+    args = parser.parse_args()
+
+    df = clean_and_validate_hours(hourly_frame(args.years * 8760))
+    print(f"Hourly rows: {len(df)} ({args.years} years)")
+
+    for name, func in [("csv", csv_stream), ("binary", binary_stream)]:
+        elapsed, peak, size = measure(func, df)
+        print(
+            f"{name:>7}: encode {elapsed:7.3f}s, peak {peak / 2**20:8.1f} MiB, "
+            f"stream {size / 2**20:8.1f} MiB"
+        )
+
+    if args.db:
+        for name, elapsed in copy_into_db(df).items():
+            print(f"{name:>7}: encode + COPY {elapsed:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
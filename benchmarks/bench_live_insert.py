@@ -0,0 +1,105 @@
+"""
+Benchmark: per-station INSERT + commit vs one bulk insert for weather_live.
+
+Usage:
+    python -m benchmarks.bench_live_insert --stations 50 500 5000
+
+Needs a local Postgres with the project schema (DB_* settings of
+`src.utils.connect_db`). Synthetic stations are created with ids from
+SYNTHETIC_WMO_START and removed again at the end.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from src.ingestion.get_current_data import build_weather_record, insert_weather_live
+from src.utils.connect_db import connect_to_db
+
+SYNTHETIC_WMO_START = 9_000_000
+PAYLOAD = json.loads(
+    (Path(__file__).parents[1] / "tests" / "data" / "onecall_current.json").read_text()
+)
+
+INSERT_ONE = """
+INSERT INTO weather_live (
+    station_id, lat, lon, timezone, timezone_offset,
+    dt, sunrise, sunset, temp, feels_like, pressure,
+    humidity, dew_point, uvi, clouds, visibility,
+    wind_speed, wind_deg, wind_gust,
+    weather_id, weather_main, weather_description, weather_icon
+)
+VALUES (
+    %(station_id)s,
+    %(lat)s, %(lon)s, %(timezone)s, %(timezone_offset)s,
+    %(dt)s, %(sunrise)s, %(sunset)s, %(temp)s, %(feels_like)s,
+    %(pressure)s, %(humidity)s, %(dew_point)s, %(uvi)s,
+    %(clouds)s, %(visibility)s, %(wind_speed)s, %(wind_deg)s,
+    %(wind_gust)s, %(weather_id)s, %(weather_main)s,
+    %(weather_description)s, %(weather_icon)s
+);
+"""
+
+
+def per_station(conn, records):
+    """Previous behaviour: one cursor, INSERT and commit per station."""
+    for record in records:
+        cur = conn.cursor()
+        cur.execute(INSERT_ONE, record)
+        conn.commit()
+        cur.close()
+
+
+def bulk(conn, records):
+    insert_weather_live(conn, records)
+
+
+def setup_stations(conn, n):
+    ids = range(SYNTHETIC_WMO_START, SYNTHETIC_WMO_START + n)
+    with conn.cursor() as cur:
+        cur.executemany(
+            "INSERT INTO stations (name, country, wmo, timezone) "
+            "VALUES (%s, 'RO', %s, 'Europe/Bucharest') ON CONFLICT DO NOTHING;",
+            [(f"synthetic {i}", i) for i in ids],
+        )
+    conn.commit()
+    return [build_weather_record(PAYLOAD, i) for i in ids]
+
+
+def cleanup(conn):
+    with conn.cursor() as cur:
+        cur.execute(
+            "DELETE FROM weather_live WHERE station_id >= %s;", (SYNTHETIC_WMO_START,)
+        )
+        cur.execute("DELETE FROM stations WHERE wmo >= %s;", (SYNTHETIC_WMO_START,))
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stations", type=int, nargs="+", default=[50, 500, 5000])
+    args = parser.parse_args()
+
+    conn = connect_to_db()
+    try:
+        for n in args.stations:
+            records = setup_stations(conn, n)
+            timings = {}
+            for name, func in [("per-station", per_station), ("bulk", bulk)]:
+                start = time.perf_counter()
+                func(conn, records)
+                timings[name] = time.perf_counter() - start
+            print(
+                f"{n:>5} stations: per-station {timings['per-station']:7.3f}s, "
+                f"bulk {timings['bulk']:7.3f}s "
+                f"({timings['per-station'] / timings['bulk']:5.1f}x)"
+            )
+            cleanup(conn)
+    finally:
+        cleanup(conn)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: peak memory per row of the hourly pipeline, float64/object vs
+the compact schema.
+
+Usage:
+    python -m benchmarks.bench_memory --years 50
+
+One multi-decade station is pushed through clean -> binary COPY encoding
+(the stream is consumed, nothing is written). "object" is the previous
+path: float64 frames cleaned to object dtype with a repeated station_id
+column. "compact" converts the fetched frame to float32/Int8 and passes
+station_id as a scalar. Peak traced memory (tracemalloc) and the size of
+the cleaned frame are reported per row.
+"""
+
+import argparse
+import tracemalloc
+import warnings
+
+from benchmarks.bench_cleaning import clean_hours_object
+from benchmarks.synthetic import hourly_frame
+from src.celan_and_validate.clean_and_validate import (
+    clean_and_validate_hours,
+    to_typed_columns,
+)
+from src.utils.binary_copy import HOURLY_COPY_TYPES, iter_binary_copy
+from src.utils.constants import COLS_HOURLY
+
+STATION_ID = 15120
+
+
+def object_pipeline(raw):
+    df = clean_hours_object(raw)
+    df["station_id"] = STATION_ID
+    for _ in iter_binary_copy(df, COLS_HOURLY, HOURLY_COPY_TYPES):
+        pass
+    return df
+
+
+def compact_pipeline(raw):
+    df = clean_and_validate_hours(to_typed_columns(raw))
+    constants = {"station_id": STATION_ID}
+    for _ in iter_binary_copy(df, COLS_HOURLY, HOURLY_COPY_TYPES, constants):
+        pass
+    return df
+
+
+def measure(pipeline, raw):
+    """Return (peak traced bytes, cleaned frame bytes) of one run."""
+    frame = raw.copy()
+    tracemalloc.start()
+    df = pipeline(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, int(df.memory_usage(deep=True).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=50)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    raw = hourly_frame(args.years * 8760)
+    n_rows = len(raw)
+    print(f"{args.years} years, {n_rows} hourly rows")
+
+    results = {}
+    for name, pipeline in [("object", object_pipeline), ("compact", compact_pipeline)]:
+        peak, frame_bytes = measure(pipeline, raw)
+        results[name] = peak
+        print(
+            f"{name:>8}: peak {peak / n_rows:7.1f} B/row ({peak / 2**20:6.1f} MiB) "
+            f"| cleaned frame {frame_bytes / n_rows:6.1f} B/row"
+        )
+    print(f"peak reduction: {results['object'] / results['compact']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark: row-wise `execute_values` records vs `upsert_to_db`.
+
+Usage:
+    python -m benchmarks.bench_records --years 30
+
+The first write path (per-cell getattr/pd.notna on an object copy of the
+frame, then `execute_values`) is kept here as the reference. It is timed
+against the client side of `upsert_to_db`, the binary COPY of
+`copy_binary` into the staging table, on a connection that reads the
+COPY stream like the server does.
+"""
+
+import argparse
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from benchmarks.synthetic import daily_frame, hourly_frame
+from src.celan_and_validate.clean_and_validate import (
+    clean_and_validate_days,
+    clean_and_validate_hours,
+)
+from src.utils.binary_copy import DAILY_COPY_TYPES, HOURLY_COPY_TYPES
+from src.utils.constants import COLS_DAILY, COLS_HOURLY
+from src.utils.utils import upsert_to_db
+
+STATION_ID = 15120
+
+
+def prepare_to_records_rowwise(df: pd.DataFrame, station_id: int, cols: list):
+    """Records of the first `execute_values` write path."""
+    df["station_id"] = station_id
+    df = df[cols].where(pd.notna(df[cols]), None)
+    df = df[cols].astype(object)
+    return [
+        tuple(
+            getattr(row, col) if pd.notna(getattr(row, col)) else None for col in cols
+        )
+        for row in df.itertuples(index=False)
+    ]
+
+
+def draining_connection():
+    """Connection whose COPY reads the whole stream and counts its bytes."""
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    conn.copied = 0
+
+    def drain(sql, file, size=8192):
+        while block := file.read(1 << 16):
+            conn.copied += len(block)
+
+    cur.copy_expert.side_effect = drain
+    return conn
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=30)
+    args = parser.parse_args()
+
+    frames = [
+        (
+            "hourly",
+            clean_and_validate_hours(hourly_frame(args.years * 8760)),
+            "weather_data_hourly",
+            COLS_HOURLY,
+            HOURLY_COPY_TYPES,
+        ),
+        (
+            "daily",
+            clean_and_validate_days(daily_frame(args.years * 365)),
+            "weather_data_daily",
+            COLS_DAILY,
+            DAILY_COPY_TYPES,
+        ),
+    ]
+    for name, df, table, cols, types in frames:
+        conn = draining_connection()
+        upsert_to_db(df, conn, STATION_ID, table, cols, types)
+        assert conn.copied > 0, f"{name}: nothing copied"
+
+        t_old = best_of(lambda: prepare_to_records_rowwise(df.copy(), STATION_ID, cols))
+        t_new = best_of(lambda: upsert_to_db(df, conn, STATION_ID, table, cols, types))
+        print(
+            f"{name:>6}: {len(df)} rows, row-wise records {t_old:7.3f}s, "
+            f"upsert_to_db {t_new:7.3f}s ({t_old / t_new:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
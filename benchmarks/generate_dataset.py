@@ -0,0 +1,345 @@
+"""
+Generate a reproducible nationwide synthetic weather database.
+
+Usage:
+    python -m benchmarks.generate_dataset --stations 41 --years 50
+    python -m benchmarks.generate_dataset --stations 400 --years 10 \\
+        --live-days 365 --db weather_scale --create-db
+
+Fills the schema of `postgresql/create_tables.sql` (created if missing)
+with synthetic stations spread over all 41 counties, hourly and daily
+history back `--years` years and `--live-days` of `weather_live`
+snapshots every `--live-interval-min` minutes (plus the newest one in
+`weather_live_latest`), with the monthly/yearly rollups refreshed.
+Temperatures follow the season and the time of day and drop with
+elevation and latitude.
+
+Hourly/daily rows are written with binary COPY, live rows with CSV COPY
+(the table has text and DECIMAL columns). Generated stations use WMO ids
+from GENERATED_WMO_START; a new run replaces them, real stations are not
+touched. The same `--seed` always produces the same database.
+"""
+
+import argparse
+import io
+import time
+import warnings
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from benchmarks.synthetic import daily_frame, hourly_frame
+from src.celan_and_validate.clean_and_validate import (
+    clean_and_validate_days,
+    clean_and_validate_hours,
+)
+from src.ingestion.load_data import create_tables, run_migrations
+from src.utils import connect_db
+from src.utils.binary_copy import DAILY_COPY_TYPES, HOURLY_COPY_TYPES, copy_binary
+from src.utils.constants import (
+    COLS_DAILY,
+    COLS_HOURLY,
+    COLS_LIVE,
+    COLS_STATIONS,
+    ROLLUP_TABLES,
+)
+from src.utils.partitions import ensure_partitions
+from src.utils.rollups import refresh_rollups
+
+# Below the ids of bench_live_insert, which removes wmo >= 9_000_000
+GENERATED_WMO_START = 8_000_000
+GENERATED_WMO_END = 9_000_000
+
+COUNTIES = [
+    "AB", "AR", "AG", "BC", "BH", "BN", "BT", "BV", "BR", "BZ", "CS",
+    "CL", "CJ", "CT", "CV", "DB", "DJ", "GL", "GR", "GJ", "HR", "HD",
+    "IL", "IS", "IF", "MM", "MH", "MS", "NT", "OT", "PH", "SM", "SJ",
+    "SB", "SV", "TR", "TM", "TL", "VS", "VL", "VN",
+]  # fmt: skip
+
+# Bounding box of Romania
+LAT_RANGE = (43.7, 48.2)
+LON_RANGE = (20.4, 29.6)
+MEAN_LAT = 45.9
+
+# (id, main, description, icon) of the generated live conditions
+CONDITIONS = [
+    (800, "Clear", "clear sky", "01d"),
+    (802, "Clouds", "scattered clouds", "03d"),
+    (804, "Clouds", "overcast clouds", "04d"),
+    (500, "Rain", "light rain", "10d"),
+    (600, "Snow", "light snow", "13d"),
+    (741, "Fog", "fog", "50d"),
+]
+
+
+def station_catalog(n_stations: int, start: pd.Timestamp, rng) -> pd.DataFrame:
+    """Synthetic stations, spread round-robin over the counties."""
+    wmo = GENERATED_WMO_START + np.arange(n_stations)
+    region = [COUNTIES[i % len(COUNTIES)] for i in range(n_stations)]
+    end = pd.Timestamp.today().normalize()
+    return pd.DataFrame(
+        {
+            "name": [f"Synthetic {r} {i}" for i, r in enumerate(region)],
+            "country": "RO",
+            "region": region,
+            "wmo": wmo,
+            "icao": None,
+            "latitude": rng.uniform(*LAT_RANGE, n_stations).round(4),
+            "longitude": rng.uniform(*LON_RANGE, n_stations).round(4),
+            # Mostly lowland, some mountain stations
+            "elevation": rng.gamma(1.5, 250, n_stations).clip(0, 2500).round(0),
+            "timezone": "Europe/Bucharest",
+            "hourly_start": start,
+            "hourly_end": end,
+            "daily_start": start,
+            "daily_end": end,
+        }
+    )[COLS_STATIONS]
+
+
+def climate_offset(station) -> float:
+    """Temperature offset of a station: -6.5 °C/km and colder to the north."""
+    return -6.5 * station.elevation / 1000 - 0.6 * (station.latitude - MEAN_LAT)
+
+
+def station_history(station, start: pd.Timestamp, end: pd.Timestamp, seed: int):
+    """Cleaned hourly and daily frames of one station."""
+    offset = climate_offset(station)
+
+    n_hours = int((end - start) / pd.Timedelta(hours=1)) + 1
+    hourly = hourly_frame(n_hours, start=start, seed=seed)
+    hourly[["temp", "dwpt"]] += offset
+
+    n_days = (end.normalize() - start).days + 1
+    daily = daily_frame(n_days, start=start, seed=seed)
+    daily[["tavg", "tmin", "tmax"]] += offset
+
+    return clean_and_validate_hours(hourly), clean_and_validate_days(daily)
+
+
+def live_snapshots(station, end: pd.Timestamp, days: int, interval_min: int, seed):
+    """`weather_live` rows of one station, one every `interval_min` minutes."""
+    rng = np.random.default_rng(seed)
+    utc = pd.date_range(
+        end=end.tz_localize(
+            "Europe/Bucharest", ambiguous=True, nonexistent="shift_forward"
+        )
+        .tz_convert("UTC")
+        .floor("min"),
+        periods=days * 24 * 60 // interval_min,
+        freq=f"{interval_min}min",
+    )
+    local = utc.tz_convert("Europe/Bucharest")
+    dt = local.tz_localize(None)
+    n = len(dt)
+
+    day = dt.dayofyear.to_numpy()
+    hour = dt.hour.to_numpy() + dt.minute.to_numpy() / 60
+    season = -np.cos(2 * np.pi * (day - 15) / 365.25)
+    temp = (
+        10
+        + 12 * season
+        - 4 * np.cos(2 * np.pi * (hour - 3) / 24)
+        + climate_offset(station)
+        + rng.normal(0, 2.0, n)
+    )
+    wind_speed = rng.gamma(2.0, 1.5, n)
+    daylight = 12 + 3.5 * season
+    sunrise = dt.normalize() + pd.to_timedelta(12 - daylight / 2, unit="h")
+    sun_up = np.clip(np.sin(np.pi * (hour - (12 - daylight / 2)) / daylight), 0, None)
+    condition = rng.integers(0, len(CONDITIONS), n)
+    codes = pd.DataFrame(
+        CONDITIONS, columns=["weather_id", "main", "description", "icon"]
+    ).iloc[condition]
+
+    return pd.DataFrame(
+        {
+            "station_id": station.wmo,
+            "lat": station.latitude,
+            "lon": station.longitude,
+            "timezone": "Europe/Bucharest",
+            "timezone_offset": (dt - utc.tz_localize(None)).total_seconds().astype(int),
+            "dt": dt,
+            "sunrise": sunrise,
+            "sunset": sunrise + pd.to_timedelta(daylight, unit="h"),
+            "temp": temp.round(2),
+            "feels_like": (temp - 0.7 * wind_speed).round(2),
+            "pressure": rng.normal(1015, 8, n).round().astype(int),
+            "humidity": rng.uniform(30, 100, n).round().astype(int),
+            "dew_point": (temp - rng.uniform(0, 8, n)).round(2),
+            "uvi": (8 * sun_up * (0.6 + 0.4 * season)).clip(0).round(2),
+            "clouds": rng.integers(0, 101, n),
+            "visibility": rng.choice([10000, 8000, 5000, 1000], n),
+            "wind_speed": wind_speed.round(2),
+            "wind_deg": rng.integers(0, 360, n),
+            "wind_gust": (wind_speed * rng.uniform(1.2, 2.0, n)).round(2),
+            "weather_id": codes["weather_id"].to_numpy(),
+            "weather_main": codes["main"].to_numpy(),
+            "weather_description": codes["description"].to_numpy(),
+            "weather_icon": codes["icon"].to_numpy(),
+        }
+    )[COLS_LIVE]
+
+
+def copy_csv(cur, table: str, df: pd.DataFrame) -> None:
+    """COPY a frame with text columns through an in-memory CSV."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT CSV);",
+        buffer,
+    )
+
+
+def remove_generated(conn) -> None:
+    """Delete the stations of a previous run and all their data."""
+    bounds = (GENERATED_WMO_START, GENERATED_WMO_END)
+    with conn.cursor() as cur:
+        for table in (
+            "weather_live",
+            "weather_live_latest",
+            "weather_data_hourly",
+            "weather_data_daily",
+            *ROLLUP_TABLES,
+        ):
+            cur.execute(
+                f"DELETE FROM {table} WHERE station_id >= %s AND station_id < %s;",
+                bounds,
+            )
+        cur.execute("DELETE FROM stations WHERE wmo >= %s AND wmo < %s;", bounds)
+    conn.commit()
+
+
+def generate(conn, n_stations: int, years: int, live_days: int, interval_min, seed):
+    """
+    Fill the database, one transaction per station.
+
+    Returns:
+        dict: Number of generated hourly, daily and live rows.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.today().floor("h")
+    start = pd.Timestamp(year=end.year - years, month=1, day=1)
+
+    remove_generated(conn)
+    stations = station_catalog(n_stations, start, rng)
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            f"INSERT INTO stations ({', '.join(COLS_STATIONS)}, last_update) VALUES %s;",
+            [(*row, end.to_pydatetime()) for row in stations.itertuples(index=False)],
+        )
+    conn.commit()
+
+    ensure_partitions(conn, "weather_data_hourly", start, end)
+    ensure_partitions(conn, "weather_live", end - pd.Timedelta(days=live_days + 1), end)
+
+    totals = {"hourly": 0, "daily": 0, "live": 0}
+    for nr, station in enumerate(stations.itertuples(index=False), start=1):
+        t0 = time.perf_counter()
+        station_seed = seed * 100_003 + nr
+        hourly, daily = station_history(station, start, end, station_seed)
+        live = live_snapshots(station, end, live_days, interval_min, station_seed)
+
+        constants = {"station_id": int(station.wmo)}
+        with conn.cursor() as cur:
+            copy_binary(
+                cur,
+                "weather_data_hourly",
+                hourly,
+                COLS_HOURLY,
+                HOURLY_COPY_TYPES,
+                constants,
+            )
+            copy_binary(
+                cur,
+                "weather_data_daily",
+                daily,
+                COLS_DAILY,
+                DAILY_COPY_TYPES,
+                constants,
+            )
+            if len(live):
+                copy_csv(cur, "weather_live", live)
+                copy_csv(cur, "weather_live_latest", live.tail(1))
+        refresh_rollups(
+            conn, int(station.wmo), daily["time"].min(), daily["time"].max()
+        )
+        conn.commit()
+
+        totals["hourly"] += len(hourly)
+        totals["daily"] += len(daily)
+        totals["live"] += len(live)
+        print(
+            f"🛰️ {nr}/{n_stations} {station.name}: {len(hourly)} hourly, "
+            f"{len(daily)} daily, {len(live)} live rows "
+            f"({time.perf_counter() - t0:.1f}s)",
+            flush=True,
+        )
+
+    # Fresh statistics, so query plans look like on a real database
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE;")
+    conn.autocommit = False
+    return totals
+
+
+def create_database(name: str) -> None:
+    """Create database `name` on the DB_* server if it does not exist."""
+    admin = connect_db.connect_to_db()
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s;", (name,))
+        if cur.fetchone() is None:
+            cur.execute(f"CREATE DATABASE {name} TEMPLATE template0 ENCODING 'UTF8';")
+    admin.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stations", type=int, default=len(COUNTIES))
+    parser.add_argument("--years", type=int, default=50)
+    parser.add_argument("--live-days", type=int, default=365)
+    parser.add_argument("--live-interval-min", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="database name (default: DB_NAME)")
+    parser.add_argument("--create-db", action="store_true")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    db_name = args.db or connect_db.DB_NAME
+    if args.create_db:
+        create_database(db_name)
+
+    start = time.perf_counter()
+    with patch.object(connect_db, "DB_NAME", db_name):
+        conn = connect_db.connect_to_db()
+    try:
+        create_tables(conn)
+        conn.commit()
+        run_migrations(conn)
+        totals = generate(
+            conn,
+            args.stations,
+            args.years,
+            args.live_days,
+            args.live_interval_min,
+            args.seed,
+        )
+    finally:
+        conn.close()
+
+    print(
+        f"✅ {db_name}: {args.stations} stations, {totals['hourly']} hourly, "
+        f"{totals['daily']} daily, {totals['live']} live rows "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Benchmark suite of the ingestion hot paths with stored baselines.
+
+Usage:
+    python -m benchmarks.suite                    # compare with baselines
+    python -m benchmarks.suite --update           # store new baselines
+    python -m benchmarks.suite --sizes 1k 100k --db skip
+
+Runs fully offline on synthetic Meteostat-shaped frames (1k, 100k, 1M
+rows). Every case is timed (best of `--repeats`) against:
+
+- mock: a MagicMock connection that drains the COPY stream, or an SQLite
+  file for `read_df`.
+- pg: a throwaway database created on the local Postgres of the DB_*
+  settings and dropped afterwards. Skipped when Postgres is not reachable.
+
+A case slower than its baseline by more than `--threshold` (and by more
+than `--min-delta-ms`, so sub-millisecond noise is ignored) is a
+regression and the run exits with status 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import warnings
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+
+from benchmarks.synthetic import daily_frame, hourly_frame, stacked_frame
+from src.celan_and_validate.clean_and_validate import (
+    clean_and_validate_days,
+    clean_and_validate_hours,
+)
+from src.utils import connect_db
+from src.utils.binary_copy import HOURLY_COPY_TYPES, copy_binary
+from src.utils.constants import COLS_HOURLY
+from src.utils.partitions import ensure_partitions
+from src.utils.utils import read_df, upsert_to_db
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+STATION_ID = 15120
+BENCH_DB = f"weather_bench_{os.getpid()}"
+SELECT_HOURLY = f"SELECT {', '.join(COLS_HOURLY)} FROM weather_data_hourly;"
+
+
+# ---------- connections ----------
+def mock_connection():
+    """Connection whose COPY reads the whole stream, like the server does."""
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+
+    def drain(sql, file, size=8192):
+        while file.read(1 << 16):
+            pass
+
+    cur.copy_expert.side_effect = drain
+    return conn
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    """sqlite3 cursor that takes `params=None` like psycopg2."""
+
+    def execute(self, sql, params=None):
+        return super().execute(sql, params or ())
+
+
+class SQLiteConnection:
+    """
+    sqlite3 connection with the psycopg2 calls the readers make: a
+    (named) cursor used as a context manager, rollback and close.
+    """
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+
+    @contextmanager
+    def cursor(self, name=None):
+        cur = self.conn.cursor(SQLiteCursor)
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.close()
+
+
+@contextmanager
+def throwaway_database():
+    """
+    Create an empty weather database on the local Postgres, yield a
+    connection to it (None if Postgres is not reachable) and drop it.
+    """
+    try:
+        admin = connect_db.connect_to_db()
+    except psycopg2.Error as e:
+        print(f"Postgres not reachable, pg cases skipped ({e})")
+        yield None
+        return
+
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE DATABASE {BENCH_DB} TEMPLATE template0 ENCODING 'UTF8';")
+    try:
+        with patch.object(connect_db, "DB_NAME", BENCH_DB):
+            conn = connect_db.connect_to_db()
+            with conn.cursor() as cur, open("postgresql/create_tables.sql") as f:
+                cur.execute(f.read())
+                cur.execute(
+                    "INSERT INTO stations (name, country, wmo, timezone) "
+                    "VALUES ('bench', 'RO', %s, 'Europe/Bucharest');",
+                    (STATION_ID,),
+                )
+            conn.commit()
+            try:
+                yield conn
+            finally:
+                conn.close()
+    finally:
+        with admin.cursor() as cur:
+            # The process connection pool of `read_df` is still connected
+            cur.execute(f"DROP DATABASE IF EXISTS {BENCH_DB} WITH (FORCE);")
+        admin.close()
+
+
+# ---------- cases ----------
+# A case gets the row count and the pg connection (None without Postgres)
+# and returns (setup, run): `setup` runs untimed before every `run`.
+def case_clean_hourly(n_rows, pg):
+    raw = hourly_frame(n_rows)
+    return None, lambda: clean_and_validate_hours(raw)
+
+
+def case_clean_daily(n_rows, pg):
+    raw = stacked_frame(daily_frame, n_rows, rows_per_station=36_500)
+    return None, lambda: clean_and_validate_days(raw)
+
+
+def upsert_hourly(df, conn):
+    """The hourly write of the loader: staging COPY + merge."""
+    return upsert_to_db(
+        df, conn, STATION_ID, "weather_data_hourly", COLS_HOURLY, HOURLY_COPY_TYPES
+    )
+
+
+def case_copy_binary_mock(n_rows, pg):
+    df = clean_and_validate_hours(hourly_frame(n_rows))
+    cur = mock_connection().cursor.return_value.__enter__.return_value
+    return None, lambda: copy_binary(
+        cur,
+        "weather_data_hourly",
+        df,
+        COLS_HOURLY,
+        HOURLY_COPY_TYPES,
+        constants={"station_id": STATION_ID},
+    )
+
+
+def case_upsert_to_db_mock(n_rows, pg):
+    df = clean_and_validate_hours(hourly_frame(n_rows))
+    conn = mock_connection()
+    return None, lambda: upsert_hourly(df, conn)
+
+
+def case_upsert_to_db_pg(n_rows, pg):
+    df = clean_and_validate_hours(hourly_frame(n_rows))
+    ensure_partitions(pg, "weather_data_hourly", df["time"].min(), df["time"].max())
+
+    def truncate():
+        with pg.cursor() as cur:
+            cur.execute("TRUNCATE weather_data_hourly;")
+        pg.commit()
+
+    return truncate, lambda: upsert_hourly(df, pg)
+
+
+def case_read_df_mock(n_rows, pg):
+    df = clean_and_validate_hours(hourly_frame(n_rows)).assign(station_id=STATION_ID)
+    path = os.path.join(tempfile.mkdtemp(), "bench.sqlite")
+    with sqlite3.connect(path) as conn:
+        df[COLS_HOURLY].to_sql("weather_data_hourly", conn, index=False)
+
+    def run():
+        @contextmanager
+        def connection():
+            conn = SQLiteConnection(path)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+        pool = MagicMock(connection=connection)
+        with patch("src.utils.utils.get_pool", return_value=pool):
+            return read_df(SELECT_HOURLY)
+
+    return None, run
+
+
+def case_read_df_pg(n_rows, pg):
+    df = clean_and_validate_hours(hourly_frame(n_rows))
+    ensure_partitions(pg, "weather_data_hourly", df["time"].min(), df["time"].max())
+    with pg.cursor() as cur:
+        cur.execute("TRUNCATE weather_data_hourly;")
+    upsert_hourly(df, pg)
+
+    def run():
+        with patch.object(connect_db, "DB_NAME", BENCH_DB):
+            return read_df(SELECT_HOURLY)
+
+    return None, run
+
+
+# name -> (case, needs Postgres)
+CASES = {
+    "clean_and_validate_hours": (case_clean_hourly, False),
+    "clean_and_validate_days": (case_clean_daily, False),
+    "copy_binary/mock": (case_copy_binary_mock, False),
+    "upsert_to_db/mock": (case_upsert_to_db_mock, False),
+    "upsert_to_db/pg": (case_upsert_to_db_pg, True),
+    "read_df/mock": (case_read_df_mock, False),
+    "read_df/pg": (case_read_df_pg, True),
+}
+
+
+def time_case(setup, run, repeats: int) -> float:
+    """Best wall time of `repeats` runs."""
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_suite(sizes: list[str], repeats: int, pg) -> dict:
+    """Time every case at every size, return {"case[size]": seconds}."""
+    results = {}
+    for size in sizes:
+        for name, (case, needs_pg) in CASES.items():
+            if needs_pg and pg is None:
+                continue
+            setup, run = case(SIZES[size], pg)
+            key = f"{name}[{size}]"
+            results[key] = time_case(setup, run, repeats)
+            print(f"{key:<36} {results[key] * 1000:10.1f} ms", flush=True)
+    return results
+
+
+# ---------- baselines ----------
+def load_baselines(path: str = BASELINES_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baselines(results: dict, path: str = BASELINES_PATH) -> None:
+    """Merge `results` into the stored baselines."""
+    merged = {**load_baselines(path), **results}
+    data = {
+        "machine": f"{platform.machine()} {platform.python_version()}",
+        "updated_at": time.strftime("%Y-%m-%d"),
+        "results": dict(sorted(merged.items())),
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def find_regressions(
+    results: dict, baselines: dict, threshold: float, min_delta_s: float
+) -> list[tuple[str, float, float]]:
+    """Return (case, baseline, result) of every case slower than allowed."""
+    regressions = []
+    for key, seconds in results.items():
+        base = baselines.get(key)
+        if base is None:
+            continue
+        if seconds > base * (1 + threshold) and seconds - base > min_delta_s:
+            regressions.append((key, base, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=list(SIZES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--db", choices=["auto", "skip"], default="auto")
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--min-delta-ms", type=float, default=5.0)
+    parser.add_argument("--update", action="store_true", help="store as baselines")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    if args.db == "skip":
+        results = run_suite(args.sizes, args.repeats, None)
+    else:
+        with throwaway_database() as pg:
+            results = run_suite(args.sizes, args.repeats, pg)
+
+    if args.update:
+        save_baselines(results)
+        print(f"Baselines updated: {BASELINES_PATH}")
+        return
+
+    regressions = find_regressions(
+        results, load_baselines(), args.threshold, args.min_delta_ms / 1000
+    )
+    for key, base, seconds in regressions:
+        print(f"❌ {key}: {base * 1000:.1f} ms -> {seconds * 1000:.1f} ms")
+    if regressions:
+        sys.exit(1)
+    print(f"✅ No regression above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
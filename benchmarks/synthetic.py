@@ -0,0 +1,124 @@
+"""
+Synthetic Meteostat-shaped frames for benchmarks.
+
+The frames look like the output of `Hourly(...).fetch()` and
+`Daily(...).fetch()`: a DatetimeIndex named `time` and float64 columns
+with realistic gaps (NaN), so the hot paths see the same dtypes as in
+production.
+"""
+
+import numpy as np
+import pandas as pd
+
+HOURLY_COLUMNS = [
+    "temp",
+    "dwpt",
+    "rhum",
+    "prcp",
+    "snow",
+    "wdir",
+    "wspd",
+    "wpgt",
+    "pres",
+    "tsun",
+    "coco",
+]
+DAILY_COLUMNS = [
+    "tavg",
+    "tmin",
+    "tmax",
+    "prcp",
+    "snow",
+    "wdir",
+    "wspd",
+    "wpgt",
+    "pres",
+    "tsun",
+]
+
+# Share of missing values per column, roughly what Romanian stations have
+MISSING_SHARE = {"snow": 0.9, "wpgt": 0.6, "tsun": 0.95, "coco": 0.3, "prcp": 0.2}
+
+
+def _seasonal_temp(index: pd.DatetimeIndex, rng) -> np.ndarray:
+    day = index.dayofyear.to_numpy()
+    hour = index.hour.to_numpy()
+    yearly = 10 - 12 * np.cos(2 * np.pi * (day - 15) / 365.25)
+    daily = -4 * np.cos(2 * np.pi * (hour - 3) / 24)
+    return yearly + daily + rng.normal(0, 2.5, len(index))
+
+
+def hourly_frame(n_rows: int, start: str = "1975-01-01", seed: int = 0) -> pd.DataFrame:
+    """
+    Return an hourly frame with `n_rows` rows starting at `start`.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n_rows, freq="h", name="time")
+    temp = _seasonal_temp(index, rng)
+
+    df = pd.DataFrame(
+        {
+            "temp": temp.round(1),
+            "dwpt": (temp - rng.uniform(0, 8, n_rows)).round(1),
+            "rhum": rng.uniform(30, 100, n_rows).round(0),
+            "prcp": np.where(
+                rng.random(n_rows) < 0.1, rng.gamma(1.0, 1.5, n_rows), 0
+            ).round(1),
+            "snow": rng.uniform(0, 400, n_rows).round(0),
+            "wdir": rng.uniform(0, 360, n_rows).round(0),
+            "wspd": rng.gamma(2.0, 4.0, n_rows).round(1),
+            "wpgt": rng.gamma(2.0, 7.0, n_rows).round(1),
+            "pres": rng.normal(1015, 8, n_rows).round(1),
+            "tsun": rng.uniform(0, 60, n_rows).round(0),
+            "coco": rng.integers(1, 28, n_rows).astype(float),
+        },
+        index=index,
+    )
+    for col, share in MISSING_SHARE.items():
+        df.loc[rng.random(n_rows) < share, col] = np.nan
+    return df
+
+
+def daily_frame(n_rows: int, start: str = "1975-01-01", seed: int = 0) -> pd.DataFrame:
+    """
+    Return a daily frame with `n_rows` rows starting at `start`.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n_rows, freq="D", name="time")
+    tavg = _seasonal_temp(index, rng)
+
+    df = pd.DataFrame(
+        {
+            "tavg": tavg.round(1),
+            "tmin": (tavg - rng.uniform(2, 8, n_rows)).round(1),
+            "tmax": (tavg + rng.uniform(2, 8, n_rows)).round(1),
+            "prcp": np.where(
+                rng.random(n_rows) < 0.35, rng.gamma(1.0, 5.0, n_rows), 0
+            ).round(1),
+            "snow": rng.uniform(0, 400, n_rows).round(0),
+            "wdir": rng.uniform(0, 360, n_rows).round(0),
+            "wspd": rng.gamma(2.0, 4.0, n_rows).round(1),
+            "wpgt": rng.gamma(2.0, 7.0, n_rows).round(1),
+            "pres": rng.normal(1015, 8, n_rows).round(1),
+            "tsun": rng.uniform(0, 600, n_rows).round(0),
+        },
+        index=index,
+    )
+    for col, share in MISSING_SHARE.items():
+        if col in df.columns:
+            df.loc[rng.random(n_rows) < share, col] = np.nan
+    return df
+
+
+def stacked_frame(frame_func, n_rows: int, rows_per_station: int) -> pd.DataFrame:
+    """
+    Return `n_rows` rows of `frame_func` made of several stations stacked,
+    for sizes whose dates would not fit one station (e.g. 1M daily rows).
+    """
+    parts, seed = [], 0
+    while n_rows > 0:
+        size = min(n_rows, rows_per_station)
+        parts.append(frame_func(size, seed=seed))
+        n_rows -= size
+        seed += 1
+    return pd.concat(parts)
@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
 
-from src.utils.connect_db import connect_to_db
+from src.utils.connect_db import get_pool
 from src.ingestion.get_current_data import fetch_weather_nearby
 from src.utils.constants import REGIONS
 
@@ -11,7 +11,6 @@ load_dotenv()
 # --- API Key ---
 API_KEY = os.getenv("API_KEY")
 
-conn = connect_to_db()
-
-fetch_weather_nearby(API_KEY, conn, REGIONS)
+with get_pool().connection() as conn:
+    fetch_weather_nearby(API_KEY, conn, REGIONS)
 
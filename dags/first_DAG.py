@@ -18,6 +18,9 @@ def run_main_py():
 def run_current_data_py():
     subprocess.run(["python", "/opt/airflow/scripts/current_data.py"], check=True)
 
+def run_live_retention_py():
+    subprocess.run(["python", "/opt/airflow/scripts/live_retention.py"], check=True)
+
 # --- DAG definition ---
 with DAG(
     dag_id="weather_pipeline",
@@ -38,5 +41,10 @@ with DAG(
         python_callable=run_current_data_py,
     )
 
+    task_retention = PythonOperator(
+        task_id="run_live_retention",
+        python_callable=run_live_retention_py,
+    )
+
     # --- Dependencies ---
-    task_main >> task_current
+    task_main >> task_current >> task_retention
@@ -0,0 +1,5 @@
+from src.utils.connect_db import get_pool
+from src.ingestion.live_retention import apply_live_retention
+
+with get_pool().connection() as conn:
+    apply_live_retention(conn)
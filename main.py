@@ -1,7 +1,9 @@
 import time
 
-from src.utils.connect_db import connect_to_db
-from src.ingestion.load_data import load_stations, create_tables, load_weather_data
+from src.utils.connect_db import get_pool, pool_stats
+from src.ingestion.load_data import load_stations, create_tables, run_migrations, load_weather_data
+from src.utils.metrics import METRICS, print_stage_summary, write_json_report, write_prometheus_textfile
+from src.utils.constants import METRICS_REPORT_PATH, METRICS_PROM_PATH
 
 def main():
 
@@ -11,24 +13,31 @@ def main():
     # TODO: Cloud
 
     start = time.time()
+    METRICS.reset()
 
-    conn = connect_to_db()
+    with get_pool().connection() as conn:
 
-    cur = conn.cursor()
+        create_tables(conn)
 
-    create_tables(conn)
-    
-    load_stations(conn) 
-     
-    load_weather_data(conn)
+        run_migrations(conn)
 
-    cur.close()
-    conn.close()
+        load_stations(conn)
+        # Not left idle in a transaction while the workers load the stations
+        conn.commit()
+
+        load_weather_data(conn)
 
     end = time.time()
 
     print(f"Elapsed time {end - start}")
 
+    # --- Per-stage timings of the run ---
+    print_stage_summary()
+    print(f"DB pool: {pool_stats()}")
+    write_json_report(METRICS_REPORT_PATH, extra={"db_pool": pool_stats()})
+    write_prometheus_textfile(METRICS_PROM_PATH)
+    print(f"Run report: {METRICS_REPORT_PATH}, Prometheus: {METRICS_PROM_PATH}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
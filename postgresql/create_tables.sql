@@ -21,8 +21,11 @@ CREATE TABLE IF NOT EXISTS stations (
     last_update TIMESTAMP                 -- last updated by me
 );
 
+-- Range partitioned by year, the loader creates the partitions
+-- (weather_data_hourly_y1975, ...) before writing. The unique key has to
+-- contain the partition key, so there is no primary key on id.
 CREATE TABLE IF NOT EXISTS weather_data_hourly (
-    id SERIAL PRIMARY KEY,             -- internal unique ID
+    id BIGSERIAL,                      -- internal ID
     station_id INT NOT NULL REFERENCES stations(wmo),  -- foreign key to stations table
     time TIMESTAMP NOT NULL,           -- timestamp of the measurement
     temp REAL,                         -- temperature in Celsius
@@ -35,8 +38,9 @@ CREATE TABLE IF NOT EXISTS weather_data_hourly (
     wpgt REAL,                         -- wind gust (km/h or m/s)
     pres REAL,                         -- atmospheric pressure (hPa)
     tsun REAL,                         -- sunshine duration (hours)
-    coco INT                           -- weather condition code or description
-);
+    coco INT,                          -- weather condition code or description
+    CONSTRAINT weather_data_hourly_station_id_time_key UNIQUE (station_id, time)
+) PARTITION BY RANGE (time);
 
 CREATE TABLE IF NOT EXISTS weather_data_daily (
     id SERIAL PRIMARY KEY,                     -- internal unique ID
@@ -51,11 +55,13 @@ CREATE TABLE IF NOT EXISTS weather_data_daily (
     wspd REAL,                                 -- wind speed (km/h or m/s)
     wpgt REAL,                                 -- wind gust (km/h or m/s)
     pres REAL,                                 -- atmospheric pressure (hPa)
-    tsun REAL                                  -- sunshine duration (hours)
+    tsun REAL,                                 -- sunshine duration (hours)
+    CONSTRAINT weather_data_daily_station_id_time_key UNIQUE (station_id, time)
 );
 
+-- Range partitioned by month (weather_live_m2025_01, ...)
 CREATE TABLE IF NOT EXISTS weather_live (
-    id SERIAL PRIMARY KEY,              -- unique identifier
+    id BIGSERIAL,                       -- identifier
 	station_id INTEGER NOT NULL REFERENCES stations(wmo),  -- foreign key to stations table
     lat DECIMAL(8,5) NOT NULL,          -- latitude
     lon DECIMAL(8,5) NOT NULL,          -- longitude
@@ -79,7 +85,119 @@ CREATE TABLE IF NOT EXISTS weather_live (
     weather_main VARCHAR(50),           -- short description (e.g. Clouds)
     weather_description VARCHAR(50),    -- full description (e.g. broken clouds)
     weather_icon VARCHAR(10)           -- icon code (e.g. 04d)
+) PARTITION BY RANGE (dt);
+
+-- Newest weather_live row of every station, upserted together with the
+-- weather_live insert. The live map reads this instead of the history.
+CREATE TABLE IF NOT EXISTS weather_live_latest (
+    station_id INTEGER PRIMARY KEY REFERENCES stations(wmo),  -- foreign key to stations table
+    lat DECIMAL(8,5) NOT NULL,          -- latitude
+    lon DECIMAL(8,5) NOT NULL,          -- longitude
+    timezone VARCHAR(50),               -- e.g. "America/Chicago"
+    timezone_offset INT,                -- offset in seconds
+    dt TIMESTAMP NOT NULL,              -- time of the observation
+    sunrise TIMESTAMP,                  -- sunrise
+    sunset TIMESTAMP,                   -- sunset
+    temp DECIMAL(5,2),                  -- temperature (°C)
+    feels_like DECIMAL(5,2),            -- feels like (°C)
+    pressure INT,                       -- pressure (hPa)
+    humidity INT,                       -- humidity (%)
+    dew_point DECIMAL(5,2),             -- dew point (°C)
+    uvi DECIMAL(4,2),                   -- UV index
+    clouds INT,                         -- cloudiness (%)
+    visibility INT,                     -- visibility (m)
+    wind_speed DECIMAL(5,2),            -- wind speed (m/s)
+    wind_deg INT,                       -- wind direction (°)
+    wind_gust DECIMAL(5,2),             -- wind gust (m/s)
+    weather_id INT,                     -- OpenWeather "id"
+    weather_main VARCHAR(50),           -- short description (e.g. Clouds)
+    weather_description VARCHAR(50),    -- full description (e.g. broken clouds)
+    weather_icon VARCHAR(10)            -- icon code (e.g. 04d)
 );
 
+-- Hourly summary of the weather_live snapshots older than the retention
+-- window (src/ingestion/live_retention.py), the raw rows are removed
+CREATE TABLE IF NOT EXISTS weather_live_hourly (
+    station_id INTEGER NOT NULL REFERENCES stations(wmo),  -- foreign key to stations table
+    hour TIMESTAMP NOT NULL,            -- start of the hour
+    samples INT NOT NULL,               -- raw snapshots in the hour
+    temp_min REAL,                      -- temperature (°C)
+    temp_mean REAL,
+    temp_max REAL,
+    feels_like_mean REAL,               -- feels like (°C)
+    pressure_min REAL,                  -- pressure (hPa)
+    pressure_mean REAL,
+    pressure_max REAL,
+    humidity_min REAL,                  -- humidity (%)
+    humidity_mean REAL,
+    humidity_max REAL,
+    wind_speed_mean REAL,               -- wind speed (m/s)
+    wind_speed_max REAL,
+    wind_gust_max REAL,                 -- wind gust (m/s)
+    clouds_mean REAL,                   -- cloudiness (%)
+    weather_main VARCHAR(50),           -- most frequent condition (e.g. Clouds)
+    PRIMARY KEY (station_id, hour)
+);
 
+-- Per-station aggregates of weather_data_daily, refreshed by the loader
+-- for the months/years it wrote (src/utils/rollups.py)
+CREATE TABLE IF NOT EXISTS weather_rollup_monthly (
+    station_id INT NOT NULL REFERENCES stations(wmo),  -- foreign key to stations table
+    period DATE NOT NULL,               -- first day of the month
+    days INT NOT NULL,                  -- daily rows in the month
+    tavg_days INT NOT NULL,             -- days with tavg (coverage)
+    prcp_days INT NOT NULL,             -- days with prcp (coverage)
+    tavg REAL,                          -- mean of the daily tavg (°C)
+    tmin REAL,                          -- lowest daily tmin (°C)
+    tmax REAL,                          -- highest daily tmax (°C)
+    tmin_date DATE,                     -- day of tmin
+    tmax_date DATE,                     -- day of tmax
+    prcp_sum REAL NOT NULL,             -- total precipitation (mm)
+    rainy_days INT NOT NULL,            -- days with prcp > 0
+    refreshed_at TIMESTAMP NOT NULL,    -- last recomputation
+    PRIMARY KEY (station_id, period)
+);
 
+CREATE TABLE IF NOT EXISTS weather_rollup_yearly (
+    station_id INT NOT NULL REFERENCES stations(wmo),  -- foreign key to stations table
+    period DATE NOT NULL,               -- first day of the year
+    days INT NOT NULL,                  -- daily rows in the year
+    tavg_days INT NOT NULL,             -- days with tavg (coverage)
+    prcp_days INT NOT NULL,             -- days with prcp (coverage)
+    tavg REAL,                          -- mean of the daily tavg (°C)
+    tmin REAL,                          -- lowest daily tmin (°C)
+    tmax REAL,                          -- highest daily tmax (°C)
+    tmin_date DATE,                     -- day of tmin
+    tmax_date DATE,                     -- day of tmax
+    prcp_sum REAL NOT NULL,             -- total precipitation (mm)
+    rainy_days INT NOT NULL,            -- days with prcp > 0
+    refreshed_at TIMESTAMP NOT NULL,    -- last recomputation
+    PRIMARY KEY (station_id, period)
+);
+
+-- ---------- Indexes ----------
+-- (station_id, time) lookups of one station are served by the B-tree of the
+-- unique keys above. The big append-mostly tables also get a BRIN index on
+-- time for all-station time range scans: a few pages per partition instead
+-- of a B-tree of every row. weather_data_daily is small and loaded station
+-- by station (not in time order), so a BRIN would not narrow anything.
+CREATE INDEX IF NOT EXISTS weather_data_hourly_time_brin
+    ON weather_data_hourly USING BRIN (time);
+
+CREATE INDEX IF NOT EXISTS weather_live_dt_brin
+    ON weather_live USING BRIN (dt);
+
+-- Latest snapshot per station (DISTINCT ON station_id ORDER BY dt DESC)
+CREATE INDEX IF NOT EXISTS weather_live_station_id_dt_idx
+    ON weather_live (station_id, dt DESC);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,              -- what was synced (e.g. stations:HA)
+    fingerprint TEXT NOT NULL,          -- content hash of the last sync
+    synced_at TIMESTAMP NOT NULL        -- time of the last sync
+);
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    file_name TEXT PRIMARY KEY,         -- postgresql/migrations/*.sql
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
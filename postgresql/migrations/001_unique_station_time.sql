@@ -0,0 +1,37 @@
+-- One-off migration: remove duplicate (station_id, time) rows that earlier
+-- re-runs of main.py appended, then add the unique keys used by the upserts.
+-- Safe to run again: tables that already have the key are skipped.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'weather_data_hourly_station_id_time_key'
+    ) THEN
+        -- keep the newest copy (highest id) of every duplicated row
+        DELETE FROM weather_data_hourly h
+        USING weather_data_hourly newer
+        WHERE h.station_id = newer.station_id
+          AND h.time = newer.time
+          AND h.id < newer.id;
+
+        ALTER TABLE weather_data_hourly
+            ADD CONSTRAINT weather_data_hourly_station_id_time_key
+            UNIQUE (station_id, time);
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'weather_data_daily_station_id_time_key'
+    ) THEN
+        DELETE FROM weather_data_daily d
+        USING weather_data_daily newer
+        WHERE d.station_id = newer.station_id
+          AND d.time = newer.time
+          AND d.id < newer.id;
+
+        ALTER TABLE weather_data_daily
+            ADD CONSTRAINT weather_data_daily_station_id_time_key
+            UNIQUE (station_id, time);
+    END IF;
+END $$;
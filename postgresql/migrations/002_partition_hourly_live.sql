@@ -0,0 +1,136 @@
+-- One-off migration: turn the single weather_data_hourly and weather_live
+-- tables into the range partitioned tables of create_tables.sql.
+-- The old table is renamed to *_legacy, the partitions covering its data
+-- are created, the rows are moved and the legacy table is dropped, all in
+-- one transaction. Safe to run again: partitioned tables are skipped.
+
+DO $$
+DECLARE
+    first_year INT;
+    last_year INT;
+    first_month DATE;
+    last_month DATE;
+    y INT;
+    m DATE;
+BEGIN
+    -- ---------- weather_data_hourly: yearly partitions ----------
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = to_regclass('weather_data_hourly')
+    ) THEN
+        ALTER TABLE weather_data_hourly RENAME TO weather_data_hourly_legacy;
+        ALTER TABLE weather_data_hourly_legacy
+            RENAME CONSTRAINT weather_data_hourly_station_id_time_key
+            TO weather_data_hourly_legacy_station_id_time_key;
+
+        CREATE TABLE weather_data_hourly (
+            id BIGSERIAL,
+            station_id INT NOT NULL REFERENCES stations(wmo),
+            time TIMESTAMP NOT NULL,
+            temp REAL,
+            dwpt REAL,
+            rhum REAL,
+            prcp REAL,
+            snow REAL,
+            wdir REAL,
+            wspd REAL,
+            wpgt REAL,
+            pres REAL,
+            tsun REAL,
+            coco INT,
+            CONSTRAINT weather_data_hourly_station_id_time_key UNIQUE (station_id, time)
+        ) PARTITION BY RANGE (time);
+
+        SELECT EXTRACT(YEAR FROM min(time)), EXTRACT(YEAR FROM max(time))
+        INTO first_year, last_year
+        FROM weather_data_hourly_legacy;
+
+        IF first_year IS NOT NULL THEN
+            FOR y IN first_year..last_year LOOP
+                EXECUTE format(
+                    'CREATE TABLE weather_data_hourly_y%s PARTITION OF weather_data_hourly '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    y, make_date(y, 1, 1), make_date(y + 1, 1, 1)
+                );
+            END LOOP;
+
+            INSERT INTO weather_data_hourly (
+                station_id, time, temp, dwpt, rhum, prcp, snow,
+                wdir, wspd, wpgt, pres, tsun, coco
+            )
+            SELECT station_id, time, temp, dwpt, rhum, prcp, snow,
+                   wdir, wspd, wpgt, pres, tsun, coco
+            FROM weather_data_hourly_legacy;
+        END IF;
+
+        DROP TABLE weather_data_hourly_legacy;
+    END IF;
+
+    -- ---------- weather_live: monthly partitions ----------
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = to_regclass('weather_live')
+    ) THEN
+        ALTER TABLE weather_live RENAME TO weather_live_legacy;
+
+        CREATE TABLE weather_live (
+            id BIGSERIAL,
+            station_id INTEGER NOT NULL REFERENCES stations(wmo),
+            lat DECIMAL(8,5) NOT NULL,
+            lon DECIMAL(8,5) NOT NULL,
+            timezone VARCHAR(50),
+            timezone_offset INT,
+            dt TIMESTAMP NOT NULL,
+            sunrise TIMESTAMP,
+            sunset TIMESTAMP,
+            temp DECIMAL(5,2),
+            feels_like DECIMAL(5,2),
+            pressure INT,
+            humidity INT,
+            dew_point DECIMAL(5,2),
+            uvi DECIMAL(4,2),
+            clouds INT,
+            visibility INT,
+            wind_speed DECIMAL(5,2),
+            wind_deg INT,
+            wind_gust DECIMAL(5,2),
+            weather_id INT,
+            weather_main VARCHAR(50),
+            weather_description VARCHAR(50),
+            weather_icon VARCHAR(10)
+        ) PARTITION BY RANGE (dt);
+
+        SELECT date_trunc('month', min(dt))::date, date_trunc('month', max(dt))::date
+        INTO first_month, last_month
+        FROM weather_live_legacy;
+
+        IF first_month IS NOT NULL THEN
+            m := first_month;
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE weather_live_m%s PARTITION OF weather_live '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    to_char(m, 'YYYY_MM'), m, (m + INTERVAL '1 month')::date
+                );
+                m := (m + INTERVAL '1 month')::date;
+            END LOOP;
+
+            INSERT INTO weather_live (
+                station_id, lat, lon, timezone, timezone_offset,
+                dt, sunrise, sunset, temp, feels_like, pressure,
+                humidity, dew_point, uvi, clouds, visibility,
+                wind_speed, wind_deg, wind_gust,
+                weather_id, weather_main, weather_description, weather_icon
+            )
+            SELECT station_id, lat, lon, timezone, timezone_offset,
+                   dt, sunrise, sunset, temp, feels_like, pressure,
+                   humidity, dew_point, uvi, clouds, visibility,
+                   wind_speed, wind_deg, wind_gust,
+                   weather_id, weather_main, weather_description, weather_icon
+            FROM weather_live_legacy
+            ORDER BY dt;
+        END IF;
+
+        DROP TABLE weather_live_legacy;
+    END IF;
+END $$;
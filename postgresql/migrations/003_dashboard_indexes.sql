@@ -0,0 +1,14 @@
+-- One-off migration: add the secondary indexes of create_tables.sql to an
+-- existing database. Run after 002_partition_hourly_live.sql, indexes on
+-- the partitioned parents are created on every partition.
+-- Safe to run again: existing indexes are skipped. Planner statistics are
+-- left to autovacuum.
+
+CREATE INDEX IF NOT EXISTS weather_data_hourly_time_brin
+    ON weather_data_hourly USING BRIN (time);
+
+CREATE INDEX IF NOT EXISTS weather_live_dt_brin
+    ON weather_live USING BRIN (dt);
+
+CREATE INDEX IF NOT EXISTS weather_live_station_id_dt_idx
+    ON weather_live (station_id, dt DESC);
@@ -0,0 +1,36 @@
+-- One-off migration: fill the monthly/yearly rollup tables of
+-- create_tables.sql from the daily rows already in the database. Later
+-- loads keep them up to date (src/utils/rollups.py).
+-- Safe to run again: a rollup table that has rows is skipped.
+
+DO $$
+DECLARE
+    target TEXT;
+    unit TEXT;
+    is_empty BOOLEAN;
+BEGIN
+    FOR target, unit IN
+        VALUES ('weather_rollup_monthly', 'month'), ('weather_rollup_yearly', 'year')
+    LOOP
+        EXECUTE format('SELECT NOT EXISTS (SELECT 1 FROM %I)', target) INTO is_empty;
+        IF is_empty THEN
+            EXECUTE format($sql$
+                INSERT INTO %I (
+                    station_id, period, days, tavg_days, prcp_days, tavg, tmin,
+                    tmax, tmin_date, tmax_date, prcp_sum, rainy_days, refreshed_at
+                )
+                SELECT station_id,
+                       date_trunc(%L, time)::date AS period,
+                       count(*), count(tavg), count(prcp),
+                       avg(tavg::float8), min(tmin), max(tmax),
+                       (array_agg(time ORDER BY tmin, time) FILTER (WHERE tmin IS NOT NULL))[1],
+                       (array_agg(time ORDER BY tmax DESC, time) FILTER (WHERE tmax IS NOT NULL))[1],
+                       COALESCE(sum(prcp::float8), 0),
+                       count(*) FILTER (WHERE prcp > 0),
+                       now()
+                FROM weather_data_daily
+                GROUP BY station_id, period
+            $sql$, target, unit);
+        END IF;
+    END LOOP;
+END $$;
@@ -0,0 +1,23 @@
+-- One-off migration: fill weather_live_latest of create_tables.sql with the
+-- newest weather_live row of every station. Later live runs keep it up to
+-- date in the transaction of their insert.
+-- Only fills an empty table: once live runs maintain it, weather_live is
+-- not scanned again.
+
+INSERT INTO weather_live_latest (
+    station_id, lat, lon, timezone, timezone_offset,
+    dt, sunrise, sunset, temp, feels_like, pressure,
+    humidity, dew_point, uvi, clouds, visibility,
+    wind_speed, wind_deg, wind_gust,
+    weather_id, weather_main, weather_description, weather_icon
+)
+SELECT DISTINCT ON (station_id)
+    station_id, lat, lon, timezone, timezone_offset,
+    dt, sunrise, sunset, temp, feels_like, pressure,
+    humidity, dew_point, uvi, clouds, visibility,
+    wind_speed, wind_deg, wind_gust,
+    weather_id, weather_main, weather_description, weather_icon
+FROM weather_live
+WHERE NOT EXISTS (SELECT 1 FROM weather_live_latest)
+ORDER BY station_id, dt DESC
+ON CONFLICT (station_id) DO NOTHING;
@@ -0,0 +1,119 @@
+"""
+Daily aggregates derived from hourly data
+
+Meteostat builds its daily series from the same hourly observations the
+loader already downloads, so most `Daily` requests can be replaced by a
+groupby of the hourly frame. `daily_from_hourly` follows the aggregation
+rules of `meteostat.Daily`:
+
+- tavg, wspd, pres: mean of temp, wspd, pres
+- tmin, tmax: min and max of temp
+- prcp, tsun: sum
+- snow, wpgt: max
+- wdir: circular mean of the directions
+
+Days are UTC calendar days and the values are rounded to one decimal,
+like the Meteostat output. A sum over a day without any value stays NaN,
+it is not turned into 0 mm of precipitation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.celan_and_validate.clean_and_validate import to_typed_columns
+from src.utils.constants import DERIVED_DAILY_MIN_HOURS
+
+# Daily column -> (hourly column, groupby aggregation)
+DAILY_AGGREGATIONS = {
+    "tavg": ("temp", "mean"),
+    "tmin": ("temp", "min"),
+    "tmax": ("temp", "max"),
+    "prcp": ("prcp", "sum"),
+    "snow": ("snow", "max"),
+    "wspd": ("wspd", "mean"),
+    "wpgt": ("wpgt", "max"),
+    "pres": ("pres", "mean"),
+    "tsun": ("tsun", "sum"),
+}
+HOURLY_SOURCES = ["temp", "prcp", "snow", "wdir", "wspd", "wpgt", "pres", "tsun"]
+DAILY_ORDER = [
+    "tavg",
+    "tmin",
+    "tmax",
+    "prcp",
+    "snow",
+    "wdir",
+    "wspd",
+    "wpgt",
+    "pres",
+    "tsun",
+]
+
+
+def _circular_mean(radians: pd.Series, days: np.ndarray) -> pd.Series:
+    """Mean direction in degrees per day, NaN on days without a direction."""
+    sums = pd.DataFrame({"sin": np.sin(radians), "cos": np.cos(radians)}).groupby(days)
+    counts = sums["sin"].count()
+    totals = sums.sum()
+    degrees = np.degrees(np.arctan2(totals["sin"], totals["cos"]))
+    return ((degrees + 360) % 360).where(counts > 0)
+
+
+def daily_from_hourly(
+    df_hourly: pd.DataFrame, min_hours: int = DERIVED_DAILY_MIN_HOURS
+) -> pd.DataFrame:
+    """
+    Aggregate a cleaned hourly frame into Meteostat-style daily rows.
+
+    Only days with at least `min_hours` hourly temperatures are returned,
+    with fewer hours tmin/tmax would miss part of the daily cycle. The
+    other days count as not covered, see `uncovered_days`.
+
+    Args:
+        df_hourly (pd.DataFrame): Output of `clean_and_validate_hours`.
+        min_hours (int): Hourly temperatures needed for a covered day.
+
+    Returns:
+        pd.DataFrame: Daily frame indexed by day (`time`), with the columns
+            and float32 dtype of a fetched `Daily` frame.
+    """
+    if df_hourly.empty or "temp" not in df_hourly.columns:
+        return pd.DataFrame(
+            columns=DAILY_ORDER, index=pd.DatetimeIndex([], name="time")
+        ).astype("float32")
+
+    days = df_hourly["time"].to_numpy().astype("datetime64[D]")
+    # float64 sums, the float32 frame would round differently than Meteostat
+    values = df_hourly.reindex(columns=HOURLY_SOURCES).astype("float64")
+    grouped = values.groupby(days)
+
+    daily = pd.DataFrame(
+        {
+            name: (
+                grouped[column].sum(min_count=1)
+                if how == "sum"
+                else grouped[column].agg(how)
+            )
+            for name, (column, how) in DAILY_AGGREGATIONS.items()
+        }
+    )
+    daily["wdir"] = _circular_mean(np.radians(values["wdir"]), days)
+    daily = daily.round(1)[DAILY_ORDER]
+
+    daily = daily[grouped["temp"].count() >= min_hours]
+    daily.index = pd.DatetimeIndex(daily.index, name="time")
+    return to_typed_columns(daily)
+
+
+def uncovered_days(daily: pd.DataFrame, start, end) -> pd.DatetimeIndex:
+    """
+    Return the complete days of [start, end] that `daily` has no row for.
+
+    The day of `end` only counts when the range reaches its last second,
+    the running day of an incremental load is not complete yet and is
+    loaded again by the next run.
+    """
+    first = pd.Timestamp(start).normalize()
+    last = (pd.Timestamp(end) + pd.Timedelta(seconds=1)).normalize()
+    days = pd.date_range(first, last, freq="D", inclusive="left", name="time")
+    return days.difference(daily.index)
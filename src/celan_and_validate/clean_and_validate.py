@@ -7,14 +7,112 @@ with all missing or zero values, and validates temperature columns
 against defined realistic bounds.
 """
 
+from collections import namedtuple
+
+import numpy as np
 import pandas as pd
+from src.utils.metrics import timed
 from src.utils.utils import rename_index_to_time
 
 # --- Constants: temperature limits in Celsius ---
 MIN_TEMP = -60
 MAX_TEMP = 90
 
+# A validation rule of one column:
+#   min_value/max_value: realistic bounds, rows outside (or NaN) are dropped
+#   drop_if_all_zero: the column takes part in the "all NaN or 0" row check
+Rule = namedtuple("Rule", ["column", "min_value", "max_value", "drop_if_all_zero"])
+
+HOURLY_RULES = [
+    Rule("temp", MIN_TEMP, MAX_TEMP, True),
+    Rule("dwpt", None, None, True),
+    Rule("rhum", None, None, True),
+    Rule("prcp", None, None, True),
+    Rule("snow", None, None, True),
+    Rule("wdir", None, None, True),
+    Rule("wspd", None, None, True),
+    Rule("wpgt", None, None, True),
+    Rule("pres", None, None, True),
+    Rule("tsun", None, None, True),
+    Rule("coco", None, None, True),
+]
+
+DAILY_RULES = [
+    Rule("tavg", MIN_TEMP, MAX_TEMP, True),
+    Rule("tmin", None, None, True),
+    Rule("tmax", None, None, True),
+    Rule("prcp", None, None, True),
+    Rule("snow", None, None, True),
+    Rule("wdir", None, None, True),
+    Rule("wspd", None, None, True),
+    Rule("wpgt", None, None, True),
+    Rule("pres", None, None, True),
+    Rule("tsun", None, None, True),
+]
+
+# Compact in-memory schema of hourly/daily frames, enforced from fetch to
+# COPY: measurements are float32 (the tables use REAL), weather condition
+# codes (1-27) fit a nullable int8, time is datetime64 and station_id is
+# never stored as a column (it is passed to the writers as a scalar).
+MEASUREMENT_DTYPE = "float32"
+CODE_DTYPES = {"coco": "Int8"}
+
+
+def to_typed_columns(df: pd.DataFrame, time_col: str = "time") -> pd.DataFrame:
+    """
+    Convert every non-time column to its compact numeric dtype.
+    Missing values stay NaN/NA, they become NULL only in the writer.
+    Also used on the raw Meteostat frames right after the fetch.
+
+    The conversion is one `astype` of the columns that are not compact
+    yet, so an already typed frame is returned without a copy.
+    """
+    value_cols = df.columns.difference([time_col])
+    for col in value_cols:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.astype(
+        {col: CODE_DTYPES.get(col, MEASUREMENT_DTYPE) for col in value_cols}
+    )
+
+
+def apply_rules(df: pd.DataFrame, rules: list, time_col: str = "time") -> pd.DataFrame:
+    """
+    Filter rows by a rule table with a single boolean mask.
 
+    - Rows where every checked column is NaN or 0 are dropped. Columns not
+      in the table are checked too, like before the table existed.
+    - Rows outside the bounds of a column (or NaN in it) are dropped.
+
+    The mask is built column by column, so only one-byte-per-row
+    temporaries are allocated next to the frame.
+    """
+    by_column = {rule.column: rule for rule in rules}
+    value_cols = df.columns.difference([time_col])
+
+    has_value = np.zeros(len(df), dtype=bool)
+    for col in value_cols:
+        if col in by_column and not by_column[col].drop_if_all_zero:
+            continue
+        column = df[col].to_numpy(dtype="float32", na_value=np.nan)
+        # NaN != 0 is True, so NaN has to be excluded explicitly
+        has_value |= (column != 0) & ~np.isnan(column)
+    keep = has_value
+
+    for rule in rules:
+        if rule.column not in df.columns:
+            continue
+        column = df[rule.column].to_numpy(dtype="float32", na_value=np.nan)
+        # NaN compares False, so a bounded column must have a value
+        if rule.min_value is not None:
+            keep &= column >= rule.min_value
+        if rule.max_value is not None:
+            keep &= column <= rule.max_value
+
+    return df.loc[keep]
+
+
+@timed("clean_hourly")
 def clean_and_validate_hours(
     df_hourly: pd.DataFrame, temp_col: str = "temp"
 ) -> pd.DataFrame:
@@ -23,79 +121,50 @@ def clean_and_validate_hours(
 
     Steps:
     - Convert index to 'time' column if necessary.
-    - Ensure 'time' column is datetime, replace invalid values with None.
+    - Ensure 'time' column is datetime, invalid values become NaT.
+    - Convert measurements to float32 and 'coco' to nullable Int8.
     - Remove rows where all non-time columns are NaN or 0.
-    - Replace pandas NA values with Python None.
-    - Filter rows where temperature is within realistic bounds.
+    - Filter rows by the bounds of `HOURLY_RULES` (e.g. temperature).
 
+    Missing values are kept as NaN/NA, the writers turn them into NULL.
     """
     df_hourly = rename_index_to_time(df_hourly)
     df_hourly["time"] = pd.to_datetime(
         df_hourly["time"], format="%Y-%m-%d %H:%M:%S", errors="coerce"
     )
-    df_hourly["time"] = df_hourly["time"].where(df_hourly["time"].notna(), None)
 
-    # Identify non-time columns
-    cols_to_check = df_hourly.columns.difference(["time"])
+    df_hourly = to_typed_columns(df_hourly)
 
-    # Create mask: True if value is NaN or 0
-    mask = (df_hourly[cols_to_check].isna()) | (df_hourly[cols_to_check] == 0)
-
-    # Keep rows where not all values are NaN or 0
-    df_hourly = df_hourly[~mask.all(axis=1)]
-
-    # Replace pandas NA with Python None
-    df_hourly.replace({pd.NA: None}, inplace=True)
-
-    # Filter temperature column if exists
-    if temp_col in df_hourly.columns:
-        df_hourly = df_hourly[
-            (df_hourly[temp_col] >= MIN_TEMP) & (df_hourly[temp_col] <= MAX_TEMP)
-        ]
-    # --- Convert 'coco' column to int safely ---
-    if "coco" in df_hourly.columns:
-        df_hourly["coco"] = pd.to_numeric(df_hourly["coco"], errors="coerce").astype(
-            "Int64"
-        )  # nullable int type
-
-    return df_hourly
+    rules = [
+        r._replace(column=temp_col) if r.column == "temp" else r for r in HOURLY_RULES
+    ]
+    return apply_rules(df_hourly, rules)
 
 
+@timed("clean_daily")
 def clean_and_validate_days(df: pd.DataFrame, temp_col: str = "tavg") -> pd.DataFrame:
     """
     Clean and validate daily weather data.
 
     Steps:
     - Convert index to 'time' column if necessary.
-    - Ensure 'time' column is a date object, replace NaN/NaT with None.
+    - Ensure 'time' column is datetime64 at midnight.
+    - Convert measurements to float32.
     - Remove rows where all non-time columns are NaN or 0.
-    - Replace pandas NA values with Python None.
-    - Filter rows where temperature is within realistic bounds.
+    - Filter rows by the bounds of `DAILY_RULES` (e.g. temperature).
+
+    Missing values are kept as NaN, the writers turn them into NULL.
     """
     df = rename_index_to_time(df)
-    # Ensure 'time' column is date
-    df["time"] = pd.to_datetime(df["time"]).dt.date
-
-    # Replace all NaN/NaT with Python None
-    df = df.where(pd.notna(df), None)
-    df = df.astype(object)
-
-    # Identify non-time columns
-    cols_to_check = df.columns.difference(["time"])
-
-    # Create mask: True if value is NaN or 0
-    mask = (df[cols_to_check].isna()) | (df[cols_to_check] == 0)
-
-    # Keep rows where not all values are NaN or 0
-    df = df[~mask.all(axis=1)]
-
-    # Replace pandas NA with Python None
-    df.replace({pd.NA: None}, inplace=True)
+    # Ensure 'time' column is a day, kept as datetime64 (not date objects)
+    df["time"] = pd.to_datetime(df["time"]).dt.normalize()
 
-    if temp_col in df.columns:
-        df = df[(df[temp_col] >= MIN_TEMP) & (df[temp_col] <= MAX_TEMP)]
+    df = to_typed_columns(df)
 
-    return df
+    rules = [
+        r._replace(column=temp_col) if r.column == "tavg" else r for r in DAILY_RULES
+    ]
+    return apply_rules(df, rules)
 
 
 def is_valid_wmo(wmo) -> bool:
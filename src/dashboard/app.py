@@ -15,7 +15,8 @@ import altair as alt
 
 sys.path.append("../")
 from utils.utils import load_data_into_df  # noqa: E402
-from utils.queries import SELECT_STATIONS_DROPDOWN  # noqa: E402
+from utils.downsample import bucket_sums, lttb  # noqa: E402
+from utils.queries import SELECT_DAILY_RANGE, SELECT_STATIONS_DROPDOWN  # noqa: E402
 
 
 # sys.path.insert(1, '/src/dashboard/')
@@ -24,9 +25,10 @@ from utils.queries import SELECT_STATIONS_DROPDOWN  # noqa: E402
 def show_temp():
     """
     Display a line chart of daily average temperatures using Altair.
+    Long ranges are reduced to CHART_POINT_BUDGET points with LTTB.
     """
     temp_chart = (
-        alt.Chart(df)
+        alt.Chart(lttb(df, "time", "tavg"))
         .mark_line(color="#FF4B4B")
         .encode(
             x=alt.X("time:T", title="Idő"),
@@ -44,9 +46,16 @@ def show_temp():
 def show_prcp():
     """
     Display a bar chart of daily precipitation using Altair.
+    Long ranges are summed into CHART_POINT_BUDGET equal buckets.
     """
+    df_prcp = bucket_sums(df, "time", "prcp")
+    bucket_days = int(df_prcp["n"].max()) if not df_prcp.empty else 1
+    title = "🌧 Napi csapadék"
+    if bucket_days > 1:
+        title = f"🌧 Csapadék ({bucket_days} napos összeg)"
+
     prcp_chart = (
-        alt.Chart(df)
+        alt.Chart(df_prcp)
         .mark_bar(color="#1F77B4")
         .encode(
             x=alt.X("time:T", title="Idő"),
@@ -54,12 +63,13 @@ def show_prcp():
             tooltip=[
                 alt.Tooltip("time:T", title="Dátum"),
                 alt.Tooltip("prcp:Q", title="Csapadék mm"),
+                alt.Tooltip("n:Q", title="Napok"),
             ],
         )
         .properties(
             width=700,
             height=200,
-            title="🌧 Napi csapadék",
+            title=title,
             padding={"top": 30, "bottom": 10, "left": 10, "right": 10},
         )
     )
@@ -86,14 +96,10 @@ if start_date > end_date:
     st.error("Start date must be before end date!")
 else:
     # --- Query weather data for the selected date range ---
-    query = f"""
-    SELECT time, tavg, tmin, tmax, prcp
-    FROM weather_data_daily
-    WHERE station_id = {station_id}
-      AND time >= '{start_date}' AND time <= '{end_date}'
-    ORDER BY time ASC;
-    """
-    df = load_data_into_df(query)
+    df = load_data_into_df(
+        SELECT_DAILY_RANGE,
+        params={"station_id": int(station_id), "start": start_date, "end": end_date},
+    )
     df["time"] = pd.to_datetime(df["time"])
 
     # --- Statistical metric cards ---
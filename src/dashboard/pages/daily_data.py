@@ -15,7 +15,7 @@ from meteostat import Hourly
 from datetime import datetime
 
 from src.utils.utils import load_data_into_df
-from src.utils.queries import SELECT_STATION_DATA
+from src.utils.queries import SELECT_STATION_DATA, SELECT_HOURLY_DAY
 from src.utils.constants import COCO_CODES, DAILY_DAYS_SHIFT
 
 
@@ -115,7 +115,6 @@ def show_coco():
 
 st.title("📅 Daily Weather Data")
 
-stations = load_data_into_df(SELECT_STATION_DATA)
 # Load station list
 stations = load_data_into_df(SELECT_STATION_DATA)
 station_name = st.selectbox("Choose a station:", stations["name"])
@@ -137,16 +136,10 @@ data = Hourly(
     end=datetime(selected_date.year, 12, 31),
 )
 
-# Select datas from database
-query = f"""
-SELECT time, temp, dwpt, rhum, prcp, snow, wdir, wspd, wpgt, pres, tsun, coco
-FROM weather_data_hourly
-WHERE station_id = {station_id}
-AND DATE(time) = '{selected_date}'
-ORDER BY time ASC;
-"""
-
-df = load_data_into_df(query)
+# Select datas from database, a time range only scans one yearly partition
+df = load_data_into_df(
+    SELECT_HOURLY_DAY, params={"station_id": int(station_id), "day": selected_date}
+)
 
 if df.empty:
     st.warning("❌ Nincs adat a kiválasztott napra.")
@@ -19,7 +19,7 @@ from utils.constants import ROMANIA_LAT, ROMANIA_LONG, MAP_ZOOM
 # --- Query: stations + latest live weather data ---
 query = SELECT_STATIONS_AND_LATEST_DATA
 
-# Load data into a DataFrame
+# Load data into a DataFrame, one weather_live_latest row per station
 df_stations = load_data_into_df(query)
 
 # Convert 'dt' column to datetime, coercing errors
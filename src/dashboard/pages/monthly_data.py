@@ -1,11 +1,12 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from datetime import datetime
+from datetime import date, datetime
 
 from utils.utils import load_data_into_df
-from utils.queries import SELECT_NAME_WMO_STATIONS
+from utils.queries import SELECT_DAILY_MONTH, SELECT_NAME_WMO_STATIONS
 from utils.constants import BLUE, ORANGE
+from utils.rollups import load_rollups
 
 
 def show_temperatures(df_compare: pd.DataFrame, month: int, colors: list[str]) -> None:
@@ -82,9 +83,14 @@ def show_prcp(df_compare: pd.DataFrame, month: int, colors: list[str]) -> None:
     st.altair_chart(prcp_chart, use_container_width=True)
 
 
-def show_statistics(
-    df_current: pd.DataFrame, df_last: pd.DataFrame, current_year: int
-) -> None:
+def month_value(rollups: pd.DataFrame, period: pd.Timestamp, column: str, default):
+    """Value of one month of the monthly rollup, `default` if it has no data."""
+    if period in rollups.index:
+        return rollups.at[period, column]
+    return default
+
+
+def show_statistics(rollups: pd.DataFrame, month: int, current_year: int) -> None:
     """
     Display statistical summary metrics comparing:
       - Average temperature (°C) between the current and previous year
@@ -95,15 +101,16 @@ def show_statistics(
       - Right column: total monthly precipitation difference
 
     Data source:
-        - Global `df_current` DataFrame (current year)
-        - Global `df_last` DataFrame (previous year)
-        - Global `current_year` variable
+        - `rollups`: rows of weather_rollup_monthly indexed by month
+        - `month` of `current_year` and of the year before
     """
     col1, col2 = st.columns(2)
+    current = pd.Timestamp(current_year, month, 1)
+    last = pd.Timestamp(current_year - 1, month, 1)
 
     # Average temperature difference
-    avg_temp_current = df_current["tavg"].mean()
-    avg_temp_last = df_last["tavg"].mean()
+    avg_temp_current = month_value(rollups, current, "tavg", float("nan"))
+    avg_temp_last = month_value(rollups, last, "tavg", float("nan"))
     temp_diff = avg_temp_current - avg_temp_last
 
     col1.metric(
@@ -113,8 +120,8 @@ def show_statistics(
     )
 
     # Total precipitation difference
-    prcp_sum_current = df_current["prcp"].sum()
-    prcp_sum_last = df_last["prcp"].sum()
+    prcp_sum_current = month_value(rollups, current, "prcp_sum", 0.0)
+    prcp_sum_last = month_value(rollups, last, "prcp_sum", 0.0)
     prcp_diff = prcp_sum_current - prcp_sum_last
 
     col2.metric(
@@ -124,6 +131,29 @@ def show_statistics(
     )
 
 
+def load_months(station_id, month: int, current_year: int) -> pd.DataFrame:
+    """
+    Daily rows of `month` in the current and the previous year, in one query.
+    `day` is the day of the month and `label` the year.
+    """
+    df = load_data_into_df(
+        SELECT_DAILY_MONTH,
+        params={
+            "station_id": int(station_id),
+            "start": date(current_year - 1, month, 1),
+            "end": (
+                pd.Timestamp(current_year, month, 1) + pd.offsets.MonthEnd(0)
+            ).date(),
+            "month": month,
+        },
+    )
+    df["time"] = pd.to_datetime(df["time"])
+    df["day"] = df["time"].dt.day
+    df["label"] = df["time"].dt.year.astype(str)
+    # Current year first, it gets the first chart color
+    return df.sort_values("label", ascending=False, kind="stable")
+
+
 # --- Streamlit App Layout ---
 st.title("📊 Éves összehasonlítás – Idén vs Tavaly")
 
@@ -139,38 +169,22 @@ month = st.selectbox(
     format_func=lambda x: pd.to_datetime(str(x), format="%m").strftime("%B"),
 )
 
-# Load daily data for the last 2 year
-query = f"""
-SELECT time, tavg, tmin, tmax, prcp
-FROM weather_data_daily
-WHERE station_id = {station_id}
-  AND time >= NOW() - INTERVAL '2 years'
-ORDER BY time ASC;
-"""
-df = load_data_into_df(query)
-
-df["time"] = pd.to_datetime(df["time"])
-
-# Filter for selected month
-df_month = df[df["time"].dt.month == month]
-
-# Separete the years
 current_year = pd.Timestamp.now().year
-df_month["year"] = df_month["time"].dt.year
-df_month["day"] = df_month["time"].dt.day
 
-df_current = df_month[df_month["year"] == current_year]
-df_last = df_month[df_month["year"] == (current_year - 1)]
+# Metric cards: one row of the monthly rollup per year
+rollups = load_rollups(
+    "weather_rollup_monthly",
+    station_id,
+    [date(current_year, month, 1), date(current_year - 1, month, 1)],
+)
 
-# Label column
-df_current["label"] = f"{current_year}"
-df_last["label"] = f"{current_year - 1}"
-df_compare = pd.concat([df_current, df_last])
+# Charts: the daily rows of the selected month only, of both years
+df_compare = load_months(station_id, month, current_year)
 
 colors = [BLUE, ORANGE]
 
 # --- Display sections ---
-show_statistics(df_current, df_last, current_year)
+show_statistics(rollups, month, current_year)
 
 show_temperatures(df_compare, month, colors)
 
@@ -2,9 +2,12 @@ import streamlit as st
 import pandas as pd
 import math
 import altair as alt
+from datetime import date
 
 from utils.utils import calc_days_of_year, load_data_into_df
-from utils.queries import SELECT_STATION_DATA
+from utils.queries import SELECT_DAILY_RANGE, SELECT_STATION_DATA
+from utils.rollups import load_rollups
+from utils.downsample import lttb
 
 
 def styled_progress(label, value):
@@ -28,6 +31,25 @@ def styled_progress(label, value):
     )
 
 
+def year_range(station_id, year):
+    """Query parameters of SELECT_DAILY_RANGE covering one calendar year."""
+    return {
+        "station_id": int(station_id),
+        "start": date(year, 1, 1),
+        "end": date(year, 12, 31),
+    }
+
+
+def rollup_row(rollups, year):
+    """Rollup of `year`, an empty one (no days, NaN values) if it has no data."""
+    period = pd.Timestamp(year, 1, 1)
+    if period in rollups.index:
+        return rollups.loc[period]
+    empty = pd.Series(float("nan"), index=rollups.columns, dtype=object)
+    empty[["days", "tavg_days", "prcp_days", "prcp_sum", "rainy_days"]] = 0
+    return empty
+
+
 def show_statistics():
     col1, col2, col3 = st.columns(3)
     if not math.isnan(avg_tavg):
@@ -84,9 +106,9 @@ def show_coverage():
 
 def show_chart():
     if not df_tavg.empty:
-        # Vonaldiagram
+        # Vonaldiagram, at most CHART_POINT_BUDGET points (LTTB)
         daily_temp_chart = (
-            alt.Chart(df_tavg)
+            alt.Chart(lttb(df_tavg, "time", "tavg"))
             .mark_line(color="red")
             .encode(
                 x=alt.X("time:O", title="Nap az évből"),
@@ -113,57 +135,42 @@ year = st.selectbox(
 
 current_year = pd.Timestamp.today().year
 
-# Adatok lekérdezése az adott évre
-query_select_days_data = f"""
-SELECT time, tavg, tmin, tmax, prcp
-FROM weather_data_daily
-WHERE station_id = {station_id}
-  AND EXTRACT(YEAR FROM time) = {year}
-ORDER BY time ASC;
-"""
-df = load_data_into_df(query_select_days_data)
-
-# --- Adatok tisztítása ---
-df["time"] = pd.to_datetime(df["time"])
-# Távolítsuk el a sorokat, ahol minden érték NaN
-df = df.dropna(subset=["tavg", "tmin", "tmax", "prcp"], how="all")
+# --- Éves összesítés: one row of the yearly rollup per year ---
+rollups = load_rollups(
+    "weather_rollup_yearly",
+    station_id,
+    [date(year, 1, 1), date(current_year, 1, 1)],
+)
+summary = rollup_row(rollups, year)
+summary_curr = rollup_row(rollups, current_year)
 
 days_in_year = calc_days_of_year(year)
 
-tavg_coverage = df["tavg"].notna().sum() / days_in_year * 100
-prcp_coverage = df["prcp"].notna().sum() / days_in_year * 100
-
-# --- Éves összesítés ---
-avg_tavg = df["tavg"].mean()
-total_precip = df["prcp"].sum()
-
-rainy_days = df[df["prcp"] > 0].shape[0]
-coldest_day = df.loc[df["tmin"].idxmin()] if not df["tmin"].isna().all() else None
-warmest_day = df.loc[df["tmax"].idxmax()] if not df["tmax"].isna().all() else None
+tavg_coverage = summary["tavg_days"] / days_in_year * 100
+prcp_coverage = summary["prcp_days"] / days_in_year * 100
 
-df_tavg = df[["time", "tavg"]]
-df_tavg["time"] = df_tavg["time"].dt.dayofyear
-
-# --- Markdown összegzés ---
+avg_tavg = summary["tavg"]
+total_precip = summary["prcp_sum"]
+rainy_days = int(summary["rainy_days"])
+coldest_day = summary if pd.notna(summary["tmin"]) else None
+warmest_day = summary if pd.notna(summary["tmax"]) else None
 
 # --- Aktuális év statisztikái (pl. 2025) ---
-query_select_days_data_last_year = f"""
-SELECT time, tavg, tmin, tmax, prcp
-FROM weather_data_daily
-WHERE station_id = {station_id}
-  AND EXTRACT(YEAR FROM time) = {current_year}
-ORDER BY time ASC;
-"""
-df_current = load_data_into_df(query_select_days_data_last_year)
-
-# Calc current year means
-if not df_current.empty:
-    avg_tavg_curr = df_current["tavg"].mean()
-    total_precip_curr = df_current["prcp"].sum()
-    rainy_days_curr = df_current[df_current["prcp"] > 0].shape[0]
+if summary_curr["days"] > 0:
+    avg_tavg_curr = summary_curr["tavg"]
+    total_precip_curr = summary_curr["prcp_sum"]
+    rainy_days_curr = int(summary_curr["rainy_days"])
 else:
     avg_tavg_curr = total_precip_curr = rainy_days_curr = None
 
+# --- Daily temperatures of the chart ---
+# A date range instead of EXTRACT(YEAR FROM time), so the index is used
+df = load_data_into_df(SELECT_DAILY_RANGE, params=year_range(station_id, year))
+df["time"] = pd.to_datetime(df["time"])
+
+df_tavg = df[["time", "tavg"]]
+df_tavg["time"] = df_tavg["time"].dt.dayofyear
+
 # --- 3 hasábban mutatjuk a fő statisztikákat ---
 show_statistics()
 
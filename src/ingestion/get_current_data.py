@@ -1,40 +1,37 @@
+import asyncio
+import aiohttp
+import psycopg2
 import requests
 import pandas as pd
 from datetime import datetime
-from meteostat import Stations
+from psycopg2.extras import execute_values
 
-from src.celan_and_validate.clean_and_validate import is_valid_wmo
+from src.ingestion.live_cache import LiveResponseCache
+from src.ingestion.station_catalog import fetch_catalog
+from src.utils.partitions import ensure_partitions
+from src.utils.queries import INSERT_WEATHER_LIVE, UPSERT_WEATHER_LIVE_LATEST
+from src.utils.constants import (
+    COLS_LIVE,
+    OPENWEATHER_URL,
+    LIVE_FETCH_ASYNC,
+    LIVE_CONCURRENCY,
+    HTTP_TIMEOUT_S,
+    USE_LIVE_CACHE,
+)
 
 
-def fetch_and_store_weather(
-    lat: float, lon: float, station_id: int, conn, api_key: str
-) -> None:
+def build_weather_record(data: dict, station_id: int) -> dict:
     """
-    Fetch current weather from OpenWeather API and store it in PostgreSQL.
+    Turn a One Call API response into a `weather_live` record.
+
     Args:
-        lat (float): Latitude of the station
-        lon (float): Longitude of the station
+        data (dict): Decoded One Call API response
         station_id (int): ID of the station in database
-        conn (psycopg2 connection): Active PostgreSQL connection
-        api_key (str): OpenWeather API key
     """
-    url = (
-        f"https://api.openweathermap.org/data/3.0/onecall"
-        f"?lat={lat}&lon={lon}&exclude=hourly,daily&appid={api_key}&units=metric"
-    )
-
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print(f"❌ Error: {response.status_code} - {response.text}")
-        return
-
-    data = response.json()
     current = data.get("current", {})
     weather = current.get("weather", [{}])[0]  # first element in weather list
 
-    # --- Prepare record for DB ---
-    record = {
+    return {
         "station_id": station_id,
         "lat": data["lat"],
         "lon": data["lon"],
@@ -60,34 +57,260 @@ def fetch_and_store_weather(
         "weather_icon": weather.get("icon"),
     }
 
-    insert_query = """
-    INSERT INTO weather_live (
-        station_id, lat, lon, timezone, timezone_offset,
-        dt, sunrise, sunset, temp, feels_like, pressure,
-        humidity, dew_point, uvi, clouds, visibility,
-        wind_speed, wind_deg, wind_gust,
-        weather_id, weather_main, weather_description, weather_icon
+
+def latest_per_station(records: list[dict]) -> list[dict]:
+    """Keep the newest record (highest `dt`) of every station."""
+    latest = {}
+    for record in records:
+        current = latest.get(record["station_id"])
+        if current is None or record["dt"] > current["dt"]:
+            latest[record["station_id"]] = record
+    return list(latest.values())
+
+
+def write_live_records(cur, records: list[dict], template: str) -> None:
+    """Append `records` to `weather_live` and upsert `weather_live_latest`."""
+    execute_values(cur, INSERT_WEATHER_LIVE, records, template=template)
+    execute_values(
+        cur, UPSERT_WEATHER_LIVE_LATEST, latest_per_station(records), template=template
     )
-    VALUES (
-        %(station_id)s,
-        %(lat)s, %(lon)s, %(timezone)s, %(timezone_offset)s,
-        %(dt)s, %(sunrise)s, %(sunset)s, %(temp)s, %(feels_like)s,
-        %(pressure)s, %(humidity)s, %(dew_point)s, %(uvi)s,
-        %(clouds)s, %(visibility)s, %(wind_speed)s, %(wind_deg)s,
-        %(wind_gust)s, %(weather_id)s, %(weather_main)s,
-        %(weather_description)s, %(weather_icon)s
-    );
-    """
-
-    cur = conn.cursor()
-    cur.execute(insert_query, record)
+
+
+def insert_weather_live(conn, records: list[dict]) -> list[tuple[int, str]]:
+    """
+    Insert many `weather_live` records in one transaction.
+
+    All records are written with a single `execute_values` call, and the
+    newest record of every station is upserted into `weather_live_latest`
+    in the same transaction. If the batch is rejected (e.g. a station
+    missing from `stations`), it is written again row by row behind
+    savepoints, so only the broken records are left out. Either way there
+    is a single commit.
+
+    Returns:
+        list: (station_id, error message) pairs of the records not inserted.
+    """
+    if not records:
+        print("No live weather records to insert.")
+        return []
+
+    template = "(" + ", ".join(f"%({col})s" for col in COLS_LIVE) + ")"
+    failures = []
+
+    observed = [record["dt"] for record in records]
+    ensure_partitions(conn, "weather_live", min(observed), max(observed))
+
+    try:
+        with conn.cursor() as cur:
+            write_live_records(cur, records, template)
+    except psycopg2.Error:
+        conn.rollback()
+        with conn.cursor() as cur:
+            for record in records:
+                cur.execute("SAVEPOINT live_record;")
+                try:
+                    write_live_records(cur, [record], template)
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT live_record;")
+                    failures.append((record["station_id"], str(e).strip()))
+                cur.execute("RELEASE SAVEPOINT live_record;")
     conn.commit()
-    cur.close()
 
-    print(f"✅ Weather record inserted for station_id={station_id}")
+    print(f"✅ {len(records) - len(failures)} live weather records inserted")
+    return failures
+
+
+def fetch_weather(
+    lat: float,
+    lon: float,
+    station_id: int,
+    api_key: str,
+    cache: LiveResponseCache | None = None,
+) -> dict | None:
+    """
+    Fetch current weather of one station from OpenWeather API.
+    Args:
+        lat (float): Latitude of the station
+        lon (float): Longitude of the station
+        station_id (int): ID of the station in database
+        api_key (str): OpenWeather API key
+        cache (LiveResponseCache): Optional response cache, a current cached
+            observation skips both the HTTP call and the insert
+
+    Returns:
+        dict | None: The decoded One Call response, or None when there is no
+            new observation to store. Raises on HTTP errors. The response is
+            not cached here, see `cache_stored_responses`.
+    """
+    if cache is not None and cache.get(station_id, lat, lon) is not None:
+        print(f"♻️ Cached observation still current for station_id={station_id}")
+        return None
+
+    url = (
+        f"{OPENWEATHER_URL}"
+        f"?lat={lat}&lon={lon}&exclude=hourly,daily&appid={api_key}&units=metric"
+    )
+
+    response = requests.get(url, timeout=HTTP_TIMEOUT_S)
+
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.status_code} - {response.text}")
+
+    data = response.json()
+    if cache is not None and not cache.is_new(station_id, lat, lon, data):
+        print(f"♻️ No new observation for station_id={station_id}")
+        return None
+
+    return data
+
+
+def cache_stored_responses(
+    cache: LiveResponseCache | None,
+    fetched: list[tuple[dict, dict]],
+    failures: list[tuple[int, str]],
+) -> None:
+    """
+    Put the responses whose records were committed into the cache.
+
+    Caching before the insert would hide an observation that failed to be
+    written from the next runs, so this runs after `insert_weather_live`.
+
+    Args:
+        cache (LiveResponseCache): Response cache, nothing to do if None.
+        fetched (list): (station, One Call response) pairs of the run.
+        failures (list): (station_id, error message) pairs not inserted.
+    """
+    if cache is None:
+        return
+    failed = {station_id for station_id, _ in failures}
+    for station, data in fetched:
+        if station["station_id"] not in failed:
+            cache.put(station["station_id"], station["lat"], station["lon"], data)
+
+
+def fetch_and_store_weather(
+    lat: float,
+    lon: float,
+    station_id: int,
+    conn,
+    api_key: str,
+    cache: LiveResponseCache | None = None,
+) -> None:
+    """
+    Fetch current weather from OpenWeather API and store it in PostgreSQL.
+    Args:
+        lat (float): Latitude of the station
+        lon (float): Longitude of the station
+        station_id (int): ID of the station in database
+        conn (psycopg2 connection): Active PostgreSQL connection
+        api_key (str): OpenWeather API key
+        cache (LiveResponseCache): Optional response cache
+    """
+    data = fetch_weather(lat, lon, station_id, api_key, cache)
+    if data is not None:
+        failures = insert_weather_live(conn, [build_weather_record(data, station_id)])
+        station = {"station_id": station_id, "lat": lat, "lon": lon}
+        cache_stored_responses(cache, [(station, data)], failures)
+
+
+async def _fetch_one_async(
+    session: aiohttp.ClientSession,
+    slots: asyncio.Semaphore,
+    station: dict,
+    api_key: str,
+    url: str,
+) -> dict:
+    """
+    Fetch the decoded One Call response of one station on the shared
+    session. The request is only sent once it holds one of the `slots`,
+    so its timeout does not run while it waits. Raises on any non-200
+    answer.
+    """
+    params = {
+        "lat": station["lat"],
+        "lon": station["lon"],
+        "exclude": "hourly,daily",
+        "appid": api_key,
+        "units": "metric",
+    }
+    async with slots, session.get(url, params=params) as response:
+        if response.status != 200:
+            text = await response.text()
+            raise RuntimeError(f"{response.status} - {text}")
+        return await response.json()
 
 
-def fetch_weather_nearby(api_key, conn, regions: list[str]):
+async def fetch_current_weather_async(
+    stations: list[dict],
+    api_key: str,
+    concurrency: int = LIVE_CONCURRENCY,
+    url: str = OPENWEATHER_URL,
+    cache: LiveResponseCache | None = None,
+) -> tuple[list[tuple[dict, dict]], list[tuple[int, str]]]:
+    """
+    Fetch the current weather of all stations at the same time.
+
+    All requests share one `aiohttp` session, so TCP/TLS connections are
+    reused. A semaphore keeps at most `concurrency` requests in flight, the
+    others wait before their request (and its timeout) starts.
+
+    Args:
+        stations (list[dict]): Stations with `station_id`, `lat` and `lon` keys.
+        api_key (str): OpenWeather API key.
+        concurrency (int): Maximum number of parallel requests.
+        url (str): One Call endpoint, overridable for tests.
+        cache (LiveResponseCache): Optional response cache. Stations with a
+            current cached observation are not requested, responses
+            repeating the cached observation are left out. Nothing is
+            cached here, see `cache_stored_responses`.
+
+    Returns:
+        tuple: (station, One Call response) pairs with a new observation and
+            a list of (station_id, error message) pairs for the failed
+            stations.
+    """
+    if cache is not None:
+        stations = [
+            s
+            for s in stations
+            if cache.get(s["station_id"], s["lat"], s["lon"]) is None
+        ]
+
+    slots = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_S)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(
+            *(_fetch_one_async(session, slots, s, api_key, url) for s in stations),
+            return_exceptions=True,
+        )
+
+    fetched, failures = [], []
+    for station, result in zip(stations, results):
+        if isinstance(result, Exception):
+            failures.append((station["station_id"], str(result) or repr(result)))
+        elif cache is None or cache.is_new(
+            station["station_id"], station["lat"], station["lon"], result
+        ):
+            fetched.append((station, result))
+
+    return fetched, failures
+
+
+def get_live_stations(regions: list[str]) -> pd.DataFrame:
+    """
+    Fetch the stations of the given regions from Meteostat and keep the ones
+    with a valid WMO id. The returned frame has an integer `station_id` column.
+    """
+    stations = fetch_catalog(regions)
+    stations["station_id"] = stations["wmo"].astype(int)
+    return stations
+
+
+def fetch_weather_nearby(
+    api_key, conn, regions: list[str], use_async: bool = LIVE_FETCH_ASYNC
+):
     """
     Fetch the nearest `n_stations` to the given coordinates (lat, lon) and
     store their current weather data. If a list of regions is provided,
@@ -95,54 +318,69 @@ def fetch_weather_nearby(api_key, conn, regions: list[str]):
 
     Args:
         api_key (str): API key for fetching weather data.
-        conn: Database connection object.
+        conn: Database connection object, left open for the caller.
         regions (list[str]): List of region codes to
             filter stations. Defaults to None.
+        use_async (bool): Fetch all stations concurrently instead of one
+            after another. Both modes write the whole run with one bulk
+            insert and report the failed stations at the end.
     """
-    try:
-        Stations.cache_dir = "meteostat/cache"
-        stations_obj = Stations()
+    cache = LiveResponseCache() if USE_LIVE_CACHE else None
 
+    try:
         # If regions list is provided, filter stations by each region
-        if regions:
-            dfs = []
-            for region_code in regions:
-                region_stations = stations_obj.region("RO", region_code).fetch()
-                dfs.append(region_stations)
-            stations = pd.concat(dfs, ignore_index=True)
-        else:
+        if not regions:
             print("Invalid data!")
             return
 
-        # --- Filter out invalid WMOs ---
-        valid_mask = stations["wmo"].apply(is_valid_wmo)
-        n_total, n_kept = len(stations), int(valid_mask.sum())
-        print(
-            f"Stations total: {n_total}, kept valid WMO: {n_kept}, dropped: {n_total - n_kept}"
+        stations = get_live_stations(regions)
+        station_list = (
+            stations[["station_id", "latitude", "longitude"]]
+            .rename(columns={"latitude": "lat", "longitude": "lon"})
+            .to_dict("records")
         )
 
-        stations = stations.loc[valid_mask]
-
-        for idx, row in stations.iterrows():
-            station_id = int(float(str(row["wmo"]).strip()))
-            station_lat = row["latitude"]
-            station_lon = row["longitude"]
-            name = row["name"]
+        if use_async:
+            print(f"🌍 Fetching {len(station_list)} stations concurrently")
 
-            print(
-                f"🌍 Fetching: {name} (ID={station_id}, lat={station_lat}, lon={station_lon})"
+            fetched, failures = asyncio.run(
+                fetch_current_weather_async(station_list, api_key, cache=cache)
             )
-
-            try:
-                fetch_and_store_weather(
-                    lat=station_lat,
-                    lon=station_lon,
-                    station_id=station_id,
-                    conn=conn,
-                    api_key=api_key,
+        else:
+            fetched, failures = [], []
+            for row, station in zip(stations.itertuples(index=False), station_list):
+                print(
+                    f"🌍 Fetching: {row.name} (ID={row.station_id}, "
+                    f"lat={row.latitude}, lon={row.longitude})"
                 )
-            except Exception as e:
-                print(f"❌ Error at station {name}: {e}")
+                try:
+                    data = fetch_weather(
+                        lat=row.latitude,
+                        lon=row.longitude,
+                        station_id=row.station_id,
+                        api_key=api_key,
+                        cache=cache,
+                    )
+                except Exception as e:
+                    failures.append((row.station_id, str(e)))
+                    continue
+                if data is not None:
+                    fetched.append((station, data))
+
+        # --- One bulk write for the whole run ---
+        records = [
+            build_weather_record(data, station["station_id"])
+            for station, data in fetched
+        ]
+        failures += insert_weather_live(conn, records)
+        # Only committed observations are cached
+        cache_stored_responses(cache, fetched, failures)
+
+        print(f"Live run: {len(records)} fetched, {len(failures)} failed")
+        for station_id, error in failures:
+            print(f"❌ Error at station {station_id}: {error}")
 
     finally:
-        conn.close()
+        if cache is not None:
+            print(f"Live cache: {cache.stats()}")
+            cache.close()
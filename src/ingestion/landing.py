@@ -0,0 +1,135 @@
+"""
+Local Parquet landing zone for raw Meteostat responses
+
+Raw Hourly/Daily frames are stored unchanged, partitioned by granularity,
+station and month:
+
+    data/landing/hourly/station=15120/month=2024-01.parquet
+
+`LandingCache.fetch` reads the months that are already on disk and only
+calls the remote API for months that are missing or still open (recent
+months that Meteostat may still fill in). A closed month without any row
+is stored as an empty file, so a real gap in the history is not requested
+again on every run. This makes re-running the cleaning/loading steps
+possible at disk speed and without network access.
+"""
+
+import os
+import pandas as pd
+from datetime import datetime, timedelta
+
+from src.utils.constants import LANDING_DIR, LANDING_GRACE_DAYS
+
+
+class LandingCache:
+    """
+    Read-through Parquet cache of raw Meteostat frames.
+
+    Args:
+        root (str): Directory of the landing zone.
+        offline (bool): Never call the API, missing months are returned empty.
+        grace_days (int): A month counts as open until this many days after
+            its end, open months are always fetched again.
+    """
+
+    def __init__(
+        self,
+        root: str = LANDING_DIR,
+        offline: bool = False,
+        grace_days: int = LANDING_GRACE_DAYS,
+    ):
+        self.root = root
+        self.offline = offline
+        self.grace_days = grace_days
+
+    def path(self, granularity: str, station_id, month: pd.Period) -> str:
+        """Return the Parquet file of one station-month."""
+        return os.path.join(
+            self.root,
+            granularity,
+            f"station={station_id}",
+            f"month={month.strftime('%Y-%m')}.parquet",
+        )
+
+    def is_closed(self, month: pd.Period) -> bool:
+        """True when the month ended more than `grace_days` ago."""
+        closes_at = month.end_time + timedelta(days=self.grace_days)
+        return closes_at < pd.Timestamp(datetime.now())
+
+    def write_month(
+        self, granularity: str, station_id, month: pd.Period, df: pd.DataFrame
+    ) -> None:
+        """Store the raw frame of one month, replacing the file atomically."""
+        path = self.path(granularity, station_id, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _fetch_months(self, granularity, station_id, months, fetch_func) -> dict:
+        """
+        Fetch a run of consecutive months with one call and store them.
+        Open months without rows are not stored, they are fetched again
+        anyway.
+        """
+        start = months[0].start_time.to_pydatetime()
+        month_end = (months[-1] + 1).start_time.to_pydatetime() - timedelta(seconds=1)
+        end = min(month_end, datetime.now())
+        df = fetch_func(start, end)
+
+        by_month = df.index.to_period("M") if len(df) else None
+        frames = {}
+        for month in months:
+            part = df[by_month == month] if by_month is not None else df.iloc[0:0]
+            if len(part) or self.is_closed(month):
+                self.write_month(granularity, station_id, month, part)
+            frames[month] = part
+        return frames
+
+    def fetch(
+        self,
+        granularity: str,
+        station_id,
+        start: datetime,
+        end: datetime,
+        fetch_func,
+    ) -> pd.DataFrame:
+        """
+        Return the raw frame of [start, end] for one station.
+
+        Args:
+            granularity (str): "hourly" or "daily", used in the path.
+            station_id: Meteostat station id.
+            start (datetime): First timestamp to return.
+            end (datetime): Last timestamp to return.
+            fetch_func: Callable (start, end) -> DataFrame that calls the API.
+                It is called once per run of consecutive missing/open months.
+        """
+        months = list(pd.period_range(start, end, freq="M"))
+        frames = {}
+        to_fetch = []
+
+        for month in months:
+            path = self.path(granularity, station_id, month)
+            cached = os.path.exists(path)
+            if cached and (self.offline or self.is_closed(month)):
+                frames[month] = pd.read_parquet(path)
+            elif not self.offline:
+                to_fetch.append(month)
+
+        # Group missing months into consecutive runs, one API call per run
+        runs = []
+        for month in to_fetch:
+            if runs and runs[-1][-1] + 1 == month:
+                runs[-1].append(month)
+            else:
+                runs.append([month])
+        for run in runs:
+            frames.update(self._fetch_months(granularity, station_id, run, fetch_func))
+
+        available = [frames[m] for m in months if m in frames]
+        parts = [f for f in available if len(f)] or available[:1]
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat(parts).sort_index()
+        return df.loc[start:end] if len(df) else df
@@ -0,0 +1,134 @@
+"""
+Stale-aware cache for OpenWeather One Call responses
+
+Responses are stored in a small SQLite file keyed by the station id and
+its rounded coordinates, so the cache survives between `current_data.py` runs (each
+Airflow task runs it in a fresh subprocess).
+
+- A response younger than the TTL is served from the cache: no HTTP call
+  and no new `weather_live` row, because it was stored when fetched.
+- A fetched response whose `current.dt` equals the cached one is a repeat
+  of an observation already stored, so it is not inserted again.
+
+Responses are only `put` after their `weather_live` rows are committed, a
+failed insert leaves the cache as it was and the next run fetches again.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from src.utils.constants import (
+    LIVE_CACHE_PATH,
+    LIVE_CACHE_TTL_S,
+    LIVE_CACHE_PRECISION,
+)
+
+CREATE_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS onecall_responses (
+    key TEXT PRIMARY KEY,        -- "station_id:lat,lon", coordinates rounded
+    fetched_at REAL NOT NULL,    -- unix time of the HTTP call
+    observed_at INTEGER,         -- current.dt of the response
+    payload TEXT NOT NULL        -- raw JSON response
+);
+"""
+
+
+class LiveResponseCache:
+    """
+    SQLite backed One Call response cache with hit/miss counters.
+
+    Args:
+        path (str): SQLite file, created if missing.
+        ttl_s (int): Seconds a response is considered current. OpenWeather
+            refreshes current conditions about every 10 minutes.
+        precision (int): Decimals the coordinates are rounded to.
+    """
+
+    def __init__(
+        self,
+        path: str = LIVE_CACHE_PATH,
+        ttl_s: int = LIVE_CACHE_TTL_S,
+        precision: int = LIVE_CACHE_PRECISION,
+    ):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(CREATE_CACHE_TABLE)
+        self.ttl_s = ttl_s
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+
+    def key(self, station_id: int, lat: float, lon: float) -> str:
+        """
+        Cache key of a station. The id keeps stations in the same rounded
+        coordinate cell apart.
+        """
+        return (
+            f"{int(station_id)}:"
+            f"{float(lat):.{self.precision}f},{float(lon):.{self.precision}f}"
+        )
+
+    def get(self, station_id: int, lat: float, lon: float) -> dict | None:
+        """
+        Return the cached response if it is younger than the TTL,
+        otherwise None. Updates the hit/miss counters.
+        """
+        row = self.conn.execute(
+            "SELECT fetched_at, payload FROM onecall_responses WHERE key = ?",
+            (self.key(station_id, lat, lon),),
+        ).fetchone()
+
+        if row is not None and time.time() - row[0] < self.ttl_s:
+            self.hits += 1
+            return json.loads(row[1])
+
+        self.misses += 1
+        return None
+
+    def is_new(self, station_id: int, lat: float, lon: float, payload: dict) -> bool:
+        """
+        Compare a fetched response with the cached one, expired or not.
+
+        Returns:
+            bool: True if it holds a new observation, False if `current.dt`
+                is the same as the one already cached.
+        """
+        row = self.conn.execute(
+            "SELECT observed_at FROM onecall_responses WHERE key = ?",
+            (self.key(station_id, lat, lon),),
+        ).fetchone()
+
+        is_new = row is None or row[0] != payload.get("current", {}).get("dt")
+        if not is_new:
+            self.duplicates += 1
+        return is_new
+
+    def put(self, station_id: int, lat: float, lon: float, payload: dict) -> None:
+        """Store a response whose observation is written to the database."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO onecall_responses VALUES (?, ?, ?, ?)",
+            (
+                self.key(station_id, lat, lon),
+                time.time(),
+                payload.get("current", {}).get("dt"),
+                json.dumps(payload),
+            ),
+        )
+        self.conn.commit()
+
+    def stats(self) -> dict:
+        """Counters of the current run."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "duplicates": self.duplicates,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self.conn.close()
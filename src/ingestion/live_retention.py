@@ -0,0 +1,120 @@
+"""
+Retention of the weather_live history
+
+The raw live snapshots are only read for the newest observation, which
+`weather_live_latest` keeps. `apply_live_retention` keeps full resolution
+for the last `LIVE_RETENTION_DAYS` and compacts everything older into
+hourly min/mean/max rows of `weather_live_hourly`, then removes the raw
+rows in bulk:
+
+- monthly partitions ending before the cutoff are dropped whole, their
+  space is freed at once;
+- the older rows of the partition holding the cutoff are deleted, their
+  space stays in the table until autovacuum reuses it.
+
+Everything runs in one transaction, a failed run leaves the raw rows in
+place and the next run compacts them.
+"""
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from src.utils.constants import LIVE_RETENTION_DAYS
+from src.utils.metrics import stage
+from src.utils.partitions import drop_partitions, list_partitions
+from src.utils.queries import (
+    COMPACT_WEATHER_LIVE,
+    DELETE_WEATHER_LIVE_BEFORE,
+    SELECT_PARTITION_ROWS_AND_BYTES,
+    SELECT_TABLE_BYTES,
+)
+
+
+def retention_cutoff(now: datetime, keep_days: int) -> datetime:
+    """Start of the hour `keep_days` before `now`, older snapshots expire."""
+    return pd.Timestamp(now - timedelta(days=keep_days)).floor("h").to_pydatetime()
+
+
+def table_bytes(conn, table: str) -> int:
+    """On-disk size of `table` with its partitions, indexes and TOAST."""
+    with conn.cursor() as cur:
+        cur.execute(SELECT_TABLE_BYTES, (table,))
+        return int(cur.fetchone()[0])
+
+
+def partition_rows_and_bytes(conn, partition: str) -> tuple[int, int]:
+    """Row count and on-disk size of one partition."""
+    with conn.cursor() as cur:
+        cur.execute(
+            SELECT_PARTITION_ROWS_AND_BYTES.format(partition=partition), (partition,)
+        )
+        rows, size = cur.fetchone()
+        return int(rows), int(size)
+
+
+def apply_live_retention(
+    conn, keep_days: int = LIVE_RETENTION_DAYS, now: datetime | None = None
+) -> dict:
+    """
+    Compact the weather_live snapshots older than `keep_days` into hourly
+    rows and remove them.
+
+    Steps:
+        - Aggregate every station-hour before the cutoff into
+          `weather_live_hourly` (merged with hours compacted earlier).
+        - Count the rows and bytes of the monthly partitions that end
+          before the cutoff, then drop them.
+        - Delete the remaining expired rows of the boundary partition.
+        - Commit, then measure the table size again.
+
+    Only the bytes of the dropped partitions count as reclaimed, deleted
+    rows keep their space until VACUUM.
+
+    Args:
+        conn: Open PostgreSQL database connection object.
+        keep_days (int): Days of raw snapshots to keep.
+        now (datetime): Reference time, defaults to the current time.
+
+    Returns:
+        dict: Cutoff, compacted/removed row counts (dropped and deleted),
+            dropped partitions, reclaimed bytes and the size of weather_live
+            before and after.
+    """
+    cutoff = retention_cutoff(now or datetime.now(), keep_days)
+    report = {"cutoff": cutoff, "bytes_before": table_bytes(conn, "weather_live")}
+
+    with stage("live_retention") as record:
+        with conn.cursor() as cur:
+            cur.execute(COMPACT_WEATHER_LIVE, {"cutoff": cutoff})
+            report["rows_compacted"], report["hourly_rows"] = cur.fetchone()
+
+        expired = [
+            name
+            for name, _, upper in list_partitions(conn, "weather_live")
+            if upper <= pd.Timestamp(cutoff)
+        ]
+        dropped = [partition_rows_and_bytes(conn, name) for name in expired]
+        drop_partitions(conn, "weather_live", expired)
+        report["partitions_dropped"] = expired
+        report["rows_dropped"] = sum(rows for rows, _ in dropped)
+        report["bytes_reclaimed"] = sum(size for _, size in dropped)
+
+        with conn.cursor() as cur:
+            cur.execute(DELETE_WEATHER_LIVE_BEFORE, {"cutoff": cutoff})
+            report["rows_deleted"] = report["rows_dropped"] + cur.rowcount
+        conn.commit()
+
+        report["bytes_after"] = table_bytes(conn, "weather_live")
+        conn.commit()
+        record["rows"] = report["rows_compacted"]
+        record["bytes"] = report["bytes_reclaimed"]
+
+    print(
+        f"🧹 weather_live before {cutoff:%Y-%m-%d %H:%M}: "
+        f"{report['rows_compacted']} snapshots -> {report['hourly_rows']} hourly rows, "
+        f"{len(expired)} partitions dropped, {report['rows_deleted']} rows removed, "
+        f"{report['bytes_reclaimed'] / 2**20:.1f} MiB reclaimed "
+        f"({report['bytes_after'] / 2**20:.1f} MiB left)"
+    )
+    return report
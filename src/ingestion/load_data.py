@@ -1,28 +1,47 @@
+import os
+import multiprocessing.util
 import pandas as pd
 import http.client
 import time
-from datetime import datetime
-from meteostat import Stations, Daily, Hourly
-from psycopg2.extras import execute_values
-
-from src.utils.utils import get_start_date, copy_to_db, insert_into_db
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import repeat
+from meteostat import Daily, Hourly
+
+from src.ingestion.landing import LandingCache
+from src.ingestion.station_catalog import fetch_catalog, sync_stations
+from src.utils.connect_db import connect_to_db, get_pool
+from src.utils.metrics import METRICS, count_retry, stage, station_scope, timed
+from src.utils.partitions import ensure_partitions
+from src.utils.rollups import refresh_rollups
+from src.utils.utils import get_start_date, upsert_to_db
+from src.utils.binary_copy import HOURLY_COPY_TYPES, DAILY_COPY_TYPES
 from src.utils.queries import (
-    INSERT_STATIONS,
+    CREATE_SCHEMA_MIGRATIONS,
+    INSERT_SCHEMA_MIGRATION,
+    SELECT_APPLIED_MIGRATIONS,
     SELEC_STATION_START_VALUES,
-    INSERT_WEATHER_DAILY,
     UPDATE_STATION_LAST_UPDATE,
 )
 from src.celan_and_validate.clean_and_validate import (
     clean_and_validate_hours,
     clean_and_validate_days,
-    is_valid_wmo,
+    to_typed_columns,
 )
+from src.celan_and_validate.aggregate import daily_from_hourly, uncovered_days
 from src.utils.constants import (
     REGIONS,
     COLS_HOURLY,
     COLS_DAILY,
     NR_OF_RETRIES,
     DELAY_TIME_S,
+    NR_OF_WORKERS,
+    WORKER_MODE,
+    BACKFILL_WINDOW_DAYS,
+    REFETCH_OVERLAP_DAYS,
+    USE_LANDING_CACHE,
+    LANDING_OFFLINE,
+    DERIVE_DAILY_FROM_HOURLY,
 )
 
 
@@ -40,109 +59,58 @@ def create_tables(conn):
     cur.close()
 
 
-def load_stations(conn):
+def run_migrations(conn, path: str = "postgresql/migrations"):
     """
-    Load Romanian weather stations from the Meteostat API, filter invalid ones,
-    and insert valid stations into the database.
-
-    Steps:
-        - Fetch all Romanian stations (filtered by REGIONS if specified).
-        - Convert date columns to datetime format.
-        - Drop stations with invalid WMO codes.
-        - Insert valid station records into the database.
+    Apply the SQL migrations in `path` that have not run yet, in file name
+    order. Every applied file is recorded in `schema_migrations` in the
+    transaction of its SQL, so a file runs exactly once per database.
 
     Args:
         conn: Open PostgreSQL database connection object.
+        path (str): Directory of the `*.sql` migration files.
     """
-    cur = conn.cursor()
-
-    Stations.cache_dir = "meteostat/cache"
+    with conn.cursor() as cur:
+        cur.execute(CREATE_SCHEMA_MIGRATIONS)
+        cur.execute(SELECT_APPLIED_MIGRATIONS)
+        applied = {file_name for (file_name,) in cur.fetchall()}
+        conn.commit()
+
+        for file_name in sorted(os.listdir(path)):
+            if not file_name.endswith(".sql") or file_name in applied:
+                continue
+            with open(os.path.join(path, file_name), "r") as f:
+                cur.execute(f.read())
+            cur.execute(INSERT_SCHEMA_MIGRATION, (file_name,))
+            conn.commit()
+            print(f"Migration applied: {file_name}")
 
-    stations = Stations()
 
-    stations = stations.region("RO")
+@timed("load_stations")
+def load_stations(conn, force: bool = False):
+    """
+    Sync the Romanian weather stations of REGIONS from the Meteostat API
+    into the database.
 
-    print("Stations in Romania:", stations.count())
+    Steps:
+        - Fetch all Romanian stations and keep the ones in REGIONS.
+        - Parse the WMO codes and drop invalid stations.
+        - Skip the write if the catalog did not change since the last sync,
+          otherwise upsert only the new or changed stations.
 
-    # Fetch once and filter locally if REGIONS are provided
-    df_stations = stations.fetch()
-    if REGIONS:
-        df_stations = df_stations[df_stations["region"].isin(REGIONS)]
-    else:
+    Args:
+        conn: Open PostgreSQL database connection object.
+        force (bool): Upsert even if the catalog fingerprint is unchanged.
+    """
+    if not REGIONS:
         print("Invalid data!")
-        return
-
-    # print("Filtered stations:", len(df_stations))
-
-    # print(df_stations)
-
-    # Convert date strings to datetime
-    date_cols = ["hourly_start", "hourly_end", "daily_start", "daily_end"]
-
-    for col in date_cols:
-        df_stations[col] = pd.to_datetime(df_stations[col]).dt.date
+        return None
 
-    # Replace all Pandas NA types with Python None
-    df_stations.replace({pd.NA: None}, inplace=True)
-
-    # --- Filter DataFrame first ---
-    valid_mask = df_stations["wmo"].apply(is_valid_wmo)
-    n_total = len(df_stations)
-    n_kept = int(valid_mask.sum())
-    n_dropped = n_total - n_kept
-
-    print(
-        f"Stations total: {n_total}, kept (valid wmo): {n_kept}, dropped: {n_dropped}"
-    )
-
-    if n_dropped:
-        # show a few example offending values for debugging
-        bad_examples = df_stations.loc[~valid_mask, "wmo"].astype(str).unique()[:20]
-        print("Examples of dropped wmo values:", bad_examples)
-
-    # Convert DataFrame rows to list of tuples in the same column order as the table
-    records = []
-    for i, row in enumerate(
-        df_stations.loc[valid_mask].itertuples(index=False), start=1
-    ):
-        # row.wmo is now safe to convert
-        try:
-            # convert robustly (handles "123", 123.0, "123.0", etc.)
-            wmo_value = int(float(str(row.wmo).strip()))
-        except Exception:
-            # should not happen due to prior filter, but be defensive
-            print(f"Skipping row due to wmo conversion error: {row}")
-            continue
-
-        records.append(
-            (
-                row.name,
-                row.country,
-                row.region,
-                wmo_value,
-                row.icao,
-                row.latitude,
-                row.longitude,
-                row.elevation,
-                row.timezone,
-                row.hourly_start,
-                row.hourly_end,
-                row.daily_start,
-                row.daily_end,
-            )
-        )
-
-    # Only insert when we have records
-    # On conflict do nothing, so skip the duplicates
-    if records:
-        execute_values(cur, INSERT_STATIONS, records)
-    else:
-        print("No valid station records to insert.")
-
-    conn.commit()
-    cur.close()
+    catalog = fetch_catalog(REGIONS)
+    scope = "stations:" + ",".join(sorted(REGIONS))
+    return sync_stations(conn, catalog, scope=scope, force=force)
 
 
+@timed("fetch")
 def fetch_with_retry(fetch_func, retries=NR_OF_RETRIES, delay=DELAY_TIME_S):
     for attempt in range(retries):
         try:
@@ -152,69 +120,308 @@ def fetch_with_retry(fetch_func, retries=NR_OF_RETRIES, delay=DELAY_TIME_S):
                 print(
                     f"IncompleteRead, retrying in {delay}s... ({attempt+1}/{retries})"
                 )
+                count_retry()
                 time.sleep(delay)
             else:
                 raise
 
 
-def load_weather_data(conn):
+def fetch_meteostat(source, granularity: str, station_id, start, end):
+    """
+    Fetch a Meteostat `Hourly`/`Daily` frame of one station, through the
+    local Parquet landing cache when it is enabled. The frame is converted
+    to the compact float32 schema right away.
     """
-    Fetch and store weather data (hourly and daily) from Meteostat API
-    for all stations in the database.
 
-    Steps:
-        - Retrieve start dates for each station from the database.
-        - Fetch hourly and daily data from Meteostat API.
-        - Clean and validate the data.
-        - Insert hourly data using COPY for efficiency.
-        - Insert daily data using parameterized INSERT.
+    def fetch_remote(range_start, range_end):
+        return fetch_with_retry(
+            lambda: source(station_id, start=range_start, end=range_end).fetch()
+        )
+
+    if not USE_LANDING_CACHE:
+        df = fetch_remote(start, end)
+    else:
+        df = LandingCache(offline=LANDING_OFFLINE).fetch(
+            granularity, station_id, start, end, fetch_remote
+        )
+    return to_typed_columns(df)
+
+
+def fetch_daily(station_id, start, end, df_hourly: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return the daily frame of [start, end] built from the cleaned hourly
+    frame of the same range. The Daily API is only called for the complete
+    days without enough hourly data, once per run of consecutive days.
+
+    Args:
+        station_id (int): WMO id of the station.
+        start, end (datetime): Range of the window.
+        df_hourly (pd.DataFrame): Cleaned hourly data of the window.
+
+    Returns:
+        pd.DataFrame: Daily frame indexed by day, like a fetched `Daily`.
+    """
+    derived = daily_from_hourly(df_hourly)
+    missing = uncovered_days(derived, start, end)
+    if missing.empty:
+        return derived
+
+    # Group missing days into consecutive runs, one API call per run
+    runs = []
+    for day in missing:
+        if runs and runs[-1][-1] + pd.Timedelta(days=1) == day:
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    fetched = pd.concat(
+        [fetch_meteostat(Daily, "daily", station_id, run[0], run[-1]) for run in runs]
+    )
+    fetched = fetched[fetched.index.isin(missing)]
+    print(
+        f"Station {station_id}: {len(derived)} days from hourly data, "
+        f"{len(fetched)}/{len(missing)} days without hourly coverage from Daily"
+    )
+    return pd.concat([derived, fetched]).sort_index()
+
+
+def iter_windows(start: datetime, end: datetime, window_days: int):
+    """
+    Split [start, end] into consecutive windows of `window_days` days.
+    Each window ends one second before the next one starts, so the
+    inclusive Meteostat ranges do not overlap.
+    """
+    window = timedelta(days=window_days)
+    while start <= end:
+        next_start = start + window
+        yield start, min(next_start - timedelta(seconds=1), end)
+        start = next_start
+
+
+def load_station_weather(
+    conn, row, end_date: datetime, window_days: int = BACKFILL_WINDOW_DAYS
+) -> dict:
+    """
+    Fetch, clean and store hourly and daily data for a single station.
+
+    The date range is processed in windows of `window_days` days. Every
+    window is fetched, cleaned, upserted and committed on its own, then
+    `stations.last_update` is moved to the end of the window. Memory use
+    stays the same however long the station history is, and an
+    interrupted backfill continues from the last finished window.
+
     Args:
         conn: Open PostgreSQL database connection object.
+        row: Station record with `wmo`, `hourly_start`, `daily_start`
+            and `last_update` keys.
+        end_date (datetime): Last date to fetch.
+        window_days (int): Length of one backfill window in days.
+
+    Returns:
+        dict: Number of hourly and daily rows written for the station.
     """
-    cur = conn.cursor()
-    # Select data start dates from database
-    df_station_data = pd.read_sql_query(SELEC_STATION_START_VALUES, conn)
+    station_id = int(row["wmo"])
 
-    end_date = datetime.today()
+    # --- Decide start_date based on last_update ---
+    if pd.isna(row["last_update"]):
+        # NULL -> fetch everything from default start date
+        start_date = get_start_date(row=row)
+    else:
+        # It was loaded before, continue from the last checkpoint. The last
+        # days are fetched again because Meteostat fills them in later.
+        start_date = pd.Timestamp(row["last_update"]).to_pydatetime() - timedelta(
+            days=REFETCH_OVERLAP_DAYS
+        )
 
-    for index, row in df_station_data.iterrows():
+    windows = list(iter_windows(start_date, end_date, window_days))
+    result = {"hourly_rows": 0, "daily_rows": 0, "windows": len(windows)}
 
-        station_id = int(row["wmo"])
+    for nr, (window_start, window_end) in enumerate(windows, start=1):
+        if DERIVE_DAILY_FROM_HOURLY:
+            # Whole days of hourly data, the daily rows are aggregated from it
+            window_start = pd.Timestamp(window_start).normalize().to_pydatetime()
 
-        # --- Decide start_date based on last_update ---
-        if pd.isna(row["last_update"]):
-            # NULL -> fetch everything from default start date
-            start_date = get_start_date(row=row)
-            update_last = True  # we will update the last update value
+        # Get the hourly, daily datas of the window
+        df_hourly = fetch_meteostat(
+            Hourly, "hourly", station_id, window_start, window_end
+        )
+        df_hourly = clean_and_validate_hours(df_hourly)
+
+        if DERIVE_DAILY_FROM_HOURLY:
+            df_daily = fetch_daily(station_id, window_start, window_end, df_hourly)
         else:
-            # It was loaded before
-            start_date = row["last_update"]
-            update_last = False
+            df_daily = fetch_meteostat(
+                Daily, "daily", station_id, window_start, window_end
+            )
+        df_daily = clean_and_validate_days(df_daily)
 
-        # Get the hourly, daily datas then fetch the data
-        df_hourly = fetch_with_retry(
-            lambda: Hourly(station_id, start=start_date, end=end_date).fetch()
+        # The yearly hourly partitions must exist before the COPY
+        ensure_partitions(conn, "weather_data_hourly", window_start, window_end)
+
+        # Upsert hourly and daily datas, re-loaded periods are updated in place
+        upsert_to_db(
+            df_hourly,
+            conn,
+            station_id,
+            "weather_data_hourly",
+            COLS_HOURLY,
+            HOURLY_COPY_TYPES,
         )
-        df_daily = fetch_with_retry(
-            lambda: Daily(station_id, start=start_date, end=end_date).fetch()
+        upsert_to_db(
+            df_daily,
+            conn,
+            station_id,
+            "weather_data_daily",
+            COLS_DAILY,
+            DAILY_COPY_TYPES,
         )
 
-        # Clean data
-        df_hourly = clean_and_validate_hours(df_hourly)
-        df_daily = clean_and_validate_days(df_daily)
+        # Recompute the monthly/yearly rollups of the days just written
+        if not df_daily.empty:
+            refresh_rollups(
+                conn, station_id, df_daily["time"].min(), df_daily["time"].max()
+            )
+
+        # --- Checkpoint: the station is loaded up to the end of the window ---
+        with stage("checkpoint"), conn.cursor() as cur:
+            cur.execute(UPDATE_STATION_LAST_UPDATE, (window_end, station_id))
+            conn.commit()
+
+        result["hourly_rows"] += len(df_hourly)
+        result["daily_rows"] += len(df_daily)
+        print(
+            f"Station {station_id} window {nr}/{len(windows)} "
+            f"{window_start:%Y-%m-%d} -> {window_end:%Y-%m-%d}: "
+            f"{len(df_hourly)} hourly, {len(df_daily)} daily rows"
+        )
 
-        # Insert hourly datas
-        copy_to_db(df_hourly, conn, station_id, COLS_HOURLY)
+    return result
 
-        # Insert Daily datas
-        insert_into_db(df_daily, conn, station_id, INSERT_WEATHER_DAILY, COLS_DAILY)
 
-        # --- Update last_update if NULL ---
-        if update_last:
-            cur.execute(
-                UPDATE_STATION_LAST_UPDATE,
-                (datetime.now(), station_id),
+def _load_station_safe(conn, row, end_date: datetime) -> dict:
+    """
+    Run `load_station_weather` and turn any failure into a result entry,
+    so one broken station does not stop the others. Every stage recorded
+    meanwhile is attributed to the station in `METRICS`.
+    """
+    result = {"station_id": int(row["wmo"]), "hourly_rows": 0, "daily_rows": 0}
+    start = time.time()
+    try:
+        with station_scope(result["station_id"]):
+            result.update(load_station_weather(conn, row, end_date))
+        result["error"] = None
+    except Exception as e:
+        conn.rollback()
+        result["error"] = str(e)
+        print(f"❌ Error at station {result['station_id']}: {e}")
+    result["seconds"] = time.time() - start
+    return result
+
+
+def _thread_worker(pool, row, end_date: datetime) -> dict:
+    """Load one station on a connection borrowed from the shared pool."""
+    with pool.connection() as conn:
+        return _load_station_safe(conn, row, end_date)
+
+
+# One connection per worker process, opened by `_init_process_worker`
+_process_conn = None
+
+
+def _init_process_worker():
+    """
+    Open the connection used by every task of this worker process, it is
+    closed when the worker exits. A worker runs one station at a time, so
+    it needs no pool. The metrics inherited from the forked parent are
+    dropped, the parent already counts them.
+    """
+    global _process_conn
+    METRICS.reset()
+    _process_conn = connect_to_db()
+    multiprocessing.util.Finalize(None, _process_conn.close, exitpriority=0)
+
+
+def _process_worker(row, end_date: datetime) -> dict:
+    """
+    Load one station on the connection of the current worker process.
+    The metrics of the worker are sent back with the result.
+    """
+    result = _load_station_safe(_process_conn, row, end_date)
+    result["metrics"] = METRICS.drain()
+    return result
+
+
+def print_load_summary(results: list[dict], elapsed: float) -> None:
+    """
+    Print a short summary of a `load_weather_data` run.
+    """
+    failed = [r for r in results if r["error"]]
+    hourly_rows = sum(r["hourly_rows"] for r in results)
+    daily_rows = sum(r["daily_rows"] for r in results)
+
+    print(
+        f"Stations loaded: {len(results) - len(failed)}/{len(results)}, "
+        f"hourly rows: {hourly_rows}, daily rows: {daily_rows}, "
+        f"elapsed: {elapsed:.1f}s"
+    )
+    for r in failed:
+        print(f"  failed station {r['station_id']}: {r['error']}")
+
+
+def load_weather_data(conn, workers: int = NR_OF_WORKERS, mode: str = WORKER_MODE):
+    """
+    Fetch and store weather data (hourly and daily) from Meteostat API
+    for all stations in the database.
+
+    Steps:
+        - Retrieve start dates for each station from the database.
+        - Fetch hourly and daily data from Meteostat API (or the local
+          Parquet landing cache). With DERIVE_DAILY_FROM_HOURLY the daily
+          rows are aggregated from the hourly data instead.
+        - Clean and validate the data.
+        - Upsert hourly and daily data through a COPY-loaded staging table.
+        - Refresh the monthly/yearly rollups of the written periods.
+
+    Stations are processed by a pool of `workers`. In "thread" mode every
+    worker borrows its own connection from the process connection pool
+    (DB_POOL_MAX must leave room for them), in "process" mode every worker
+    process opens one connection of its own. With a single worker the
+    stations are loaded one after another on `conn`.
+
+    Args:
+        conn: Open PostgreSQL database connection object.
+        workers (int): Number of stations processed at the same time.
+        mode (str): "thread" or "process".
+
+    Returns:
+        list[dict]: One result entry per station.
+    """
+    # Select data start dates from database
+    df_station_data = pd.read_sql_query(SELEC_STATION_START_VALUES, conn)
+    rows = df_station_data.to_dict("records")
+    # `conn` is not used by the workers, do not keep it idle in a transaction
+    conn.commit()
+
+    end_date = datetime.today()
+    start = time.time()
+
+    if workers <= 1 or len(rows) <= 1:
+        results = [_load_station_safe(conn, row, end_date) for row in rows]
+    elif mode == "process":
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_process_worker
+        ) as executor:
+            results = list(executor.map(_process_worker, rows, repeat(end_date)))
+        for result in results:
+            METRICS.merge(result.pop("metrics", []))
+    elif mode == "thread":
+        pool = get_pool()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(_thread_worker, repeat(pool), rows, repeat(end_date))
             )
-            conn.commit()
+    else:
+        raise ValueError(f"Unknown worker mode: {mode}")
 
-    cur.close()
+    print_load_summary(results, time.time() - start)
+
+    return results
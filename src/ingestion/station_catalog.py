@@ -0,0 +1,134 @@
+"""
+Station catalog sync shared by the loader and the live fetcher
+
+- `parse_wmo` validates and converts the WMO ids of the whole catalog at
+  once (same rules as `is_valid_wmo`).
+- `catalog_fingerprint` hashes the prepared catalog. The fingerprint of the
+  last sync is kept in `sync_state`, so an unchanged catalog is skipped.
+- `sync_stations` upserts the catalog in one statement and only touches
+  new or changed stations. `last_update` is never overwritten.
+"""
+
+import hashlib
+import pandas as pd
+from datetime import datetime
+from meteostat import Stations
+from psycopg2.extras import execute_values
+
+from src.utils.utils import column_to_values
+from src.utils.queries import (
+    SELECT_SYNC_FINGERPRINT,
+    UPSERT_STATIONS,
+    UPSERT_SYNC_STATE,
+)
+from src.utils.constants import COLS_STATIONS
+
+STATION_DATE_COLS = ["hourly_start", "hourly_end", "daily_start", "daily_end"]
+
+
+def parse_wmo(wmo: pd.Series) -> pd.Series:
+    """
+    Convert WMO ids to a nullable integer series, invalid ids become <NA>.
+
+    Accepts ints, digit strings and integral floats ("123.0"). None, NaN,
+    empty or textual nulls ("<NA>", "n/a") and non-integral values are
+    invalid, exactly like `is_valid_wmo`.
+    """
+    text = wmo.astype("string").str.strip()
+    numbers = pd.to_numeric(text, errors="coerce")
+    valid = numbers.notna() & (numbers % 1 == 0)
+    return numbers.where(valid).astype("Int64")
+
+
+def prepare_catalog(df: pd.DataFrame, regions: list[str] | None = None):
+    """
+    Filter and normalize a raw Meteostat station catalog.
+
+    Steps:
+        - Keep the given regions (all when None).
+        - Parse the WMO ids, drop invalid and duplicated ones.
+        - Convert the start/end columns to dates.
+
+    Returns:
+        pd.DataFrame: `COLS_STATIONS` columns sorted by `wmo`.
+    """
+    if regions:
+        df = df[df["region"].isin(regions)]
+
+    wmo = parse_wmo(df["wmo"])
+    valid_mask = wmo.notna()
+    n_total, n_kept = len(df), int(valid_mask.sum())
+    print(
+        f"Stations total: {n_total}, kept valid WMO: {n_kept}, dropped: {n_total - n_kept}"
+    )
+    if n_total > n_kept:
+        bad_examples = df.loc[~valid_mask, "wmo"].astype(str).unique()[:20]
+        print("Examples of dropped wmo values:", bad_examples)
+
+    catalog = df.loc[valid_mask].assign(wmo=wmo[valid_mask])
+    for col in STATION_DATE_COLS:
+        catalog[col] = pd.to_datetime(catalog[col]).dt.normalize()
+
+    catalog = catalog.drop_duplicates("wmo").sort_values("wmo")
+    return catalog.reset_index(drop=True)
+
+
+def fetch_catalog(regions: list[str] | None = None) -> pd.DataFrame:
+    """Fetch the Romanian station catalog from Meteostat and prepare it."""
+    Stations.cache_dir = "meteostat/cache"
+    stations = Stations().region("RO")
+    print("Stations in Romania:", stations.count())
+    return prepare_catalog(stations.fetch(), regions)
+
+
+def catalog_fingerprint(catalog: pd.DataFrame) -> str:
+    """Content hash of the catalog columns, independent of the row order."""
+    rows = pd.util.hash_pandas_object(
+        catalog[COLS_STATIONS].sort_values("wmo"), index=False
+    )
+    return hashlib.sha256(rows.to_numpy().tobytes()).hexdigest()
+
+
+def sync_stations(conn, catalog: pd.DataFrame, scope: str = "stations", force=False):
+    """
+    Write new and changed stations of the catalog to the database.
+
+    Args:
+        conn: Open PostgreSQL database connection object.
+        catalog (pd.DataFrame): Output of `prepare_catalog`.
+        scope (str): Key of the fingerprint in `sync_state`, catalogs of
+            different regions are tracked separately.
+        force (bool): Upsert even if the fingerprint did not change.
+
+    Returns:
+        dict: Number of `inserted` and `updated` stations and whether the
+            sync was `skipped`.
+    """
+    fingerprint = catalog_fingerprint(catalog)
+    result = {"inserted": 0, "updated": 0, "skipped": False}
+
+    with conn.cursor() as cur:
+        cur.execute(SELECT_SYNC_FINGERPRINT, (scope,))
+        stored = cur.fetchone()
+        if not force and stored is not None and stored[0] == fingerprint:
+            print(f"Station catalog unchanged ({len(catalog)} stations), sync skipped")
+            result["skipped"] = True
+            return result
+
+        records = list(zip(*(column_to_values(catalog[col]) for col in COLS_STATIONS)))
+        if records:
+            # RETURNING gives one row per inserted/updated station, unchanged
+            # stations are filtered by the WHERE of the upsert
+            inserted = execute_values(
+                cur, UPSERT_STATIONS, records, page_size=len(records), fetch=True
+            )
+            result["inserted"] = sum(1 for (is_new,) in inserted if is_new)
+            result["updated"] = len(inserted) - result["inserted"]
+        cur.execute(UPSERT_SYNC_STATE, (scope, fingerprint, datetime.now()))
+    conn.commit()
+
+    print(
+        f"✅ Station catalog synced: {result['inserted']} new, "
+        f"{result['updated']} changed, {len(catalog)} total"
+    )
+    return result
@@ -0,0 +1,200 @@
+"""
+PostgreSQL binary COPY encoder
+
+This module turns DataFrame columns into PostgreSQL's binary COPY format
+directly from the NumPy arrays, so numbers never go through a text
+representation on either side. The frame is encoded in bounded row chunks
+and streamed to `copy_expert` through a file-like wrapper, so only one
+chunk is held in memory at a time.
+"""
+
+import io
+import struct
+import numpy as np
+import pandas as pd
+
+# --- Binary COPY framing ---
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+COPY_TRAILER = struct.pack("!h", -1)
+
+# PostgreSQL timestamps/dates are counted from 2000-01-01
+PG_EPOCH_US = np.datetime64("2000-01-01T00:00:00", "us")
+PG_EPOCH_DAY = np.datetime64("2000-01-01", "D")
+
+# Supported column types -> big-endian NumPy wire dtype
+PG_WIRE_DTYPES = {
+    "int4": np.dtype(">i4"),
+    "float4": np.dtype(">f4"),
+    "float8": np.dtype(">f8"),
+    "timestamp": np.dtype(">i8"),
+    "date": np.dtype(">i4"),
+}
+
+# Column types of the weather tables, every other column is REAL (float4)
+HOURLY_COPY_TYPES = {"station_id": "int4", "time": "timestamp", "coco": "int4"}
+DAILY_COPY_TYPES = {"station_id": "int4", "time": "date"}
+
+COPY_CHUNK_ROWS = 50_000
+
+
+def _encode_column(values, pg_type: str):
+    """
+    Convert a column (Series or scalar broadcast array) to its wire dtype.
+
+    Returns:
+        tuple: (big-endian values array, boolean NULL mask)
+    """
+    if pg_type == "timestamp":
+        times = pd.to_datetime(values)
+        mask = np.asarray(pd.isna(times))
+        raw = np.asarray(times, dtype="datetime64[us]")
+        wire = np.where(mask, 0, (raw - PG_EPOCH_US).astype(np.int64))
+    elif pg_type == "date":
+        days = pd.to_datetime(values)
+        mask = np.asarray(pd.isna(days))
+        raw = np.asarray(days, dtype="datetime64[D]")
+        wire = np.where(mask, 0, (raw - PG_EPOCH_DAY).astype(np.int64))
+    else:
+        # Converted straight to the wire width, float32/Int8 columns are
+        # never widened to float64 on the way
+        numbers = pd.to_numeric(pd.Series(values), errors="coerce")
+        mask = numbers.isna().to_numpy()
+        native = PG_WIRE_DTYPES[pg_type].newbyteorder("=")
+        wire = numbers.to_numpy(dtype=native, na_value=0)
+
+    return wire.astype(PG_WIRE_DTYPES[pg_type]), mask
+
+
+def encode_binary_chunk(columns: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """
+    Encode already converted columns into binary COPY tuples.
+
+    Every row is an int16 field count followed by, for each field, an int32
+    byte length (-1 for NULL) and the big-endian value. Row offsets are
+    computed with a cumulative sum, then each column is scattered into the
+    output buffer with one vectorized assignment.
+
+    Args:
+        columns (list): (wire values, NULL mask) pairs of equal length.
+
+    Returns:
+        np.ndarray: uint8 buffer holding the encoded rows.
+    """
+    n_rows = len(columns[0][0])
+    field_lens = [np.where(mask, 0, values.dtype.itemsize) for values, mask in columns]
+    row_lens = 2 + 4 * len(columns) + np.sum(field_lens, axis=0)
+    row_starts = np.zeros(n_rows, dtype=np.int64)
+    np.cumsum(row_lens[:-1], out=row_starts[1:])
+
+    out = np.empty(int(row_lens.sum()), dtype=np.uint8)
+
+    # Field count of every row
+    count = np.frombuffer(struct.pack("!h", len(columns)), dtype=np.uint8)
+    out[row_starts[:, None] + np.arange(2)] = count
+
+    offsets = row_starts + 2
+    for (values, mask), field_len in zip(columns, field_lens):
+        size = values.dtype.itemsize
+
+        # Field length, -1 marks NULL
+        lengths = np.where(mask, -1, size).astype(">i4").view(np.uint8)
+        out[offsets[:, None] + np.arange(4)] = lengths.reshape(n_rows, 4)
+        offsets += 4
+
+        # Field value, only for non-NULL cells
+        present = ~mask
+        if present.any():
+            payload = values[present].view(np.uint8).reshape(-1, size)
+            out[offsets[present][:, None] + np.arange(size)] = payload
+        offsets += field_len
+
+    return out
+
+
+def iter_binary_copy(
+    df: pd.DataFrame,
+    cols: list,
+    types: dict,
+    constants: dict | None = None,
+    chunk_rows: int = COPY_CHUNK_ROWS,
+):
+    """
+    Yield the binary COPY stream of `df` in chunks of `chunk_rows` rows.
+
+    Args:
+        df (pd.DataFrame): Data to encode.
+        cols (list): Column order of the COPY statement.
+        types (dict): Column -> PostgreSQL type, missing columns are float4.
+        constants (dict): Columns with one value for every row
+            (e.g. station_id), they do not have to exist in `df`.
+        chunk_rows (int): Number of rows encoded at once.
+    """
+    constants = constants or {}
+
+    yield COPY_HEADER
+    for start in range(0, len(df), chunk_rows):
+        stop = start + chunk_rows
+        chunk = df.iloc[start:stop]
+        columns = []
+        for col in cols:
+            pg_type = types.get(col, "float4")
+            if col in constants:
+                values = np.full(len(chunk), constants[col])
+            else:
+                values = chunk[col]
+            columns.append(_encode_column(values, pg_type))
+        yield memoryview(encode_binary_chunk(columns))
+    yield COPY_TRAILER
+
+
+class IteratorReader(io.RawIOBase):
+    """
+    Read-only file object over an iterator of bytes-like chunks,
+    used to stream a generator into `copy_expert`.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._current = memoryview(b"")
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not len(self._current):
+            try:
+                self._current = memoryview(next(self._chunks)).cast("B")
+            except StopIteration:
+                return 0
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        self.bytes_read += n
+        return n
+
+
+def copy_binary(
+    cur,
+    table: str,
+    df: pd.DataFrame,
+    cols: list,
+    types: dict,
+    constants: dict | None = None,
+    chunk_rows: int = COPY_CHUNK_ROWS,
+) -> int:
+    """
+    Stream `df` into `table` with `COPY ... FROM STDIN (FORMAT BINARY)`.
+    The caller is responsible for the commit.
+
+    Returns:
+        int: Number of bytes sent to the server.
+    """
+    reader = IteratorReader(iter_binary_copy(df, cols, types, constants, chunk_rows))
+    stream = io.BufferedReader(reader, buffer_size=1 << 16)
+    cur.copy_expert(
+        sql=f"COPY {table} ({', '.join(cols)}) FROM STDIN WITH (FORMAT BINARY);",
+        file=stream,
+        size=1 << 16,
+    )
+    return reader.bytes_read
@@ -1,8 +1,22 @@
 import os
 import logging
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from dotenv import load_dotenv
 
+from src.utils.constants import (
+    DB_POOL_MAX,
+    DB_POOL_MIN,
+    DB_POOL_PING_AFTER_S,
+    DB_POOL_SLOW_WAIT_S,
+    DB_POOL_TIMEOUT_S,
+)
+
 # --- Load env variables ---
 load_dotenv()
 
@@ -36,3 +50,237 @@ def connect_to_db():
     except Exception:
         logging.error("Database connection failed", exc_info=True)
         raise
+
+
+class PoolTimeout(PoolError):
+    """No connection of the pool became free in time."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe connection pool with blocking checkout.
+
+    `ThreadedConnectionPool` raises as soon as all `maxconn` connections are
+    out, here a checkout waits for a free one (up to `timeout_s`). The pool
+    keeps `minconn` idle connections open, a connection unused for more than
+    `ping_after_s` is checked with `SELECT 1` before it is handed out and
+    replaced if the server dropped it. Connections have autocommit off, like
+    the ones of `connect_to_db`.
+
+    `stats` reports the checkouts, their wait time and the utilization, to
+    size `maxconn` against the `max_connections` of Postgres.
+    """
+
+    def __init__(
+        self,
+        minconn: int = DB_POOL_MIN,
+        maxconn: int = DB_POOL_MAX,
+        timeout_s: float = DB_POOL_TIMEOUT_S,
+        ping_after_s: float = DB_POOL_PING_AFTER_S,
+        **connect_kwargs,
+    ):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout_s = timeout_s
+        self.ping_after_s = ping_after_s
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **connect_kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        # id(conn) -> monotonic time it was given back / checked out
+        self._returned_at = {}
+        self._checked_out_at = {}
+        self._created_at = time.monotonic()
+        self._stats = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "replaced": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+            "wait_s": 0.0,
+            "max_wait_s": 0.0,
+            "held_s": 0.0,
+        }
+
+    def getconn(self):
+        """
+        Check out a healthy connection, waiting for a free one if needed.
+        Every connection must be given back with `putconn`.
+
+        Raises:
+            PoolTimeout: No connection became free within `timeout_s`.
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout_s):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PoolTimeout(
+                f"No database connection free within {self.timeout_s}s "
+                f"(pool max {self.maxconn})"
+            )
+        try:
+            conn = self._healthy_connection()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            stats = self._stats
+            stats["checkouts"] += 1
+            stats["wait_s"] += waited
+            stats["max_wait_s"] = max(stats["max_wait_s"], waited)
+            stats["in_use"] += 1
+            stats["peak_in_use"] = max(stats["peak_in_use"], stats["in_use"])
+            self._checked_out_at[id(conn)] = time.monotonic()
+        if waited > DB_POOL_SLOW_WAIT_S:
+            logging.warning(
+                f"Waited {waited:.2f}s for a database connection "
+                f"({stats['in_use']}/{self.maxconn} in use)."
+            )
+        return conn
+
+    def putconn(self, conn) -> None:
+        """
+        Give a connection back. An open transaction is rolled back, a closed
+        or broken connection is dropped and replaced on a later checkout.
+        """
+        now = time.monotonic()
+        try:
+            broken = bool(conn.closed)
+            if (
+                not broken
+                and conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE
+            ):
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            self._pool.putconn(conn, close=broken)
+        finally:
+            with self._lock:
+                self._stats["in_use"] -= 1
+                self._stats["held_s"] += now - self._checked_out_at.pop(id(conn), now)
+                # Connections above `minconn` are closed by the pool
+                if conn.closed:
+                    self._returned_at.pop(id(conn), None)
+                else:
+                    self._returned_at[id(conn)] = now
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the `with` block and give it back after.
+        Work not committed in the block is rolled back.
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def _healthy_connection(self):
+        """Next idle (or new) connection, replacing a dropped one once."""
+        conn = self._pool.getconn()
+        if self._is_healthy(conn):
+            return conn
+
+        logging.warning("Dropped a broken pooled database connection.")
+        with self._lock:
+            self._stats["replaced"] += 1
+            self._returned_at.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+        return self._pool.getconn()
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        returned_at = self._returned_at.get(id(conn))
+        # New connections and recently used ones are not pinged
+        if returned_at is None or time.monotonic() - returned_at < self.ping_after_s:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def stats(self) -> dict:
+        """
+        Checkout counters of the pool.
+
+        - wait_s / avg_wait_s / max_wait_s: time spent waiting in `getconn`
+        - in_use / peak_in_use: connections checked out now / at most
+        - utilization: share of the `maxconn` connection-seconds since the
+          pool was created that a connection was checked out
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            now = time.monotonic()
+            held_now = sum(now - t for t in self._checked_out_at.values())
+        checkouts = stats["checkouts"]
+        uptime = now - self._created_at
+        stats.update(
+            minconn=self.minconn,
+            maxconn=self.maxconn,
+            avg_wait_s=stats["wait_s"] / checkouts if checkouts else 0.0,
+            utilization=(stats["held_s"] + held_now) / (self.maxconn * uptime),
+        )
+        return stats
+
+    def closeall(self) -> None:
+        """Close every connection of the pool."""
+        self._pool.closeall()
+
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Return the connection pool of this process, created on first use.
+
+    A new pool is created when the DB_* settings change (tests and
+    benchmarks point DB_NAME at throwaway databases) and in a forked
+    worker process, which must not share the sockets of its parent.
+    """
+    global _pool, _pool_key
+    key = (os.getpid(), DB_NAME, DB_USER, DB_HOST, DB_PORT)
+    with _pool_lock:
+        if _pool is None or _pool_key != key:
+            if _pool is not None and _pool_key[0] == os.getpid():
+                _pool.closeall()
+            _pool = create_pool(DB_POOL_MIN, DB_POOL_MAX)
+            _pool_key = key
+        return _pool
+
+
+def pool_stats() -> dict | None:
+    """`ConnectionPool.stats` of the process pool, None if it is not used."""
+    return _pool.stats() if _pool is not None else None
+
+
+def create_pool(minconn: int, maxconn: int) -> ConnectionPool:
+    """
+    Create a thread-safe connection pool with the same settings as
+    `connect_to_db`. Connections handed out by the pool have autocommit off.
+    """
+    try:
+        pool = ConnectionPool(
+            minconn,
+            maxconn,
+            database=DB_NAME,
+            user=DB_USER,
+            password=DB_PASS,
+            host=DB_HOST,
+            port=DB_PORT,
+        )
+        logging.info(f"Connection pool created (min={minconn}, max={maxconn}).")
+        return pool
+    except Exception:
+        logging.error("Connection pool creation failed", exc_info=True)
+        raise
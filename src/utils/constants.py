@@ -67,9 +67,129 @@ COLS_DAILY = [
     "tsun",
 ]
 
+COLS_LIVE = [
+    "station_id",
+    "lat",
+    "lon",
+    "timezone",
+    "timezone_offset",
+    "dt",
+    "sunrise",
+    "sunset",
+    "temp",
+    "feels_like",
+    "pressure",
+    "humidity",
+    "dew_point",
+    "uvi",
+    "clouds",
+    "visibility",
+    "wind_speed",
+    "wind_deg",
+    "wind_gust",
+    "weather_id",
+    "weather_main",
+    "weather_description",
+    "weather_icon",
+]
+
+COLS_STATIONS = [
+    "name",
+    "country",
+    "region",
+    "wmo",
+    "icao",
+    "latitude",
+    "longitude",
+    "elevation",
+    "timezone",
+    "hourly_start",
+    "hourly_end",
+    "daily_start",
+    "daily_end",
+]
+
+# OpenWeather One Call API used for the live data
+OPENWEATHER_URL = "https://api.openweathermap.org/data/3.0/onecall"
+# Live fetch: async mode shares one HTTP session, at most LIVE_CONCURRENCY
+# requests are in flight at once
+LIVE_FETCH_ASYNC = True
+LIVE_CONCURRENCY = 10
+HTTP_TIMEOUT_S = 30
+# One Call response cache, kept on disk between live runs. Responses
+# younger than the TTL are reused, coordinates are rounded to ~1 km.
+USE_LIVE_CACHE = True
+LIVE_CACHE_PATH = "data/live_cache.sqlite"
+LIVE_CACHE_TTL_S = 600
+LIVE_CACHE_PRECISION = 2
+
+# Raw Meteostat responses are kept in a local Parquet landing zone
+USE_LANDING_CACHE = True
+# Replay the landing zone only, months missing from it are left empty
+LANDING_OFFLINE = False
+LANDING_DIR = "data/landing"
+# Months ending less than this many days ago are fetched again
+LANDING_GRACE_DAYS = 7
+
 NR_OF_RETRIES = 3
 DELAY_TIME_S = 5
 
+# Parallel ingestion: number of stations processed at once and the executor
+# kind ("thread" or "process"). 1 worker keeps the old serial behaviour.
+NR_OF_WORKERS = 4
+WORKER_MODE = "thread"
+# Backfill: station history is fetched, stored and checkpointed per window
+BACKFILL_WINDOW_DAYS = 365
+# Days before the last checkpoint that are loaded again on every run
+REFETCH_OVERLAP_DAYS = 3
+# Build weather_data_daily from the downloaded hourly data, the Daily API is
+# only called for days with less than DERIVED_DAILY_MIN_HOURS hourly values
+DERIVE_DAILY_FROM_HOURLY = False
+DERIVED_DAILY_MIN_HOURS = 18
+
+# Range partitioning of the big tables: table -> pandas period of one
+# partition ("Y" yearly, "M" monthly), partitions are created by the writers
+PARTITION_SPECS = {"weather_data_hourly": "Y", "weather_live": "M"}
+# Per-station aggregates of weather_data_daily: table -> date_trunc unit of
+# one row. Refreshed by the loader for the periods it wrote.
+ROLLUP_TABLES = {"weather_rollup_monthly": "month", "weather_rollup_yearly": "year"}
+
+# weather_live keeps the raw snapshots of the last days, older ones are
+# compacted into hourly min/mean/max rows of weather_live_hourly
+LIVE_RETENTION_DAYS = 30
+
+# Process-wide connection pool shared by the dashboard and the ingestion
+# jobs. At most DB_POOL_MAX connections per process are open, keep
+# (processes x DB_POOL_MAX) below the max_connections of Postgres. A
+# checkout waits up to DB_POOL_TIMEOUT_S for a free connection, and a
+# connection idle for more than DB_POOL_PING_AFTER_S is checked first.
+DB_POOL_MIN = 2
+DB_POOL_MAX = 10
+DB_POOL_TIMEOUT_S = 30
+DB_POOL_PING_AFTER_S = 60
+# Checkouts waiting longer than this are logged, the pool is too small
+DB_POOL_SLOW_WAIT_S = 0.5
+
+# Long-range charts are downsampled to about one point per pixel of their
+# 700 px width before they are sent to the browser
+CHART_POINT_BUDGET = 700
+
+# Dashboard query results are cached for all sessions, up to this many
+# bytes (LRU). Entries are dropped when new data is loaded, the ingestion
+# watermark is read at most once per QUERY_CACHE_CHECK_EVERY_S.
+USE_QUERY_CACHE = True
+QUERY_CACHE_MAX_BYTES = 256 * 2**20
+QUERY_CACHE_CHECK_EVERY_S = 5
+
+# Dashboard/export reads stream the result through a server-side cursor,
+# READ_CHUNK_ROWS rows are fetched and converted at a time
+READ_CHUNK_ROWS = 10_000
+
+# Per-stage run metrics written by main.py at the end of every run
+METRICS_REPORT_PATH = "data/metrics/run_report.json"
+# Point the node_exporter textfile collector at this directory
+METRICS_PROM_PATH = "data/metrics/weather_ingest.prom"
+
 # test - Only Hargita
 REGIONS = ["HA"]
 
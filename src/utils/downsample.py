@@ -0,0 +1,142 @@
+"""
+Downsampling of long time series before charting
+
+Altair puts every row of a chart into the Vega spec sent to the browser,
+a multi-decade daily range is tens of thousands of points for a chart
+that is ~700 pixels wide. The chart frames are reduced to a fixed point
+budget first, so the payload does not grow with the selected range:
+
+- `lttb`: Largest-Triangle-Three-Buckets for line charts. It keeps the
+  points that shape the line (peaks, drops), unlike a plain average.
+- `bucket_sums`: sums over equal time buckets for bar charts of amounts
+  (precipitation), the total of the range stays the same.
+
+Frames that already fit the budget are returned unchanged.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.utils.constants import CHART_POINT_BUDGET
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Positions of the `n_out` points LTTB keeps from the series (x, y).
+
+    The first and last points are always kept. The points between are
+    split into `n_out - 2` buckets, from every bucket the point forming the
+    largest triangle with the previously kept point and the average of the
+    next bucket is kept. Each bucket is one vectorized NumPy step.
+
+    Args:
+        x (np.ndarray): Ascending x values as float.
+        y (np.ndarray): y values as float, without NaN.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Ascending positions into x/y.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets of [edges[i], edges[i + 1]), the last point after
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def lttb(
+    df: pd.DataFrame, x: str, y: str, n_out: int = CHART_POINT_BUDGET
+) -> pd.DataFrame:
+    """
+    Reduce a line chart frame to at most `n_out` rows with LTTB.
+
+    Rows without a `y` value are dropped first, the line skips them anyway.
+
+    Args:
+        df (pd.DataFrame): Rows sorted by `x` (datetime or numeric).
+        x (str): Column of the x axis.
+        y (str): Column of the line.
+        n_out (int): Point budget of the chart.
+
+    Returns:
+        pd.DataFrame: The kept rows with all their columns.
+    """
+    df = df[df[y].notna()]
+    if len(df) <= n_out:
+        return df
+
+    x_values = df[x]
+    if pd.api.types.is_datetime64_any_dtype(x_values):
+        x_values = x_values.astype("int64")
+    kept = lttb_indices(
+        x_values.to_numpy(dtype="float64"), df[y].to_numpy(dtype="float64"), n_out
+    )
+    return df.iloc[kept]
+
+
+def bucket_sums(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    n_buckets: int = CHART_POINT_BUDGET,
+    unit: str = "D",
+) -> pd.DataFrame:
+    """
+    Sum a bar chart frame over at most `n_buckets` equal time buckets.
+
+    The bucket width is a whole number of `unit`s, every bar starts at the
+    beginning of its bucket. A bucket without any `y` value stays NaN.
+
+    Args:
+        df (pd.DataFrame): Rows with a datetime `x` column.
+        x (str): Time column.
+        y (str): Amount to sum (e.g. prcp).
+        n_buckets (int): Bar budget of the chart.
+        unit (str): Smallest bucket width (pandas offset alias).
+
+    Returns:
+        pd.DataFrame: Columns `x`, `y` and `n` (rows per bucket). Frames
+            that fit the budget are returned with `n` = 1.
+    """
+    if len(df) <= n_buckets:
+        return df[[x, y]].assign(n=1)
+
+    times = df[x].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    step = pd.Timedelta(1, unit=unit).value
+    first = times.min() // step * step
+    span = times.max() - first + step
+    width = -(-span // (n_buckets * step)) * step
+
+    bucket = (times - first) // width
+    values = df[y].to_numpy(dtype="float64")
+    has_value = ~np.isnan(values)
+    sums = np.bincount(bucket, weights=np.where(has_value, values, 0.0))
+    counts = np.bincount(bucket, weights=has_value)
+    rows = np.bincount(bucket)
+
+    nonempty = rows > 0
+    starts = first + np.flatnonzero(nonempty) * width
+    return pd.DataFrame(
+        {
+            x: pd.to_datetime(starts),
+            y: np.where(counts > 0, sums, np.nan)[nonempty],
+            "n": rows[nonempty],
+        }
+    )
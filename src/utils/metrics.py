@@ -0,0 +1,250 @@
+"""
+Per-stage metrics of the ingestion pipeline
+
+Every instrumented stage (fetch, cleaning, COPY/upsert, checkpoint) adds
+its wall time, rows, bytes and retries to a process-wide `METRICS`
+collector, keyed by stage and station. The station comes from
+`station_scope`, which the loader opens around every station, so worker
+threads do not have to pass it around.
+
+At the end of a run the totals are written to a JSON report and to a
+Prometheus textfile (for the node_exporter textfile collector).
+
+Recording a stage costs a lock and two `perf_counter` calls (~3 µs), a
+`timed` call that also sizes a frame ~15 µs, against the milliseconds to
+seconds a stage takes.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+FIELDS = ("calls", "seconds", "rows", "bytes", "retries", "errors")
+
+_local = threading.local()
+
+
+class PipelineMetrics:
+    """Thread-safe totals per (stage, station_id)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all totals and restart the run clock."""
+        with self._lock:
+            self._totals = {}
+            self.started_at = time.time()
+
+    def add(self, stage: str, station_id=None, **values) -> None:
+        """Add `values` (any of FIELDS) to the totals of a stage."""
+        with self._lock:
+            totals = self._totals.setdefault(
+                (stage, station_id), dict.fromkeys(FIELDS, 0)
+            )
+            for field, value in values.items():
+                totals[field] += value
+
+    def snapshot(self) -> list[dict]:
+        """Return the totals as a list of records."""
+        with self._lock:
+            return [
+                {"stage": stage, "station_id": station_id, **totals}
+                for (stage, station_id), totals in self._totals.items()
+            ]
+
+    def drain(self) -> list[dict]:
+        """Return the totals and reset them, used by worker processes."""
+        records = self.snapshot()
+        self.reset()
+        return records
+
+    def merge(self, records: list[dict]) -> None:
+        """Add the records of another collector (e.g. a worker process)."""
+        for record in records:
+            self.add(
+                record["stage"],
+                record["station_id"],
+                **{field: record[field] for field in FIELDS},
+            )
+
+    def by_stage(self) -> dict:
+        """Totals of every stage over all stations."""
+        stages = {}
+        for record in self.snapshot():
+            totals = stages.setdefault(record["stage"], dict.fromkeys(FIELDS, 0))
+            for field in FIELDS:
+                totals[field] += record[field]
+        return stages
+
+
+METRICS = PipelineMetrics()
+
+
+def current_station():
+    """Station of the `station_scope` open in this thread, or None."""
+    return getattr(_local, "station_id", None)
+
+
+@contextmanager
+def station_scope(station_id):
+    """Attribute every stage recorded in this thread to `station_id`."""
+    previous = current_station()
+    _local.station_id = station_id
+    try:
+        yield
+    finally:
+        _local.station_id = previous
+
+
+@contextmanager
+def stage(name: str, station_id=None, metrics: PipelineMetrics = METRICS):
+    """
+    Time a block and record it as one call of stage `name`.
+
+    The yielded dict can be filled with `rows` and `bytes`, `count_retry`
+    increments its `retries`. A raised exception is counted as an error
+    and re-raised.
+    """
+    record = {"rows": 0, "bytes": 0, "retries": 0, "errors": 0}
+    stack = _local.__dict__.setdefault("stages", [])
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record["errors"] = 1
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        metrics.add(
+            name,
+            station_id if station_id is not None else current_station(),
+            calls=1,
+            seconds=seconds,
+            **record,
+        )
+
+
+def count_retry() -> None:
+    """Count one retry on the innermost open stage of this thread."""
+    stack = getattr(_local, "stages", None)
+    if stack:
+        stack[-1]["retries"] += 1
+
+
+def frame_size(obj) -> tuple[int, int]:
+    """Rows and in-memory bytes of a DataFrame, (0, 0) for anything else."""
+    if isinstance(obj, pd.DataFrame):
+        # Summed per column: `memory_usage` builds a Series and is ~20x slower
+        nbytes = obj.index.nbytes + sum(col.nbytes for _, col in obj.items())
+        return len(obj), int(nbytes)
+    return 0, 0
+
+
+def timed(name: str):
+    """
+    Decorator recording every call of the function as stage `name`.
+
+    Rows and bytes are taken from the returned DataFrame, or from the
+    first DataFrame argument when the function returns something else.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name) as record:
+                result = func(*args, **kwargs)
+                source = result
+                if not isinstance(result, pd.DataFrame):
+                    frames = [a for a in args if isinstance(a, pd.DataFrame)]
+                    source = frames[0] if frames else None
+                record["rows"], record["bytes"] = frame_size(source)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Write a file through a temporary one, readers never see half of it."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_json_report(
+    path: str, metrics: PipelineMetrics = METRICS, extra: dict | None = None
+) -> dict:
+    """
+    Write the run report: totals per stage and per station and stage.
+    `extra` sections (e.g. the connection pool stats) are added as they are.
+
+    Returns:
+        dict: The written report.
+    """
+    finished_at = time.time()
+    report = {
+        "started_at": metrics.started_at,
+        "finished_at": finished_at,
+        "elapsed_s": finished_at - metrics.started_at,
+        "stages": metrics.by_stage(),
+        "stations": sorted(
+            (r for r in metrics.snapshot() if r["station_id"] is not None),
+            key=lambda r: (r["station_id"], r["stage"]),
+        ),
+        **(extra or {}),
+    }
+    _write_atomic(path, json.dumps(report, indent=2, default=str))
+    return report
+
+
+def prometheus_text(metrics: PipelineMetrics = METRICS) -> str:
+    """Render the stage totals in the Prometheus text exposition format."""
+    stages = metrics.by_stage()
+    lines = []
+    for field in FIELDS:
+        # Totals of one run, replaced by the next run -> gauges
+        metric = f"weather_ingest_stage_{field}"
+        lines.append(f"# HELP {metric} Ingestion stage {field} of the last run.")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, totals in sorted(stages.items()):
+            lines.append(f'{metric}{{stage="{name}"}} {totals[field]}')
+
+    elapsed = time.time() - metrics.started_at
+    lines.append("# HELP weather_ingest_run_seconds Duration of the last run.")
+    lines.append("# TYPE weather_ingest_run_seconds gauge")
+    lines.append(f"weather_ingest_run_seconds {elapsed}")
+    lines.append(
+        "# HELP weather_ingest_last_run_timestamp_seconds End of the last run."
+    )
+    lines.append("# TYPE weather_ingest_last_run_timestamp_seconds gauge")
+    lines.append(f"weather_ingest_last_run_timestamp_seconds {time.time()}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(path: str, metrics: PipelineMetrics = METRICS) -> None:
+    """Write `prometheus_text` to `path` (a `*.prom` file)."""
+    _write_atomic(path, prometheus_text(metrics))
+
+
+def print_stage_summary(metrics: PipelineMetrics = METRICS) -> None:
+    """Print one line per stage, slowest first."""
+    stages = sorted(metrics.by_stage().items(), key=lambda s: -s[1]["seconds"])
+    for name, totals in stages:
+        print(
+            f"⏱️ {name:<28} {totals['seconds']:9.2f}s "
+            f"{totals['calls']:6d} calls {totals['rows']:10d} rows "
+            f"{totals['bytes'] / 2**20:9.1f} MiB {totals['retries']:3d} retries"
+        )
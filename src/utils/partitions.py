@@ -0,0 +1,130 @@
+"""
+Time partitions of the big tables
+
+`weather_data_hourly` is range partitioned by year and `weather_live` by
+month (see `postgresql/create_tables.sql`). There is no default partition,
+so the writers call `ensure_partitions` for the time range they are about
+to write before the COPY/INSERT.
+
+Partitions already seen by this process are remembered per database
+(connection DSN), so the database is only asked when a new year/month
+shows up. The live retention job lists and drops the expired ones.
+"""
+
+import re
+import threading
+
+import pandas as pd
+
+from src.utils.constants import PARTITION_SPECS
+from src.utils.queries import (
+    CREATE_PARTITION,
+    DROP_PARTITION,
+    LOCK_PARTITION_PARENT,
+    SELECT_IS_PARTITIONED,
+    SELECT_PARTITION_BOUNDS,
+)
+
+_known = set()
+_known_lock = threading.Lock()
+
+
+def partition_periods(
+    table: str, start, end
+) -> list[tuple[str, pd.Timestamp, pd.Timestamp]]:
+    """
+    Return (partition name, lower bound, upper bound) of every partition of
+    `table` that [start, end] touches. Upper bounds are exclusive.
+    """
+    freq = PARTITION_SPECS[table]
+    periods = pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq=freq)
+    label = "%Y" if freq == "Y" else "%Y_%m"
+    prefix = "y" if freq == "Y" else "m"
+    return [
+        (
+            f"{table}_{prefix}{period.strftime(label)}",
+            period.start_time,
+            (period + 1).start_time,
+        )
+        for period in periods
+    ]
+
+
+def ensure_partitions(conn, table: str, start, end) -> list[str]:
+    """
+    Create the missing partitions of `table` for [start, end] and commit.
+
+    Creation is serialized per table with a transaction-level advisory
+    lock, so parallel loader workers can not race on the same partition.
+    Nothing happens on a database where `table` is not partitioned yet
+    (the migration did not run).
+
+    Args:
+        conn: Open PostgreSQL database connection object. There must be no
+            uncommitted work on it, the partitions are committed at once.
+        table (str): A key of `PARTITION_SPECS`.
+        start, end: Time range about to be written (inclusive).
+
+    Returns:
+        list[str]: Names of the partitions that were checked in the database.
+    """
+    if pd.isna(start) or pd.isna(end):
+        return []
+
+    database = getattr(conn, "dsn", None)
+    periods = partition_periods(table, start, end)
+    with _known_lock:
+        missing = [p for p in periods if (database, p[0]) not in _known]
+    if not missing:
+        return []
+
+    with conn.cursor() as cur:
+        cur.execute(SELECT_IS_PARTITIONED, (table,))
+        if cur.fetchone() is None:
+            conn.rollback()
+            return []
+
+        cur.execute(LOCK_PARTITION_PARENT, (table,))
+        for name, lower, upper in missing:
+            cur.execute(
+                CREATE_PARTITION.format(partition=name, table=table),
+                (lower.to_pydatetime(), upper.to_pydatetime()),
+            )
+    conn.commit()
+
+    with _known_lock:
+        _known.update((database, name) for name, _, _ in missing)
+    return [name for name, _, _ in missing]
+
+
+def list_partitions(conn, table: str) -> list[tuple[str, pd.Timestamp, pd.Timestamp]]:
+    """
+    Return (partition name, lower bound, upper bound) of the existing
+    partitions of `table`, oldest first. Upper bounds are exclusive.
+    """
+    with conn.cursor() as cur:
+        cur.execute(SELECT_PARTITION_BOUNDS, (table,))
+        rows = cur.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        values = re.findall(r"'([^']*)'", bound or "")
+        if len(values) == 2:
+            partitions.append((name, pd.Timestamp(values[0]), pd.Timestamp(values[1])))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def drop_partitions(conn, table: str, names: list[str]) -> None:
+    """
+    Drop whole partitions of `table` (in the open transaction, the caller
+    commits). Dropping a partition frees its space at once, unlike DELETE.
+    """
+    with conn.cursor() as cur:
+        cur.execute(LOCK_PARTITION_PARENT, (table,))
+        for name in names:
+            cur.execute(DROP_PARTITION.format(partition=name))
+
+    # A later write into the dropped period has to create it again
+    database = getattr(conn, "dsn", None)
+    with _known_lock:
+        _known.difference_update((database, name) for name in names)
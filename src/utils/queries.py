@@ -1,38 +1,96 @@
-INSERT_STATIONS = """
-        INSERT INTO stations (
-            name, country, region, wmo, icao, latitude, longitude, elevation,
-            timezone, hourly_start, hourly_end, daily_start, daily_end
-        ) VALUES %s
-        ON CONFLICT DO NOTHING;  -- prevents crash if duplicates exist
-    """
+# --- Station catalog sync: only new or changed stations are written ---
+UPSERT_STATIONS = """
+INSERT INTO stations AS s (
+    name, country, region, wmo, icao, latitude, longitude, elevation,
+    timezone, hourly_start, hourly_end, daily_start, daily_end
+) VALUES %s
+ON CONFLICT (wmo) DO UPDATE
+SET name = EXCLUDED.name, country = EXCLUDED.country, region = EXCLUDED.region,
+    icao = EXCLUDED.icao, latitude = EXCLUDED.latitude,
+    longitude = EXCLUDED.longitude, elevation = EXCLUDED.elevation,
+    timezone = EXCLUDED.timezone, hourly_start = EXCLUDED.hourly_start,
+    hourly_end = EXCLUDED.hourly_end, daily_start = EXCLUDED.daily_start,
+    daily_end = EXCLUDED.daily_end
+WHERE (s.name, s.country, s.region, s.icao, s.latitude, s.longitude,
+       s.elevation, s.timezone, s.hourly_start, s.hourly_end,
+       s.daily_start, s.daily_end)
+    IS DISTINCT FROM
+      (EXCLUDED.name, EXCLUDED.country, EXCLUDED.region, EXCLUDED.icao,
+       EXCLUDED.latitude, EXCLUDED.longitude, EXCLUDED.elevation,
+       EXCLUDED.timezone, EXCLUDED.hourly_start, EXCLUDED.hourly_end,
+       EXCLUDED.daily_start, EXCLUDED.daily_end)
+RETURNING (xmax = 0) AS inserted;
+"""
+
+SELECT_SYNC_FINGERPRINT = "SELECT fingerprint FROM sync_state WHERE name = %s;"
+
+UPSERT_SYNC_STATE = """
+INSERT INTO sync_state (name, fingerprint, synced_at) VALUES (%s, %s, %s)
+ON CONFLICT (name) DO UPDATE
+SET fingerprint = EXCLUDED.fingerprint, synced_at = EXCLUDED.synced_at;
+"""
+
 SELEC_STATION_START_VALUES = (
     """ SELECT wmo, hourly_start, daily_start, last_update FROM stations; """
 )
 
-INSERT_WEATHER_DAILY = """
-INSERT INTO weather_data_daily (
-    station_id, time, tavg, tmin, tmax, prcp, snow, wdir, wspd, wpgt, pres, tsun
-) VALUES %s
-ON CONFLICT DO NOTHING;  -- prevents crash if duplicates exist
-"""
-
 SELECT_STATION_DATA = (
     "SELECT wmo,daily_start, hourly_start, elevation, name FROM stations;"
 )
 
 SELECT_NAME_WMO_STATIONS = "SELECT wmo, name FROM stations;"
 
+# One row per station from weather_live_latest, the cost does not grow
+# with the weather_live history.
 SELECT_STATIONS_AND_LATEST_DATA = """
 SELECT s.name, s.latitude, s.longitude,
        w.temp, w.humidity, w.wind_speed, w.weather_description,
         w.dt, w.feels_like, w.clouds, w.visibility, w.wind_deg, w.wind_gust,
         w.pressure, w.uvi, w.dew_point, w.weather_main, w.weather_description
 FROM stations s
-JOIN (
-    SELECT DISTINCT ON (station_id) *
-    FROM weather_live
-    ORDER BY station_id, dt DESC
-) w ON s.wmo = w.station_id;
+JOIN weather_live_latest w ON s.wmo = w.station_id;
+"""
+
+# Changes whenever a loader run commits: station checkpoints, new live
+# snapshots and station catalog syncs. The dashboard query cache is emptied
+# when it moves. weather_live_latest is read instead of the weather_live
+# history, it has one row per station.
+SELECT_INGEST_WATERMARK = """
+SELECT (SELECT max(last_update) FROM stations),
+       (SELECT max(dt) FROM weather_live_latest),
+       (SELECT max(synced_at) FROM sync_state);
+"""
+
+# Time filters are plain ranges on the partition key (no DATE()/EXTRACT()
+# around the column), so Postgres only scans the matching partitions.
+
+SELECT_HOURLY_DAY = """
+SELECT time, temp, dwpt, rhum, prcp, snow, wdir, wspd, wpgt, pres, tsun, coco
+FROM weather_data_hourly
+WHERE station_id = %(station_id)s
+  AND time >= %(day)s AND time < %(day)s + INTERVAL '1 day'
+ORDER BY time ASC;
+"""
+
+# Inclusive date range of one station, used by the overview, monthly and
+# yearly pages. Served by the (station_id, time) unique index.
+SELECT_DAILY_RANGE = """
+SELECT time, tavg, tmin, tmax, prcp
+FROM weather_data_daily
+WHERE station_id = %(station_id)s
+  AND time >= %(start)s AND time <= %(end)s
+ORDER BY time ASC;
+"""
+
+# One calendar month of every year in [start, end]: the range uses the
+# index, the month is only a filter on the rows of that range.
+SELECT_DAILY_MONTH = """
+SELECT time, tavg, tmin, tmax, prcp
+FROM weather_data_daily
+WHERE station_id = %(station_id)s
+  AND time >= %(start)s AND time <= %(end)s
+  AND EXTRACT(MONTH FROM time) = %(month)s
+ORDER BY time ASC;
 """
 
 SELECT_STATIONS_DROPDOWN = "SELECT wmo, name FROM stations;"
@@ -42,3 +100,204 @@ UPDATE_STATION_LAST_UPDATE = """
                 SET last_update = %s
                 WHERE wmo = %s
                 """
+
+INSERT_WEATHER_LIVE = """
+INSERT INTO weather_live (
+    station_id, lat, lon, timezone, timezone_offset,
+    dt, sunrise, sunset, temp, feels_like, pressure,
+    humidity, dew_point, uvi, clouds, visibility,
+    wind_speed, wind_deg, wind_gust,
+    weather_id, weather_main, weather_description, weather_icon
+) VALUES %s;
+"""
+
+# Newest observation per station, written in the transaction of the
+# weather_live insert. Older observations never replace a newer one.
+UPSERT_WEATHER_LIVE_LATEST = """
+INSERT INTO weather_live_latest AS l (
+    station_id, lat, lon, timezone, timezone_offset,
+    dt, sunrise, sunset, temp, feels_like, pressure,
+    humidity, dew_point, uvi, clouds, visibility,
+    wind_speed, wind_deg, wind_gust,
+    weather_id, weather_main, weather_description, weather_icon
+) VALUES %s
+ON CONFLICT (station_id) DO UPDATE
+SET lat = EXCLUDED.lat, lon = EXCLUDED.lon, timezone = EXCLUDED.timezone,
+    timezone_offset = EXCLUDED.timezone_offset, dt = EXCLUDED.dt,
+    sunrise = EXCLUDED.sunrise, sunset = EXCLUDED.sunset,
+    temp = EXCLUDED.temp, feels_like = EXCLUDED.feels_like,
+    pressure = EXCLUDED.pressure, humidity = EXCLUDED.humidity,
+    dew_point = EXCLUDED.dew_point, uvi = EXCLUDED.uvi,
+    clouds = EXCLUDED.clouds, visibility = EXCLUDED.visibility,
+    wind_speed = EXCLUDED.wind_speed, wind_deg = EXCLUDED.wind_deg,
+    wind_gust = EXCLUDED.wind_gust, weather_id = EXCLUDED.weather_id,
+    weather_main = EXCLUDED.weather_main,
+    weather_description = EXCLUDED.weather_description,
+    weather_icon = EXCLUDED.weather_icon
+WHERE EXCLUDED.dt > l.dt;
+"""
+
+# --- Live retention: raw snapshots before the cutoff -> hourly summary ---
+# Hours compacted by an earlier run (late snapshots) are merged, the means
+# weighted by the number of samples.
+COMPACT_WEATHER_LIVE = """
+WITH hours AS (
+    SELECT station_id, date_trunc('hour', dt) AS hour, count(*) AS samples,
+           min(temp) AS temp_min, avg(temp) AS temp_mean, max(temp) AS temp_max,
+           avg(feels_like) AS feels_like_mean,
+           min(pressure) AS pressure_min, avg(pressure) AS pressure_mean,
+           max(pressure) AS pressure_max,
+           min(humidity) AS humidity_min, avg(humidity) AS humidity_mean,
+           max(humidity) AS humidity_max,
+           avg(wind_speed) AS wind_speed_mean, max(wind_speed) AS wind_speed_max,
+           max(wind_gust) AS wind_gust_max, avg(clouds) AS clouds_mean,
+           mode() WITHIN GROUP (ORDER BY weather_main) AS weather_main
+    FROM weather_live
+    WHERE dt < %(cutoff)s
+    GROUP BY station_id, date_trunc('hour', dt)
+), written AS (
+    INSERT INTO weather_live_hourly AS h
+    SELECT * FROM hours
+    ON CONFLICT (station_id, hour) DO UPDATE
+    SET samples = h.samples + EXCLUDED.samples,
+        temp_min = LEAST(h.temp_min, EXCLUDED.temp_min),
+        temp_mean = (h.temp_mean * h.samples + EXCLUDED.temp_mean * EXCLUDED.samples)
+            / (h.samples + EXCLUDED.samples),
+        temp_max = GREATEST(h.temp_max, EXCLUDED.temp_max),
+        feels_like_mean = (h.feels_like_mean * h.samples
+            + EXCLUDED.feels_like_mean * EXCLUDED.samples)
+            / (h.samples + EXCLUDED.samples),
+        pressure_min = LEAST(h.pressure_min, EXCLUDED.pressure_min),
+        pressure_mean = (h.pressure_mean * h.samples
+            + EXCLUDED.pressure_mean * EXCLUDED.samples)
+            / (h.samples + EXCLUDED.samples),
+        pressure_max = GREATEST(h.pressure_max, EXCLUDED.pressure_max),
+        humidity_min = LEAST(h.humidity_min, EXCLUDED.humidity_min),
+        humidity_mean = (h.humidity_mean * h.samples
+            + EXCLUDED.humidity_mean * EXCLUDED.samples)
+            / (h.samples + EXCLUDED.samples),
+        humidity_max = GREATEST(h.humidity_max, EXCLUDED.humidity_max),
+        wind_speed_mean = (h.wind_speed_mean * h.samples
+            + EXCLUDED.wind_speed_mean * EXCLUDED.samples)
+            / (h.samples + EXCLUDED.samples),
+        wind_speed_max = GREATEST(h.wind_speed_max, EXCLUDED.wind_speed_max),
+        wind_gust_max = GREATEST(h.wind_gust_max, EXCLUDED.wind_gust_max),
+        clouds_mean = (h.clouds_mean * h.samples
+            + EXCLUDED.clouds_mean * EXCLUDED.samples)
+            / (h.samples + EXCLUDED.samples)
+    RETURNING 1
+)
+SELECT (SELECT COALESCE(sum(samples), 0) FROM hours)::bigint,
+       (SELECT count(*) FROM written)::bigint;
+"""
+
+DELETE_WEATHER_LIVE_BEFORE = "DELETE FROM weather_live WHERE dt < %(cutoff)s;"
+
+# --- Rollups: monthly/yearly aggregates of weather_data_daily ---
+# {table} is a key of ROLLUP_TABLES and {unit} its date_trunc unit. Every
+# period of the station that [start, end] touches is recomputed from all of
+# its daily rows, unchanged periods are not rewritten.
+REFRESH_ROLLUP = """
+INSERT INTO {table} AS r (
+    station_id, period, days, tavg_days, prcp_days, tavg, tmin, tmax,
+    tmin_date, tmax_date, prcp_sum, rainy_days, refreshed_at
+)
+SELECT station_id,
+       date_trunc('{unit}', time)::date AS period,
+       count(*), count(tavg), count(prcp),
+       avg(tavg::float8), min(tmin), max(tmax),
+       (array_agg(time ORDER BY tmin, time) FILTER (WHERE tmin IS NOT NULL))[1],
+       (array_agg(time ORDER BY tmax DESC, time) FILTER (WHERE tmax IS NOT NULL))[1],
+       COALESCE(sum(prcp::float8), 0),
+       count(*) FILTER (WHERE prcp > 0),
+       now()
+FROM weather_data_daily
+WHERE station_id = %(station_id)s
+  AND time >= date_trunc('{unit}', %(start)s::date)
+  AND time < date_trunc('{unit}', %(end)s::date) + INTERVAL '1 {unit}'
+GROUP BY station_id, period
+ON CONFLICT (station_id, period) DO UPDATE
+SET days = EXCLUDED.days, tavg_days = EXCLUDED.tavg_days,
+    prcp_days = EXCLUDED.prcp_days, tavg = EXCLUDED.tavg,
+    tmin = EXCLUDED.tmin, tmax = EXCLUDED.tmax,
+    tmin_date = EXCLUDED.tmin_date, tmax_date = EXCLUDED.tmax_date,
+    prcp_sum = EXCLUDED.prcp_sum, rainy_days = EXCLUDED.rainy_days,
+    refreshed_at = EXCLUDED.refreshed_at
+WHERE (r.days, r.tavg_days, r.prcp_days, r.tavg, r.tmin, r.tmax,
+       r.tmin_date, r.tmax_date, r.prcp_sum, r.rainy_days)
+    IS DISTINCT FROM
+      (EXCLUDED.days, EXCLUDED.tavg_days, EXCLUDED.prcp_days, EXCLUDED.tavg,
+       EXCLUDED.tmin, EXCLUDED.tmax, EXCLUDED.tmin_date, EXCLUDED.tmax_date,
+       EXCLUDED.prcp_sum, EXCLUDED.rainy_days);
+"""
+
+SELECT_ROLLUP_PERIODS = """
+SELECT period, days, tavg_days, prcp_days, tavg, tmin, tmax,
+       tmin_date, tmax_date, prcp_sum, rainy_days
+FROM {table}
+WHERE station_id = %(station_id)s AND period = ANY(%(periods)s);
+"""
+
+# --- Partitions: created on demand by src/utils/partitions.py ---
+SELECT_IS_PARTITIONED = (
+    "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s);"
+)
+
+# Serializes partition creation of one table between parallel workers
+LOCK_PARTITION_PARENT = "SELECT pg_advisory_xact_lock(hashtext(%s));"
+
+CREATE_PARTITION = """
+CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table}
+FOR VALUES FROM (%s) TO (%s);
+"""
+
+# Partitions of a table with their bound expression, e.g.
+# FOR VALUES FROM ('2025-01-01 00:00:00') TO ('2025-02-01 00:00:00')
+SELECT_PARTITION_BOUNDS = """
+SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = to_regclass(%s);
+"""
+
+DROP_PARTITION = "DROP TABLE IF EXISTS {partition};"
+
+# Rows and on-disk bytes of one partition, read before it is dropped
+SELECT_PARTITION_ROWS_AND_BYTES = (
+    "SELECT count(*), pg_total_relation_size(to_regclass(%s)) FROM {partition};"
+)
+
+# Heap, index and TOAST bytes of a table, over all of its partitions
+SELECT_TABLE_BYTES = """
+SELECT COALESCE(sum(pg_total_relation_size(relid)), 0)::bigint
+FROM pg_partition_tree(%s);
+"""
+
+# --- Migrations: every file of postgresql/migrations runs once ---
+CREATE_SCHEMA_MIGRATIONS = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    file_name TEXT PRIMARY KEY,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+SELECT_APPLIED_MIGRATIONS = "SELECT file_name FROM schema_migrations;"
+
+INSERT_SCHEMA_MIGRATION = "INSERT INTO schema_migrations (file_name) VALUES (%s);"
+
+# --- Staging upsert: COPY into a temporary table, then merge set-based ---
+# Temporary tables are not WAL-logged and are dropped with the transaction.
+CREATE_STAGING_TABLE = """
+CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+SELECT {cols} FROM {table} WITH NO DATA;
+"""
+
+UPSERT_FROM_STAGING = """
+INSERT INTO {table} AS t ({cols})
+SELECT DISTINCT ON (station_id, time) {cols}
+FROM {staging}
+ORDER BY station_id, time
+ON CONFLICT (station_id, time) DO UPDATE
+SET {updates}
+WHERE ({current}) IS DISTINCT FROM ({excluded});
+"""
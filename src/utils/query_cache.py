@@ -0,0 +1,162 @@
+"""
+Query result cache of the dashboard
+
+Every widget interaction reruns the Streamlit page, which used to query
+Postgres again even for the station lists. `QUERY_CACHE` keeps the result
+frames of `load_data_into_df` for all sessions of the process:
+
+- the key is the query with its whitespace normalized and the parameters;
+- the frames held are capped at `max_bytes`, the least recently used ones
+  are evicted first;
+- there is no TTL. The cache is emptied when the ingestion watermark moves:
+  a loader run advancing `stations.last_update`, new live snapshots in
+  `weather_live_latest` or a station catalog sync. The watermark is read at
+  most once per `check_every_s`.
+
+Callers get a copy of the cached frame, the pages add and convert columns.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.utils.connect_db import get_pool
+from src.utils.constants import QUERY_CACHE_CHECK_EVERY_S, QUERY_CACHE_MAX_BYTES
+from src.utils.queries import SELECT_INGEST_WATERMARK
+
+
+def read_watermark() -> tuple:
+    """Newest station checkpoint, live snapshot and catalog sync."""
+    with get_pool().connection() as conn, conn.cursor() as cur:
+        cur.execute(SELECT_INGEST_WATERMARK)
+        return tuple(cur.fetchone())
+
+
+def _freeze(value):
+    """Hashable form of a parameter value (lists become tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def cache_key(query: str, params=None) -> tuple:
+    """Key of a query: the SQL with collapsed whitespace and its parameters."""
+    return " ".join(query.split()), _freeze(params)
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query result frames, capped by bytes."""
+
+    def __init__(
+        self,
+        max_bytes: int = QUERY_CACHE_MAX_BYTES,
+        check_every_s: float = QUERY_CACHE_CHECK_EVERY_S,
+        watermark=read_watermark,
+    ):
+        self.max_bytes = max_bytes
+        self.check_every_s = check_every_s
+        self._watermark = watermark
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._seen_watermark = None
+        self._checked_at = None
+        # Bumped when the cache is emptied, a result read before is dropped
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get_or_load(self, query: str, params, load) -> pd.DataFrame:
+        """
+        Return the cached result of `query`, or run `load()` and cache it.
+
+        Args:
+            query (str): SQL of the read.
+            params (dict): Parameters of the read.
+            load: Function returning the result frame on a miss.
+
+        Returns:
+            pd.DataFrame: A copy of the result.
+        """
+        self._check_watermark()
+        key = cache_key(query, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0].copy()
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        df = load()
+        self._put(key, df, generation)
+        return df.copy()
+
+    def _put(self, key, df: pd.DataFrame, generation: int) -> None:
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._stats["evictions"] += 1
+
+    def _check_watermark(self) -> None:
+        """Empty the cache if the ingestion watermark moved."""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._checked_at is not None
+                and now - self._checked_at < self.check_every_s
+            ):
+                return
+            self._checked_at = now
+
+        watermark = self._watermark()
+        with self._lock:
+            if watermark == self._seen_watermark:
+                return
+            changed = self._seen_watermark is not None
+            self._seen_watermark = watermark
+            if changed:
+                self._stats["invalidations"] += 1
+            self._empty()
+        if changed:
+            logging.info(f"Query cache emptied, new data loaded: {self.stats()}")
+
+    def clear(self) -> None:
+        """Drop every entry, the next read checks the watermark again."""
+        with self._lock:
+            self._empty()
+            self._checked_at = None
+
+    def _empty(self) -> None:
+        """Drop the entries, the caller holds the lock."""
+        self._entries.clear()
+        self._bytes = 0
+        self._generation += 1
+
+    def stats(self) -> dict:
+        """Hits, misses, hit rate, entries and bytes held."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(entries=len(self._entries), bytes=self._bytes)
+        reads = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / reads if reads else 0.0
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+QUERY_CACHE = QueryCache()
@@ -0,0 +1,77 @@
+"""
+Monthly and yearly rollups of weather_data_daily
+
+`weather_rollup_monthly` and `weather_rollup_yearly` hold one row per
+station and period with the statistics the dashboard pages show: mean,
+lowest and highest temperature (with their days), precipitation sum, rainy
+days and the number of observed days for the coverage.
+
+The loader calls `refresh_rollups` for the days it has just written, only
+the months and years of that station touching the range are recomputed.
+The pages read a single row per metric card with `load_rollups`.
+"""
+
+import pandas as pd
+
+from src.utils.constants import ROLLUP_TABLES
+from src.utils.metrics import stage
+from src.utils.queries import REFRESH_ROLLUP, SELECT_ROLLUP_PERIODS
+from src.utils.utils import load_data_into_df
+
+ROLLUP_VALUES = ["tavg", "tmin", "tmax", "prcp_sum"]
+
+
+def refresh_rollups(conn, station_id: int, start, end) -> int:
+    """
+    Recompute the rollup rows of `station_id` for every month and year that
+    [start, end] touches. The caller commits, the loader commits them
+    together with the checkpoint of the window.
+
+    Args:
+        conn: Open PostgreSQL database connection object.
+        station_id (int): WMO id of the station.
+        start, end: First and last day written to weather_data_daily.
+
+    Returns:
+        int: Number of rollup rows inserted or changed.
+    """
+    if pd.isna(start) or pd.isna(end):
+        return 0
+
+    params = {
+        "station_id": int(station_id),
+        "start": pd.Timestamp(start).date(),
+        "end": pd.Timestamp(end).date(),
+    }
+    changed = 0
+    with stage("refresh_rollups") as record, conn.cursor() as cur:
+        for table, unit in ROLLUP_TABLES.items():
+            cur.execute(REFRESH_ROLLUP.format(table=table, unit=unit), params)
+            changed += max(cur.rowcount, 0)
+        record["rows"] = changed
+    return changed
+
+
+def load_rollups(table: str, station_id: int, periods: list) -> pd.DataFrame:
+    """
+    Return the rollup rows of `station_id` for `periods`, indexed by period.
+
+    Args:
+        table (str): A key of `ROLLUP_TABLES`.
+        station_id (int): WMO id of the station.
+        periods (list): First days of the wanted months/years.
+
+    Returns:
+        pd.DataFrame: One row per period that has data.
+    """
+    df = load_data_into_df(
+        SELECT_ROLLUP_PERIODS.format(table=table),
+        params={
+            "station_id": int(station_id),
+            "periods": [pd.Timestamp(p).date() for p in periods],
+        },
+    )
+    df["period"] = pd.to_datetime(df["period"])
+    # NULL temperatures of a single row come back as None, not NaN
+    df[ROLLUP_VALUES] = df[ROLLUP_VALUES].astype("float64")
+    return df.set_index("period")
@@ -1,11 +1,18 @@
 import sys
+import warnings
 import pandas as pd
 import psycopg2
-from psycopg2.extras import execute_values
-import io
 
 sys.path.append("../../")
-from src.utils.connect_db import connect_to_db  # noqa: E402
+from src.utils.connect_db import get_pool  # noqa: E402
+from src.utils.binary_copy import copy_binary  # noqa: E402
+from src.utils.constants import READ_CHUNK_ROWS, USE_QUERY_CACHE  # noqa: E402
+from src.utils.metrics import stage  # noqa: E402
+from src.utils.query_cache import QUERY_CACHE  # noqa: E402
+from src.utils.queries import (  # noqa: E402
+    CREATE_STAGING_TABLE,
+    UPSERT_FROM_STAGING,
+)
 
 
 def get_start_date(row, cols=("hourly_start", "daily_start")):
@@ -21,81 +28,72 @@ def get_start_date(row, cols=("hourly_start", "daily_start")):
 def rename_index_to_time(df, new_name="time"):
     """
     Reset DataFrame index and rename it to 'time' (or specified name).
-    """
-    return df.reset_index().rename(columns={"index": new_name})
-
 
-def prepare_to_records(df: pd.DataFrame, station_id: int, cols: list):
-    """
-    Prepare DataFrame for database insertion:
-      - Add station_id
-      - Keep specified columns and convert NaN to None
-      - Convert rows to list of tuples for execute_values
+    Same result as `reset_index()` + rename, but the value columns are
+    shared with the input instead of copied.
     """
-    # Add station_id column
-    df["station_id"] = station_id
+    name = new_name if df.index.name in (None, "index") else df.index.name
+    out = df.copy(deep=False)
+    out.insert(0, name, df.index)
+    out.index = pd.RangeIndex(len(out))
+    return out
 
-    # Keep only these columns and convert NaN -> None for SQL
-    df = df[cols].where(pd.notna(df[cols]), None)
-    df = df[cols].astype(object)  # force object dtype so None marad
-
-    # Convert DataFrame rows to list of tuples, NaN -> None
-    records = [
-        tuple(
-            getattr(row, col) if pd.notna(getattr(row, col)) else None for col in cols
-        )
-        for row in df.itertuples(index=False)
-    ]
 
-    return records, df
-
-
-def copy_to_db(
-    df_hourly: pd.DataFrame,
-    conn: psycopg2.extensions.connection,
-    station_id: int,
-    cols: list,
-):
+def column_to_values(series: pd.Series) -> list:
     """
-    Insert hourly data into the database using COPY for fast performance.
+    Convert one column to a list of Python values with NaN/NA/NaT -> None.
+    The NULL replacement is done on the whole array at once.
     """
-    records, df_hourly = prepare_to_records(df_hourly, station_id, cols)
-
-    # Write DataFrame to in-memory CSV buffer
-    buffer = io.StringIO()
-    df_hourly.to_csv(buffer, index=False, header=False)
-    buffer.seek(0)
-
-    # Use COPY for fast insertion
-    with conn.cursor() as cur:
-        cur.copy_expert(
-            sql=f"""
-                COPY weather_data_hourly (
-                    {", ".join(cols)}
-                )
-                FROM STDIN WITH (FORMAT CSV, NULL '');
-            """,
-            file=buffer,
-        )
-    conn.commit()
+    values = series.to_numpy(dtype=object)
+    values[series.isna().to_numpy()] = None
+    return values.tolist()
 
 
-def insert_into_db(
+def upsert_to_db(
     df: pd.DataFrame,
     conn: psycopg2.extensions.connection,
     station_id: int,
-    insert_sql: str,
+    table: str,
     cols: list,
-):
+    types: dict,
+) -> int:
     """
-    Insert data into the database using execute_values.
-    """
-    records, df = prepare_to_records(df, station_id, cols)
+    Insert or update rows of `table` keyed by (station_id, time).
+
+    The frame is binary COPY-ed into a temporary staging table and merged
+    with one `INSERT ... ON CONFLICT DO UPDATE`, so loading the same period
+    twice does not create duplicates. Unchanged rows are not rewritten.
 
-    with conn.cursor() as cur:
-        execute_values(cur, insert_sql, records)
+    Returns:
+        int: Number of inserted or updated rows.
+    """
+    value_cols = [col for col in cols if col not in ("station_id", "time")]
+    staging = f"staging_{table}"
+
+    with stage(f"upsert_{table}") as record, conn.cursor() as cur:
+        cur.execute(
+            CREATE_STAGING_TABLE.format(
+                staging=staging, table=table, cols=", ".join(cols)
+            )
+        )
+        record["rows"] = len(df)
+        record["bytes"] = copy_binary(
+            cur, staging, df, cols, types, constants={"station_id": station_id}
+        )
+        cur.execute(
+            UPSERT_FROM_STAGING.format(
+                table=table,
+                staging=staging,
+                cols=", ".join(cols),
+                updates=", ".join(f"{col} = EXCLUDED.{col}" for col in value_cols),
+                current=", ".join(f"t.{col}" for col in value_cols),
+                excluded=", ".join(f"EXCLUDED.{col}" for col in value_cols),
+            )
+        )
+        written = cur.rowcount
+        conn.commit()
 
-    conn.commit()
+    return written
 
 
 def calc_days_of_year(year: int):
@@ -116,11 +114,81 @@ def calc_days_of_year(year: int):
     return days_in_year
 
 
-def load_data_into_df(query):
+# Name of the server-side cursor of the readers, unique per connection
+READER_CURSOR = "load_data_reader"
+
+
+def iter_df_chunks(query, params=None, chunk_rows: int = READ_CHUNK_ROWS):
+    """
+    Run a SELECT and yield the result as DataFrames of `chunk_rows` rows.
+
+    The rows are read through a named (server-side) cursor on a connection
+    of the process pool, Postgres keeps the result and only one chunk is
+    held on the client at a time. The first chunk is yielded as soon as it
+    arrives. An empty result yields a single empty frame that still has
+    the columns.
+
+    Args:
+        query (str): SELECT with optional `%(name)s` placeholders.
+        params (dict): Values of the placeholders.
+        chunk_rows (int): Rows fetched and converted at a time.
+
+    Yields:
+        pd.DataFrame: The next chunk of the result.
+    """
+    with get_pool().connection() as conn:
+        with conn.cursor(name=READER_CURSOR) as cur:
+            cur.execute(query, params)
+            rows = cur.fetchmany(chunk_rows)
+            # A named cursor has its description after the first fetch
+            columns = [col[0] for col in cur.description]
+            while True:
+                yield pd.DataFrame.from_records(
+                    rows, columns=columns, coerce_float=True
+                )
+                rows = cur.fetchmany(chunk_rows)
+                if not rows:
+                    break
+        conn.rollback()
+
+
+def read_df(query, params=None, chunk_rows: int = READ_CHUNK_ROWS):
     """
     Execute SQL query and return the result as a pandas DataFrame.
+
+    The result is streamed with `iter_df_chunks`, so the whole result never
+    exists as a list of Python row tuples, only the typed chunk frames are
+    kept and concatenated at the end.
+
+    Args:
+        query (str): SQL with optional `%(name)s` placeholders.
+        params (dict): Values of the placeholders, passed to the driver
+            instead of being formatted into the SQL string.
+        chunk_rows (int): Rows fetched and converted at a time.
+    """
+    chunks = list(iter_df_chunks(query, params, chunk_rows))
+    if len(chunks) == 1:
+        return chunks[0]
+    # A column that is NULL in a whole chunk comes back as object dtype,
+    # infer_objects restores the dtype of the other chunks. pandas warns that
+    # it will stop skipping such columns in concat, the result is the same.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return pd.concat(chunks, ignore_index=True).infer_objects()
+
+
+def load_data_into_df(query, params=None):
+    """
+    Return the result of a dashboard query as a pandas DataFrame.
+
+    Results are served from `QUERY_CACHE` until new data is loaded, a
+    miss is read with `read_df`.
+
+    Args:
+        query (str): SQL with optional `%(name)s` placeholders.
+        params (dict): Values of the placeholders, passed to the driver
+            instead of being formatted into the SQL string.
     """
-    conn = connect_to_db()
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+    if not USE_QUERY_CACHE:
+        return read_df(query, params)
+    return QUERY_CACHE.get_or_load(query, params, lambda: read_df(query, params))
@@ -0,0 +1,161 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+from meteostat import Daily
+from meteostat.utilities.aggregations import degree_mean
+
+from src.celan_and_validate.aggregate import daily_from_hourly, uncovered_days
+from src.celan_and_validate.clean_and_validate import clean_and_validate_hours
+from src.ingestion.load_data import fetch_daily
+
+
+def hourly(start="2024-03-01", hours=72, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=hours, freq="h", name="time")
+    df = pd.DataFrame(
+        {
+            "temp": rng.normal(5, 4, hours),
+            "dwpt": rng.normal(0, 3, hours),
+            "rhum": rng.uniform(40, 100, hours),
+            "prcp": np.where(rng.random(hours) < 0.3, rng.exponential(1, hours), 0),
+            "snow": np.nan,
+            "wdir": rng.uniform(0, 360, hours),
+            "wspd": rng.uniform(0, 30, hours),
+            "wpgt": np.nan,
+            "pres": rng.normal(1015, 5, hours),
+            "tsun": np.nan,
+            "coco": rng.integers(1, 10, hours),
+        },
+        index=index,
+    )
+    df.loc[df.index[5:9], "wdir"] = np.nan
+    return df
+
+
+# ---------- daily_from_hourly ----------
+def test_daily_from_hourly_matches_meteostat_rules():
+    raw = hourly()
+    reference = (
+        raw.groupby(pd.Grouper(freq="1D"))
+        .agg(
+            tavg=("temp", "mean"),
+            tmin=("temp", "min"),
+            tmax=("temp", "max"),
+            prcp=("prcp", "sum"),
+            wdir=("wdir", degree_mean),
+            wspd=("wspd", "mean"),
+            pres=("pres", "mean"),
+        )
+        .round(1)
+    )
+
+    daily = daily_from_hourly(clean_and_validate_hours(raw.copy()))
+
+    assert list(daily.columns) == list(Daily.aggregations)
+    assert daily.index.name == "time" and len(daily) == 3
+    assert (daily.dtypes == "float32").all()
+    for column in reference.columns:
+        np.testing.assert_allclose(
+            daily[column].to_numpy(), reference[column].to_numpy(), atol=0.051
+        )
+    # Days without any snow or sunshine value stay NULL, not 0
+    assert daily["snow"].isna().all() and daily["tsun"].isna().all()
+
+
+def test_daily_from_hourly_drops_days_with_few_hours():
+    raw = hourly(hours=48)
+    raw.loc["2024-03-02 06:00":"2024-03-02 23:00", "temp"] = np.nan
+
+    daily = daily_from_hourly(clean_and_validate_hours(raw), min_hours=18)
+
+    assert list(daily.index) == [pd.Timestamp("2024-03-01")]
+
+
+def test_daily_from_hourly_empty_frame():
+    daily = daily_from_hourly(pd.DataFrame())
+
+    assert daily.empty
+    assert "tavg" in daily.columns
+
+
+# ---------- uncovered_days ----------
+def test_uncovered_days_skips_running_day():
+    derived = pd.DataFrame(index=pd.DatetimeIndex(["2024-03-01", "2024-03-03"]))
+
+    missing = uncovered_days(
+        derived, datetime(2024, 3, 1), datetime(2024, 3, 5, 14, 30)
+    )
+
+    assert list(missing) == [pd.Timestamp("2024-03-02"), pd.Timestamp("2024-03-04")]
+
+
+# ---------- fetch_daily ----------
+def test_fetch_daily_calls_daily_only_for_uncovered_days():
+    raw = hourly(hours=96)
+    raw.loc["2024-03-02", "temp"] = np.nan
+    daily = MagicMock()
+    daily.return_value.fetch.return_value = pd.DataFrame(
+        {"tavg": [1.0, 2.0, 3.0]},
+        index=pd.DatetimeIndex(["2024-03-01", "2024-03-02", "2024-03-03"], name="time"),
+    )
+
+    with patch("src.ingestion.load_data.Daily", daily), patch(
+        "src.ingestion.load_data.USE_LANDING_CACHE", False
+    ):
+        df = fetch_daily(
+            15120,
+            datetime(2024, 3, 1),
+            datetime(2024, 3, 4, 23, 59, 59),
+            clean_and_validate_hours(raw),
+        )
+
+    daily.assert_called_once_with(
+        15120, start=pd.Timestamp("2024-03-02"), end=pd.Timestamp("2024-03-02")
+    )
+    assert list(df.index) == list(pd.date_range("2024-03-01", periods=4))
+    assert df.loc["2024-03-02", "tavg"] == 2.0
+
+
+def test_fetch_daily_one_call_per_gap():
+    raw = hourly(hours=10 * 24)
+    raw.loc["2024-03-02", "temp"] = np.nan
+    raw.loc["2024-03-08":"2024-03-09", "temp"] = np.nan
+    daily = MagicMock()
+    daily.return_value.fetch.side_effect = lambda: pd.DataFrame(
+        {"tavg": [9.0]},
+        index=pd.DatetimeIndex([daily.call_args.kwargs["start"]], name="time"),
+    )
+
+    with patch("src.ingestion.load_data.Daily", daily), patch(
+        "src.ingestion.load_data.USE_LANDING_CACHE", False
+    ):
+        df = fetch_daily(
+            15120,
+            datetime(2024, 3, 1),
+            datetime(2024, 3, 10, 23, 59, 59),
+            clean_and_validate_hours(raw),
+        )
+
+    # Two gaps, two calls, not one call for the whole window
+    assert [c.kwargs for c in daily.call_args_list] == [
+        {"start": pd.Timestamp("2024-03-02"), "end": pd.Timestamp("2024-03-02")},
+        {"start": pd.Timestamp("2024-03-08"), "end": pd.Timestamp("2024-03-09")},
+    ]
+    assert len(df) == 9
+
+
+def test_fetch_daily_fully_covered_skips_api():
+    daily = MagicMock()
+
+    with patch("src.ingestion.load_data.Daily", daily):
+        df = fetch_daily(
+            15120,
+            datetime(2024, 3, 1),
+            datetime(2024, 3, 3, 23, 59, 59),
+            clean_and_validate_hours(hourly()),
+        )
+
+    assert not daily.called
+    assert len(df) == 3
@@ -0,0 +1,129 @@
+import io
+import struct
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from src.utils.binary_copy import (
+    COPY_HEADER,
+    COPY_TRAILER,
+    DAILY_COPY_TYPES,
+    HOURLY_COPY_TYPES,
+    copy_binary,
+    iter_binary_copy,
+)
+
+PG_EPOCH = datetime(2000, 1, 1)
+
+
+def decode(stream: bytes, types: list[str]) -> list[tuple]:
+    """Minimal binary COPY decoder used to check the encoder."""
+    assert stream.startswith(COPY_HEADER)
+    assert stream.endswith(COPY_TRAILER)
+    pos, rows = len(COPY_HEADER), []
+    while True:
+        (n_fields,) = struct.unpack_from("!h", stream, pos)
+        pos += 2
+        if n_fields == -1:
+            return rows
+        row = []
+        for pg_type in types:
+            (length,) = struct.unpack_from("!i", stream, pos)
+            pos += 4
+            if length == -1:
+                row.append(None)
+                continue
+            if pg_type == "float4":
+                (value,) = struct.unpack_from("!f", stream, pos)
+            elif pg_type == "int4":
+                (value,) = struct.unpack_from("!i", stream, pos)
+            elif pg_type == "timestamp":
+                (micros,) = struct.unpack_from("!q", stream, pos)
+                value = PG_EPOCH + timedelta(microseconds=micros)
+            elif pg_type == "date":
+                (days,) = struct.unpack_from("!i", stream, pos)
+                value = PG_EPOCH.date() + timedelta(days=days)
+            row.append(value)
+            pos += length
+        rows.append(tuple(row))
+
+
+# ---------- iter_binary_copy ----------
+def test_iter_binary_copy_hourly_roundtrip():
+    df = pd.DataFrame(
+        {
+            "time": pd.to_datetime(["2025-01-01 00:00", "2025-01-01 01:00", None]),
+            "temp": [1.5, np.nan, -3.25],
+            "coco": pd.array([3, None, 7], dtype="Int64"),
+        }
+    )
+    cols = ["station_id", "time", "temp", "coco"]
+    stream = b"".join(
+        iter_binary_copy(df, cols, HOURLY_COPY_TYPES, {"station_id": 15120})
+    )
+
+    rows = decode(stream, ["int4", "timestamp", "float4", "int4"])
+    assert rows == [
+        (15120, datetime(2025, 1, 1, 0), 1.5, 3),
+        (15120, datetime(2025, 1, 1, 1), None, None),
+        (15120, None, -3.25, 7),
+    ]
+
+
+def test_iter_binary_copy_daily_dates_and_chunks():
+    days = [date(2024, 2, 28) + timedelta(days=i) for i in range(5)]
+    df = pd.DataFrame({"time": days, "tavg": [0.5, 1.0, None, 2.0, 4.0]})
+    cols = ["station_id", "time", "tavg"]
+
+    chunks = list(
+        iter_binary_copy(df, cols, DAILY_COPY_TYPES, {"station_id": 1}, chunk_rows=2)
+    )
+    # header + 3 chunks of at most 2 rows + trailer
+    assert len(chunks) == 5
+
+    rows = decode(b"".join(chunks), ["int4", "date", "float4"])
+    assert [r[1] for r in rows] == days
+    assert [r[2] for r in rows] == [0.5, 1.0, None, 2.0, 4.0]
+
+
+def test_iter_binary_copy_compact_dtypes():
+    df = pd.DataFrame(
+        {
+            "time": pd.to_datetime(["2024-03-01", "2024-03-02"]),
+            "tavg": np.array([0.25, np.nan], dtype="float32"),
+            "coco": pd.array([None, 27], dtype="Int8"),
+        }
+    )
+    cols = ["station_id", "time", "tavg", "coco"]
+    types = {**DAILY_COPY_TYPES, "coco": "int4"}
+    stream = b"".join(iter_binary_copy(df, cols, types, {"station_id": 15120}))
+
+    rows = decode(stream, ["int4", "date", "float4", "int4"])
+    assert rows == [
+        (15120, date(2024, 3, 1), 0.25, None),
+        (15120, date(2024, 3, 2), None, 27),
+    ]
+
+
+def test_iter_binary_copy_empty_frame():
+    df = pd.DataFrame({"time": pd.to_datetime([]), "temp": []})
+    stream = b"".join(iter_binary_copy(df, ["time", "temp"], HOURLY_COPY_TYPES))
+    assert stream == COPY_HEADER + COPY_TRAILER
+
+
+# ---------- copy_binary ----------
+def test_copy_binary_streams_to_copy_expert():
+    df = pd.DataFrame({"temp": [1.0, 2.0]})
+    mock_cursor = MagicMock()
+    received = io.BytesIO()
+    mock_cursor.copy_expert.side_effect = lambda sql, file, size: received.write(
+        file.read()
+    )
+
+    copy_binary(mock_cursor, "weather_data_hourly", df, ["temp"], HOURLY_COPY_TYPES)
+
+    sql = mock_cursor.copy_expert.call_args.kwargs["sql"]
+    assert "FORMAT BINARY" in sql
+    assert decode(received.getvalue(), ["float4"]) == [(1.0,), (2.0,)]
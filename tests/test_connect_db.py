@@ -0,0 +1,117 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+
+from src.utils import connect_db
+from src.utils.connect_db import ConnectionPool, PoolTimeout
+
+
+def fake_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def backend():
+    """Patched ThreadedConnectionPool handing out fake connections."""
+    with patch("src.utils.connect_db.ThreadedConnectionPool") as pool_class:
+        backend = pool_class.return_value
+        backend.getconn.side_effect = lambda: fake_connection()
+        yield backend
+
+
+# ---------- ConnectionPool ----------
+def test_connection_context_gives_connection_back(backend):
+    pool = ConnectionPool(1, 2)
+
+    with pool.connection() as conn:
+        assert pool.stats()["in_use"] == 1
+
+    backend.putconn.assert_called_once_with(conn, close=False)
+    stats = pool.stats()
+    assert stats["checkouts"] == 1 and stats["in_use"] == 0
+    assert stats["maxconn"] == 2 and 0 <= stats["utilization"] <= 1
+
+
+def test_putconn_rolls_back_open_transaction(backend):
+    pool = ConnectionPool(1, 2)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.info.transaction_status = extensions.TRANSACTION_STATUS_INERROR
+            raise RuntimeError("boom")
+
+    assert conn.rollback.called
+    backend.putconn.assert_called_once_with(conn, close=False)
+
+
+def test_putconn_drops_closed_connection(backend):
+    pool = ConnectionPool(1, 2)
+
+    with pool.connection() as conn:
+        conn.closed = 1
+
+    backend.putconn.assert_called_once_with(conn, close=True)
+
+
+def test_checkout_waits_for_free_connection(backend):
+    pool = ConnectionPool(1, 1, timeout_s=5)
+    first = pool.getconn()
+    threading.Timer(0.2, pool.putconn, args=(first,)).start()
+
+    with pool.connection():
+        pass
+
+    stats = pool.stats()
+    assert stats["peak_in_use"] == 1
+    assert stats["max_wait_s"] >= 0.15
+    assert stats["avg_wait_s"] == pytest.approx(stats["wait_s"] / 2)
+
+
+def test_checkout_times_out_when_pool_is_full(backend):
+    pool = ConnectionPool(1, 1, timeout_s=0.05)
+    pool.getconn()
+
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_idle_connection_is_pinged_and_replaced(backend):
+    dead, fresh = fake_connection(), fake_connection()
+    dead.cursor.return_value.__enter__.return_value.execute.side_effect = (
+        psycopg2.OperationalError("server closed the connection")
+    )
+    backend.getconn.side_effect = [dead, dead, fresh]
+    pool = ConnectionPool(1, 2, ping_after_s=0)
+
+    # Returned once, so it is pinged on the next checkout
+    pool.putconn(pool.getconn())
+    time.sleep(0.01)
+    with pool.connection() as conn:
+        assert conn is fresh
+
+    backend.putconn.assert_any_call(dead, close=True)
+    assert pool.stats()["replaced"] == 1
+
+
+# ---------- get_pool ----------
+def test_get_pool_is_shared_and_follows_settings(backend):
+    with patch.object(connect_db, "_pool", None), patch.object(
+        connect_db, "_pool_key", None
+    ), patch.object(connect_db, "DB_NAME", "weather_a"):
+        first = connect_db.get_pool()
+        assert connect_db.get_pool() is first
+        assert connect_db.pool_stats()["checkouts"] == 0
+
+        with patch.object(connect_db, "DB_NAME", "weather_b"):
+            second = connect_db.get_pool()
+
+    assert second is not first
+    assert backend.closeall.called
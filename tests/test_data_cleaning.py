@@ -43,8 +43,8 @@ def test_clean_and_validate_hours_coco_column():
         {"temp": [25], "coco": ["1", "2", None, "a", "3.0"][:1]}, index=[0]
     )
     result = clean_and_validate_hours(df)
-    # Check coco converted to Int64 type if exists
-    assert "coco" not in result.columns or result["coco"].dtype.name == "Int64"
+    # Check coco converted to the compact Int8 type if exists
+    assert "coco" not in result.columns or result["coco"].dtype.name == "Int8"
 
 
 # ---------------- clean_and_validate_days ----------------
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.downsample import bucket_sums, lttb, lttb_indices
+
+
+def daily(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("1970-01-01", periods=n, freq="D"),
+            "tavg": rng.normal(10, 8, n),
+            "prcp": rng.exponential(2, n),
+        }
+    )
+
+
+# ---------- lttb ----------
+def test_lttb_keeps_budget_and_end_points():
+    df = daily(20_000)
+
+    out = lttb(df, "time", "tavg", n_out=500)
+
+    assert len(out) == 500
+    assert out["time"].iloc[0] == df["time"].iloc[0]
+    assert out["time"].iloc[-1] == df["time"].iloc[-1]
+    assert out["time"].is_monotonic_increasing
+
+
+def test_lttb_keeps_spike():
+    df = daily(10_000)
+    df.loc[4321, "tavg"] = 80.0
+
+    out = lttb(df, "time", "tavg", n_out=100)
+
+    assert 80.0 in out["tavg"].values
+
+
+def test_lttb_small_frame_unchanged_without_nan():
+    df = daily(50)
+    df.loc[3, "tavg"] = np.nan
+
+    out = lttb(df, "time", "tavg", n_out=100)
+
+    assert len(out) == 49
+    assert out["tavg"].notna().all()
+
+
+def test_lttb_indices_one_point_per_bucket():
+    x = np.arange(10, dtype=float)
+    y = np.array([0, 5, 0, 0, 0, 0, 0, 0, -5, 0], dtype=float)
+
+    kept = lttb_indices(x, y, 4)
+
+    assert list(kept) == [0, 1, 8, 9]
+
+
+# ---------- bucket_sums ----------
+def test_bucket_sums_keeps_total_within_budget():
+    df = daily(20_000)
+
+    out = bucket_sums(df, "time", "prcp", n_buckets=700)
+
+    assert len(out) <= 700
+    assert np.isclose(out["prcp"].sum(), df["prcp"].sum())
+    assert out["n"].sum() == len(df)
+    # Whole-day buckets starting at midnight
+    assert (out["time"] == out["time"].dt.normalize()).all()
+    assert out["time"].diff().dropna().nunique() == 1
+
+
+def test_bucket_sums_bucket_without_values_stays_nan():
+    df = daily(100)
+    df.loc[:49, "prcp"] = np.nan
+
+    out = bucket_sums(df, "time", "prcp", n_buckets=2)
+
+    assert list(out["n"]) == [50, 50]
+    assert np.isnan(out["prcp"].iloc[0])
+    assert np.isclose(out["prcp"].iloc[1], df["prcp"].sum())
+
+
+def test_bucket_sums_small_frame_unchanged():
+    df = daily(30)
+
+    out = bucket_sums(df, "time", "prcp", n_buckets=700)
+
+    assert list(out.columns) == ["time", "prcp", "n"]
+    assert len(out) == 30 and (out["n"] == 1).all()
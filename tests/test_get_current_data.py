@@ -0,0 +1,298 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import psycopg2
+import pytest
+
+from src.ingestion.live_cache import LiveResponseCache
+from src.ingestion.get_current_data import (
+    build_weather_record,
+    cache_stored_responses,
+    fetch_current_weather_async,
+    fetch_weather_nearby,
+    insert_weather_live,
+    latest_per_station,
+)
+
+PAYLOAD = json.loads(
+    (Path(__file__).parent / "data" / "onecall_current.json").read_text()
+)
+RESPONSE_DELAY_S = 0.3
+
+
+class OneCallStub(BaseHTTPRequestHandler):
+    """Serve the recorded One Call payload, fail for lat=0."""
+
+    requests_served = 0
+
+    def do_GET(self):
+        OneCallStub.requests_served += 1
+        query = parse_qs(urlparse(self.path).query)
+        time.sleep(RESPONSE_DELAY_S)
+        if query["lat"][0] == "0":
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b"server error")
+            return
+        body = json.dumps(PAYLOAD).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    # Large enough listen backlog for all concurrent connections
+    request_queue_size = 64
+
+
+@pytest.fixture
+def stub_url():
+    server = StubServer(("127.0.0.1", 0), OneCallStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/data/3.0/onecall"
+    server.shutdown()
+    server.server_close()
+
+
+# ---------- build_weather_record ----------
+def test_build_weather_record():
+    record = build_weather_record(PAYLOAD, station_id=15120)
+    assert record["station_id"] == 15120
+    assert record["dt"] == datetime.fromtimestamp(PAYLOAD["current"]["dt"])
+    assert record["temp"] == 11.42
+    assert record["weather_main"] == "Clouds"
+
+
+# ---------- fetch_current_weather_async ----------
+def test_fetch_current_weather_async(stub_url):
+    stations = [
+        {"station_id": 15000 + i, "lat": 46.0 + i, "lon": 25.0} for i in range(8)
+    ]
+    stations.append({"station_id": 99999, "lat": 0, "lon": 0})
+
+    start = time.time()
+    fetched, failures = asyncio.run(
+        fetch_current_weather_async(stations, "key", concurrency=10, url=stub_url)
+    )
+    elapsed = time.time() - start
+
+    assert sorted(s["station_id"] for s, _ in fetched) == [15000 + i for i in range(8)]
+    assert all(data == PAYLOAD for _, data in fetched)
+    assert failures[0][0] == 99999
+    assert "500" in failures[0][1]
+    # All stations are fetched at the same time, not one after another
+    assert elapsed < 3 * RESPONSE_DELAY_S
+
+
+def test_fetch_current_weather_async_timeout_excludes_queueing(stub_url):
+    stations = [
+        {"station_id": 15000 + i, "lat": 46.0 + i, "lon": 25.0} for i in range(6)
+    ]
+
+    # 3 rounds of 2 requests take ~0.9 s, each request only ~0.3 s
+    with patch("src.ingestion.get_current_data.HTTP_TIMEOUT_S", 2 * RESPONSE_DELAY_S):
+        fetched, failures = asyncio.run(
+            fetch_current_weather_async(stations, "key", concurrency=2, url=stub_url)
+        )
+
+    assert failures == []
+    assert len(fetched) == 6
+
+
+def test_fetch_current_weather_async_uses_cache(stub_url, tmp_path):
+    cache = LiveResponseCache(path=str(tmp_path / "cache.sqlite"), ttl_s=600)
+    stations = [{"station_id": 15120, "lat": 46.36, "lon": 25.8}]
+    OneCallStub.requests_served = 0
+
+    fetched, _ = asyncio.run(
+        fetch_current_weather_async(stations, "key", url=stub_url, cache=cache)
+    )
+    assert len(fetched) == 1
+    # Nothing is cached before the records are written
+    assert cache.get(15120, 46.36, 25.8) is None
+    cache_stored_responses(cache, fetched, failures=[])
+
+    # Cached observation is still current: no request and no new record
+    fetched, _ = asyncio.run(
+        fetch_current_weather_async(stations, "key", url=stub_url, cache=cache)
+    )
+    assert fetched == []
+    assert OneCallStub.requests_served == 1
+
+    # Expired entry is fetched again, but the observation did not change
+    cache.ttl_s = 0
+    fetched, _ = asyncio.run(
+        fetch_current_weather_async(stations, "key", url=stub_url, cache=cache)
+    )
+    assert fetched == []
+    assert OneCallStub.requests_served == 2
+    assert cache.stats()["duplicates"] == 1
+
+
+def test_fetch_current_weather_async_cache_per_station(stub_url, tmp_path):
+    cache = LiveResponseCache(path=str(tmp_path / "cache.sqlite"), ttl_s=600)
+    first = {"station_id": 15120, "lat": 46.36, "lon": 25.8}
+    # Rounds to the same 0.01 degree cell as the first station
+    neighbour = {"station_id": 15121, "lat": 46.362, "lon": 25.801}
+
+    fetched, _ = asyncio.run(
+        fetch_current_weather_async([first], "key", url=stub_url, cache=cache)
+    )
+    cache_stored_responses(cache, fetched, failures=[])
+
+    fetched, _ = asyncio.run(
+        fetch_current_weather_async(
+            [first, neighbour], "key", url=stub_url, cache=cache
+        )
+    )
+    # The cached first station is skipped, its neighbour is still fetched
+    assert [s["station_id"] for s, _ in fetched] == [15121]
+
+
+# ---------- cache_stored_responses ----------
+def test_cache_stored_responses_skips_failed_inserts():
+    cache = MagicMock()
+    fetched = [
+        ({"station_id": 1, "lat": 46.0, "lon": 25.0}, PAYLOAD),
+        ({"station_id": 2, "lat": 46.1, "lon": 25.1}, PAYLOAD),
+    ]
+
+    cache_stored_responses(cache, fetched, failures=[(2, "fk violation")])
+
+    cache.put.assert_called_once_with(1, 46.0, 25.0, PAYLOAD)
+
+
+# ---------- insert_weather_live ----------
+def test_insert_weather_live_single_batch():
+    records = [build_weather_record(PAYLOAD, station_id=i) for i in range(3)]
+    mock_conn = MagicMock()
+
+    with patch("src.ingestion.get_current_data.execute_values") as mock_execute, patch(
+        "src.ingestion.get_current_data.ensure_partitions"
+    ) as mock_partitions:
+        insert_weather_live(mock_conn, records)
+
+    # The monthly partition of the snapshots is created before the insert
+    assert mock_partitions.call_args.args[1] == "weather_live"
+
+    # One history insert and one upsert of the latest rows, one commit
+    history, latest = mock_execute.call_args_list
+    assert history.args[2] == records
+    assert "weather_live_latest" in latest.args[1]
+    assert latest.args[2] == records
+    mock_conn.commit.assert_called_once()
+
+
+def test_latest_per_station_keeps_newest_record():
+    old = build_weather_record(PAYLOAD, station_id=1)
+    new = dict(old, dt=old["dt"] + timedelta(minutes=10))
+    other = build_weather_record(PAYLOAD, station_id=2)
+
+    assert latest_per_station([new, other, old]) == [new, other]
+
+
+def test_insert_weather_live_skips_broken_records():
+    records = [build_weather_record(PAYLOAD, station_id=i) for i in range(3)]
+    mock_conn = MagicMock()
+
+    def fake_execute_values(cur, sql, rows, template):
+        if "weather_live_latest" in sql:
+            return
+        # The batch and the record of station 1 are rejected
+        if len(rows) > 1 or rows[0]["station_id"] == 1:
+            raise psycopg2.IntegrityError("fk violation")
+
+    with patch(
+        "src.ingestion.get_current_data.execute_values",
+        side_effect=fake_execute_values,
+    ), patch("src.ingestion.get_current_data.ensure_partitions"):
+        failures = insert_weather_live(mock_conn, records)
+
+    assert failures == [(1, "fk violation")]
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_called_once()
+
+
+# ---------- fetch_weather_nearby ----------
+def test_fetch_weather_nearby_sync_single_batch():
+    stations = pd.DataFrame(
+        {
+            "station_id": [1, 2, 3],
+            "name": ["a", "b", "c"],
+            "latitude": [46.0, 46.1, 46.2],
+            "longitude": [25.0, 25.1, 25.2],
+        }
+    )
+
+    def fake_fetch(lat, lon, station_id, api_key, cache):
+        if station_id == 2:
+            raise RuntimeError("401 - invalid key")
+        return PAYLOAD
+
+    mock_conn = MagicMock()
+    with patch(
+        "src.ingestion.get_current_data.get_live_stations", return_value=stations
+    ), patch(
+        "src.ingestion.get_current_data.fetch_weather", side_effect=fake_fetch
+    ), patch(
+        "src.ingestion.get_current_data.insert_weather_live", return_value=[]
+    ) as mock_insert, patch(
+        "src.ingestion.get_current_data.USE_LIVE_CACHE", False
+    ):
+        fetch_weather_nearby("key", mock_conn, ["HA"], use_async=False)
+
+    # One failing station does not stop the batch, which is written once
+    mock_insert.assert_called_once()
+    assert [r["station_id"] for r in mock_insert.call_args.args[1]] == [1, 3]
+    # The connection belongs to the caller (a pooled one), it stays open
+    assert not mock_conn.close.called
+
+
+def test_fetch_weather_nearby_caches_after_insert(tmp_path):
+    stations = pd.DataFrame(
+        {
+            "station_id": [1, 2],
+            "name": ["a", "b"],
+            "latitude": [46.0, 46.1],
+            "longitude": [25.0, 25.1],
+        }
+    )
+    cache = LiveResponseCache(path=str(tmp_path / "cache.sqlite"), ttl_s=600)
+    cache.close = MagicMock()
+    cached_at_insert = []
+
+    def fake_insert(conn, records):
+        cached_at_insert.append(cache.get(1, 46.0, 25.0))
+        return [(2, "fk violation")]
+
+    with patch(
+        "src.ingestion.get_current_data.get_live_stations", return_value=stations
+    ), patch(
+        "src.ingestion.get_current_data.fetch_weather", return_value=PAYLOAD
+    ), patch(
+        "src.ingestion.get_current_data.insert_weather_live", side_effect=fake_insert
+    ), patch(
+        "src.ingestion.get_current_data.LiveResponseCache", return_value=cache
+    ), patch(
+        "src.ingestion.get_current_data.USE_LIVE_CACHE", True
+    ):
+        fetch_weather_nearby("key", MagicMock(), ["HA"], use_async=False)
+
+    # The response is cached only after the insert, the failed one not at all
+    assert cached_at_insert == [None]
+    assert cache.get(1, 46.0, 25.0) == PAYLOAD
+    assert cache.get(2, 46.1, 25.1) is None
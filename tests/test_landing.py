@@ -0,0 +1,88 @@
+import os
+import pandas as pd
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from src.ingestion.landing import LandingCache
+
+
+class FakeMeteostat:
+    """Records the requested ranges and returns an hourly frame for them."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        index = pd.date_range(start, end, freq="h", name="time")
+        return pd.DataFrame({"temp": range(len(index))}, index=index, dtype=float)
+
+
+# ---------- LandingCache.fetch ----------
+def test_fetch_reads_closed_months_from_disk(tmp_path):
+    cache = LandingCache(root=str(tmp_path))
+    fake = FakeMeteostat()
+    start, end = datetime(2020, 1, 10), datetime(2020, 3, 20, 23)
+
+    first = cache.fetch("hourly", 15120, start, end, fake)
+    # Jan-Mar are missing -> one call for whole months
+    assert fake.calls == [(datetime(2020, 1, 1), datetime(2020, 3, 31, 23, 59, 59))]
+    assert first.index[0] == start
+    assert first.index[-1] == end
+    assert (tmp_path / "hourly" / "station=15120" / "month=2020-02.parquet").exists()
+
+    second = cache.fetch("hourly", 15120, start, end, fake)
+    # Closed months come from the landing zone
+    assert len(fake.calls) == 1
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+
+def test_fetch_only_missing_and_open_months(tmp_path):
+    cache = LandingCache(root=str(tmp_path))
+    fake = FakeMeteostat()
+    cache.fetch("hourly", 1, datetime(2020, 2, 1), datetime(2020, 2, 28), fake)
+
+    fake.calls.clear()
+    cache.fetch("hourly", 1, datetime(2020, 1, 1), datetime(2020, 4, 30), fake)
+    # February is on disk, January and March-April are fetched separately
+    assert [c[0].month for c in fake.calls] == [1, 3]
+
+    # The current month is open and always fetched again
+    fake.calls.clear()
+    today = datetime.now()
+    cache.fetch("hourly", 1, today - timedelta(hours=5), today, fake)
+    cache.fetch("hourly", 1, today - timedelta(hours=5), today, fake)
+    assert len(fake.calls) == 2
+
+
+def test_fetch_offline_replays_landing_zone(tmp_path):
+    fake = FakeMeteostat()
+    LandingCache(root=str(tmp_path)).fetch(
+        "daily", 1, datetime(2020, 1, 1), datetime(2020, 1, 31), fake
+    )
+
+    offline = LandingCache(root=str(tmp_path), offline=True)
+    df = offline.fetch("daily", 1, datetime(2019, 12, 1), datetime(2020, 1, 31), fake)
+
+    assert len(fake.calls) == 1
+    assert df.index.min() == pd.Timestamp("2020-01-01")
+
+
+def test_fetch_stores_empty_closed_months(tmp_path):
+    cache = LandingCache(root=str(tmp_path))
+    empty = MagicMock(
+        return_value=pd.DataFrame({"temp": []}, index=pd.DatetimeIndex([], name="time"))
+    )
+
+    df = cache.fetch("hourly", 1, datetime(2020, 1, 1), datetime(2020, 1, 31), empty)
+    assert df.empty
+    # A gap in closed history is kept as an empty marker, not requested again
+    assert (tmp_path / "hourly" / "station=1" / "month=2020-01.parquet").exists()
+    cache.fetch("hourly", 1, datetime(2020, 1, 1), datetime(2020, 1, 31), empty)
+    assert empty.call_count == 1
+
+    # An open month without rows is not stored
+    today = datetime.now()
+    cache.fetch("hourly", 1, today - timedelta(hours=5), today, empty)
+    open_month = pd.Period(today, freq="M")
+    assert not os.path.exists(cache.path("hourly", 1, open_month))
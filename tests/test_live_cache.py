@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from src.ingestion.live_cache import LiveResponseCache
+
+PAYLOAD = json.loads(
+    (Path(__file__).parent / "data" / "onecall_current.json").read_text()
+)
+
+
+# ---------- LiveResponseCache ----------
+def test_cache_hit_and_miss(tmp_path):
+    cache = LiveResponseCache(path=str(tmp_path / "cache.sqlite"), ttl_s=600)
+
+    assert cache.get(15120, 46.3667, 25.8) is None
+    assert cache.is_new(15120, 46.3667, 25.8, PAYLOAD) is True
+    cache.put(15120, 46.3667, 25.8, PAYLOAD)
+    # Coordinates are rounded, nearby points share the entry
+    assert cache.get(15120, 46.3701, 25.7998) == PAYLOAD
+
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "duplicates": 0,
+        "hit_rate": 0.5,
+    }
+
+
+def test_cache_expired_and_duplicate_observation(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = LiveResponseCache(path=path, ttl_s=0)
+    cache.put(15120, 46.3667, 25.8, PAYLOAD)
+    cache.close()
+
+    # The file survives between runs, but the entry is stale
+    cache = LiveResponseCache(path=path, ttl_s=0)
+    assert cache.get(15120, 46.3667, 25.8) is None
+
+    # Same current.dt as before -> nothing new to insert
+    assert cache.is_new(15120, 46.3667, 25.8, PAYLOAD) is False
+    newer = dict(
+        PAYLOAD, current=dict(PAYLOAD["current"], dt=PAYLOAD["current"]["dt"] + 600)
+    )
+    assert cache.is_new(15120, 46.3667, 25.8, newer) is True
+    assert cache.stats()["duplicates"] == 1
+
+    # Comparing does not store, the cache changes only with `put`
+    assert cache.is_new(15120, 46.3667, 25.8, newer) is True
+
+
+def test_cache_keeps_stations_of_one_cell_apart(tmp_path):
+    cache = LiveResponseCache(path=str(tmp_path / "cache.sqlite"), ttl_s=600)
+    cache.put(15120, 46.3667, 25.8, PAYLOAD)
+
+    # A second station ~300 m away rounds to the same coordinates
+    assert cache.get(15121, 46.3690, 25.8010) is None
+    assert cache.is_new(15121, 46.3690, 25.8010, PAYLOAD) is True
+    assert cache.get(15120, 46.3667, 25.8) == PAYLOAD
@@ -0,0 +1,67 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.ingestion.live_retention import apply_live_retention, retention_cutoff
+from src.utils.queries import COMPACT_WEATHER_LIVE, DELETE_WEATHER_LIVE_BEFORE
+
+PARTITIONS = [
+    (
+        "weather_live_m2025_08",
+        pd.Timestamp("2025-08-01"),
+        pd.Timestamp("2025-09-01"),
+    ),
+    (
+        "weather_live_m2025_09",
+        pd.Timestamp("2025-09-01"),
+        pd.Timestamp("2025-10-01"),
+    ),
+    (
+        "weather_live_m2025_10",
+        pd.Timestamp("2025-10-01"),
+        pd.Timestamp("2025-11-01"),
+    ),
+]
+
+
+# ---------- retention_cutoff ----------
+def test_retention_cutoff_starts_at_full_hour():
+    assert retention_cutoff(datetime(2025, 10, 18, 14, 37), 30) == datetime(
+        2025, 9, 18, 14
+    )
+
+
+# ---------- apply_live_retention ----------
+def test_apply_live_retention_compacts_then_removes_in_bulk():
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    # bytes before, (snapshots compacted, hourly rows),
+    # (rows, bytes) of the dropped partition, bytes after
+    cursor.fetchone.side_effect = [(1000,), (720, 24), (4000, 500), (400,)]
+    cursor.rowcount = 300
+
+    with patch(
+        "src.ingestion.live_retention.list_partitions", return_value=PARTITIONS
+    ), patch("src.ingestion.live_retention.drop_partitions") as mock_drop:
+        report = apply_live_retention(
+            conn, keep_days=30, now=datetime(2025, 10, 18, 14, 37)
+        )
+
+    # Only the partition ending before the cutoff is dropped whole
+    assert mock_drop.call_args.args[1:] == ("weather_live", ["weather_live_m2025_08"])
+
+    # Compaction runs before the delete, both with the same cutoff
+    sqls = [c.args[0] for c in cursor.execute.call_args_list]
+    assert sqls.index(COMPACT_WEATHER_LIVE) < sqls.index(DELETE_WEATHER_LIVE_BEFORE)
+    params = cursor.execute.call_args_list[sqls.index(DELETE_WEATHER_LIVE_BEFORE)]
+    assert params.args[1] == {"cutoff": datetime(2025, 9, 18, 14)}
+
+    assert report["rows_compacted"] == 720
+    assert report["hourly_rows"] == 24
+    # Rows of the dropped partition plus the rows deleted from the boundary
+    assert report["rows_deleted"] == 4300
+    assert report["partitions_dropped"] == ["weather_live_m2025_08"]
+    # Deleted rows stay on disk until VACUUM, only the drop is reclaimed
+    assert report["bytes_reclaimed"] == 500
+    assert conn.commit.called
@@ -0,0 +1,227 @@
+import pandas as pd
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from src.utils.metrics import METRICS
+from src.ingestion.load_data import (
+    _init_process_worker,
+    iter_windows,
+    load_station_weather,
+    load_weather_data,
+    run_migrations,
+)
+
+
+STATIONS = pd.DataFrame(
+    {
+        "wmo": [15001, 15002, 15003],
+        "hourly_start": ["2025-01-01"] * 3,
+        "daily_start": ["2025-01-01"] * 3,
+        "last_update": [None] * 3,
+    }
+)
+
+
+def fake_load_station(conn, row, end_date):
+    if row["wmo"] == 15002:
+        raise RuntimeError("boom")
+    return {"hourly_rows": 24, "daily_rows": 1}
+
+
+# ---------- load_weather_data ----------
+def test_load_weather_data_thread_pool():
+    mock_pool = MagicMock()
+    with patch("pandas.read_sql_query", return_value=STATIONS), patch(
+        "src.ingestion.load_data.get_pool", return_value=mock_pool
+    ), patch(
+        "src.ingestion.load_data.load_station_weather", side_effect=fake_load_station
+    ):
+        results = load_weather_data(MagicMock(), workers=2, mode="thread")
+
+    # Every station borrowed a pooled connection and gave it back
+    assert mock_pool.connection.call_count == 3
+    assert mock_pool.connection.return_value.__exit__.call_count == 3
+    # The process pool is shared, it stays open
+    assert not mock_pool.closeall.called
+
+    # One failing station does not stop the others
+    by_id = {r["station_id"]: r for r in results}
+    assert by_id[15001]["error"] is None
+    assert by_id[15001]["hourly_rows"] == 24
+    assert by_id[15002]["error"] == "boom"
+    assert by_id[15002]["hourly_rows"] == 0
+
+
+def fake_load_station_with_metrics(conn, row, end_date):
+    METRICS.add("fetch_hourly", calls=1, rows=24)
+    return fake_load_station(conn, row, end_date)
+
+
+def test_load_weather_data_process_pool_counts_stages_once():
+    METRICS.reset()
+    # Recorded by the parent before the workers are forked
+    METRICS.add("load_stations", calls=1)
+    with patch("pandas.read_sql_query", return_value=STATIONS), patch(
+        "src.ingestion.load_data.connect_to_db"
+    ), patch(
+        "src.ingestion.load_data.load_station_weather",
+        side_effect=fake_load_station_with_metrics,
+    ):
+        results = load_weather_data(MagicMock(), workers=2, mode="process")
+
+    stages = METRICS.by_stage()
+    METRICS.reset()
+    assert len(results) == 3
+    assert stages["load_stations"]["calls"] == 1
+    assert stages["fetch_hourly"]["calls"] == 3
+    assert stages["fetch_hourly"]["rows"] == 72
+
+
+def test_init_process_worker_opens_one_plain_connection():
+    with patch("src.ingestion.load_data.connect_to_db") as mock_connect, patch(
+        "src.ingestion.load_data.get_pool"
+    ) as mock_get_pool, patch("multiprocessing.util.Finalize") as mock_finalize:
+        _init_process_worker()
+
+    # No pool per worker process, the connection is closed at worker exit
+    assert not mock_get_pool.called
+    mock_connect.assert_called_once()
+    assert mock_finalize.call_args.args[1] == mock_connect.return_value.close
+
+
+def test_load_weather_data_serial():
+    mock_conn = MagicMock()
+    with patch("pandas.read_sql_query", return_value=STATIONS), patch(
+        "src.ingestion.load_data.get_pool"
+    ) as mock_get_pool, patch(
+        "src.ingestion.load_data.load_station_weather", side_effect=fake_load_station
+    ):
+        results = load_weather_data(mock_conn, workers=1)
+
+    # Serial mode reuses the given connection
+    assert not mock_get_pool.called
+    # The read of the start dates is committed before the stations load
+    mock_conn.commit.assert_called_once()
+    assert [r["station_id"] for r in results] == [15001, 15002, 15003]
+    assert mock_conn.rollback.call_count == 1
+
+
+# ---------- run_migrations ----------
+def test_run_migrations_skips_applied_files(tmp_path):
+    for name in ("001_a.sql", "002_b.sql", "003_c.sql", "notes.txt"):
+        (tmp_path / name).write_text(f"-- {name}")
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [("001_a.sql",)]
+
+    run_migrations(conn, str(tmp_path))
+
+    sqls = [c.args for c in cur.execute.call_args_list]
+    assert sqls[2:] == [
+        ("-- 002_b.sql",),
+        ("INSERT INTO schema_migrations (file_name) VALUES (%s);", ("002_b.sql",)),
+        ("-- 003_c.sql",),
+        ("INSERT INTO schema_migrations (file_name) VALUES (%s);", ("003_c.sql",)),
+    ]
+    # Each file commits together with its schema_migrations row
+    assert conn.commit.call_count == 3
+
+
+# ---------- iter_windows ----------
+def test_iter_windows():
+    windows = list(iter_windows(datetime(2020, 1, 1), datetime(2020, 3, 15), 30))
+    assert len(windows) == 3
+    assert windows[0] == (datetime(2020, 1, 1), datetime(2020, 1, 30, 23, 59, 59))
+    assert windows[1][0] == datetime(2020, 1, 31)
+    assert windows[-1][1] == datetime(2020, 3, 15)
+
+
+# ---------- load_station_weather ----------
+def test_load_station_weather_checkpoints_every_window():
+    row = {
+        "wmo": 15120,
+        "hourly_start": "2020-01-01",
+        "daily_start": "2020-01-01",
+        "last_update": None,
+    }
+    hourly = MagicMock()
+    hourly.return_value.fetch.return_value = pd.DataFrame()
+    daily = MagicMock()
+    daily.return_value.fetch.return_value = pd.DataFrame()
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+    with patch("src.ingestion.load_data.Hourly", hourly), patch(
+        "src.ingestion.load_data.Daily", daily
+    ), patch("src.ingestion.load_data.USE_LANDING_CACHE", False), patch(
+        "src.ingestion.load_data.clean_and_validate_hours",
+        return_value=pd.DataFrame({"temp": [1.0] * 24}),
+    ), patch(
+        "src.ingestion.load_data.clean_and_validate_days",
+        return_value=pd.DataFrame({"time": [datetime(2020, 5, 1)], "tavg": [1.0]}),
+    ), patch(
+        "src.ingestion.load_data.ensure_partitions"
+    ) as mock_partitions, patch(
+        "src.ingestion.load_data.refresh_rollups"
+    ) as mock_rollups, patch(
+        "src.ingestion.load_data.upsert_to_db"
+    ) as mock_upsert:
+        result = load_station_weather(
+            mock_conn, row, datetime(2022, 6, 30), window_days=365
+        )
+
+    # 2020, 2021, 2022 (until June)
+    assert result == {"hourly_rows": 72, "daily_rows": 3, "windows": 3}
+    assert hourly.call_count == 3
+    assert mock_upsert.call_count == 6
+    # The hourly partitions of every window exist before its upsert
+    assert mock_partitions.call_count == 3
+    # The rollups of the written days are refreshed in every window
+    assert mock_rollups.call_count == 3
+    assert mock_rollups.call_args.args[1:] == (
+        15120,
+        datetime(2020, 5, 1),
+        datetime(2020, 5, 1),
+    )
+
+    # last_update is moved to the end of every finished window
+    checkpoints = [c.args[1][0] for c in mock_cursor.execute.call_args_list]
+    assert checkpoints[-1] == datetime(2022, 6, 30)
+    assert checkpoints == sorted(checkpoints)
+
+
+def test_load_station_weather_derives_daily_from_hourly():
+    row = {
+        "wmo": 15120,
+        "hourly_start": "2024-03-01",
+        "daily_start": "2024-03-01",
+        "last_update": None,
+    }
+    index = pd.date_range("2024-03-01", periods=72, freq="h", name="time")
+    hourly = MagicMock()
+    hourly.return_value.fetch.return_value = pd.DataFrame(
+        {"temp": [4.0] * 72, "prcp": [0.5] * 72}, index=index
+    )
+    daily = MagicMock()
+
+    with patch("src.ingestion.load_data.Hourly", hourly), patch(
+        "src.ingestion.load_data.Daily", daily
+    ), patch("src.ingestion.load_data.USE_LANDING_CACHE", False), patch(
+        "src.ingestion.load_data.DERIVE_DAILY_FROM_HOURLY", True
+    ), patch(
+        "src.ingestion.load_data.ensure_partitions"
+    ), patch(
+        "src.ingestion.load_data.refresh_rollups"
+    ), patch(
+        "src.ingestion.load_data.upsert_to_db"
+    ) as mock_upsert:
+        result = load_station_weather(
+            MagicMock(), row, datetime(2024, 3, 3, 23, 59, 59)
+        )
+
+    # Every day has hourly coverage, the Daily API is not called
+    assert not daily.called
+    assert result["daily_rows"] == 3
+    df_daily = mock_upsert.call_args_list[1].args[0]
+    assert list(df_daily["tavg"]) == [4.0] * 3
+    assert list(df_daily["prcp"]) == [12.0] * 3
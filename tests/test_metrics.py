@@ -0,0 +1,128 @@
+import http.client
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.ingestion.load_data import fetch_with_retry
+from src.utils.metrics import (
+    METRICS,
+    PipelineMetrics,
+    prometheus_text,
+    stage,
+    station_scope,
+    timed,
+    write_json_report,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+# ---------- stage / station_scope ----------
+def test_stage_records_per_station_and_errors():
+    with station_scope(15120):
+        with stage("clean") as record:
+            record["rows"] = 10
+        with pytest.raises(ValueError):
+            with stage("clean"):
+                raise ValueError("bad frame")
+
+    (record,) = METRICS.snapshot()
+    assert record["stage"] == "clean"
+    assert record["station_id"] == 15120
+    assert (record["calls"], record["rows"], record["errors"]) == (2, 10, 1)
+    assert record["seconds"] >= 0
+
+
+def test_metrics_are_thread_safe():
+    metrics = PipelineMetrics()
+
+    def work(station_id):
+        for _ in range(1000):
+            metrics.add("fetch", station_id % 4, calls=1, rows=2)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(8)))
+
+    assert metrics.by_stage()["fetch"]["calls"] == 8000
+    assert metrics.by_stage()["fetch"]["rows"] == 16000
+
+
+# ---------- timed ----------
+def test_timed_takes_rows_from_frames():
+    @timed("clean")
+    def clean(df):
+        return df.iloc[:2]
+
+    @timed("write")
+    def write(df, conn):
+        return 99
+
+    df = pd.DataFrame({"temp": [1.0, 2.0, 3.0]})
+    clean(df)
+    write(df, None)
+
+    stages = METRICS.by_stage()
+    assert stages["clean"]["rows"] == 2
+    assert stages["write"]["rows"] == 3
+    assert stages["write"]["bytes"] > 0
+
+
+def test_fetch_with_retry_counts_retries():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise http.client.IncompleteRead(b"")
+        return pd.DataFrame({"temp": [1.0]})
+
+    with patch("src.ingestion.load_data.time.sleep"):
+        fetch_with_retry(flaky, retries=3, delay=0)
+
+    fetch = METRICS.by_stage()["fetch"]
+    assert (fetch["calls"], fetch["retries"], fetch["rows"]) == (1, 2, 1)
+
+
+# ---------- reports ----------
+def test_reports(tmp_path):
+    METRICS.merge(
+        [
+            {
+                "stage": "fetch",
+                "station_id": 1,
+                "calls": 2,
+                "seconds": 1.5,
+                "rows": 10,
+                "bytes": 80,
+                "retries": 1,
+                "errors": 0,
+            },
+            {
+                "stage": "fetch",
+                "station_id": 2,
+                "calls": 1,
+                "seconds": 0.5,
+                "rows": 5,
+                "bytes": 40,
+                "retries": 0,
+                "errors": 0,
+            },
+        ]
+    )
+
+    report = write_json_report(str(tmp_path / "report.json"))
+    assert json.loads((tmp_path / "report.json").read_text()) == report
+    assert report["stages"]["fetch"]["seconds"] == 2.0
+    assert [r["station_id"] for r in report["stations"]] == [1, 2]
+
+    text = prometheus_text()
+    assert 'weather_ingest_stage_seconds{stage="fetch"} 2.0' in text
+    assert 'weather_ingest_stage_retries{stage="fetch"} 1' in text
@@ -0,0 +1,121 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.utils.partitions import (
+    drop_partitions,
+    ensure_partitions,
+    list_partitions,
+    partition_periods,
+)
+from src.utils.queries import SELECT_IS_PARTITIONED
+
+
+def partitioned_conn(dsn, partitioned=True):
+    conn = MagicMock()
+    conn.dsn = dsn
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (1,) if partitioned else None
+    return conn, cursor
+
+
+# ---------- partition_periods ----------
+def test_partition_periods_yearly_and_monthly():
+    yearly = partition_periods(
+        "weather_data_hourly", datetime(2019, 12, 31, 23), datetime(2020, 1, 1)
+    )
+    assert [p[0] for p in yearly] == [
+        "weather_data_hourly_y2019",
+        "weather_data_hourly_y2020",
+    ]
+    assert yearly[0][1:] == (pd.Timestamp("2019-01-01"), pd.Timestamp("2020-01-01"))
+
+    monthly = partition_periods("weather_live", "2025-12-15", "2026-01-02")
+    assert [p[0] for p in monthly] == ["weather_live_m2025_12", "weather_live_m2026_01"]
+    assert monthly[1][2] == pd.Timestamp("2026-02-01")
+
+
+# ---------- ensure_partitions ----------
+def test_ensure_partitions_creates_once_per_database():
+    conn, cursor = partitioned_conn("dbname=test_create")
+
+    created = ensure_partitions(
+        conn, "weather_data_hourly", datetime(2020, 6, 1), datetime(2021, 6, 1)
+    )
+    assert created == ["weather_data_hourly_y2020", "weather_data_hourly_y2021"]
+    sql = [c.args[0] for c in cursor.execute.call_args_list]
+    assert sum("PARTITION OF weather_data_hourly" in s for s in sql) == 2
+    conn.commit.assert_called_once()
+
+    # Known partitions are not checked again on the same database
+    cursor.reset_mock()
+    assert (
+        ensure_partitions(
+            conn, "weather_data_hourly", datetime(2020, 1, 1), datetime(2020, 2, 1)
+        )
+        == []
+    )
+    assert not cursor.execute.called
+
+    # ... but they are on another one
+    other, _ = partitioned_conn("dbname=test_other")
+    assert ensure_partitions(
+        other, "weather_data_hourly", datetime(2020, 1, 1), datetime(2020, 2, 1)
+    ) == ["weather_data_hourly_y2020"]
+
+
+def test_ensure_partitions_skips_unpartitioned_table():
+    conn, cursor = partitioned_conn("dbname=test_legacy", partitioned=False)
+
+    created = ensure_partitions(
+        conn, "weather_live", datetime(2025, 1, 1), datetime(2025, 1, 2)
+    )
+
+    assert created == []
+    cursor.execute.assert_called_once_with(SELECT_IS_PARTITIONED, ("weather_live",))
+    assert not conn.commit.called
+
+
+# ---------- list_partitions / drop_partitions ----------
+def test_list_partitions_parses_bounds_oldest_first():
+    conn, cursor = partitioned_conn("dbname=test_list")
+    cursor.fetchall.return_value = [
+        (
+            "weather_live_m2025_02",
+            "FOR VALUES FROM ('2025-02-01 00:00:00') TO ('2025-03-01 00:00:00')",
+        ),
+        (
+            "weather_live_m2025_01",
+            "FOR VALUES FROM ('2025-01-01 00:00:00') TO ('2025-02-01 00:00:00')",
+        ),
+        ("weather_live_default", "DEFAULT"),
+    ]
+
+    assert list_partitions(conn, "weather_live") == [
+        (
+            "weather_live_m2025_01",
+            pd.Timestamp("2025-01-01"),
+            pd.Timestamp("2025-02-01"),
+        ),
+        (
+            "weather_live_m2025_02",
+            pd.Timestamp("2025-02-01"),
+            pd.Timestamp("2025-03-01"),
+        ),
+    ]
+
+
+def test_dropped_partition_is_created_again():
+    conn, cursor = partitioned_conn("dbname=test_drop")
+    ensure_partitions(conn, "weather_live", datetime(2025, 1, 5), datetime(2025, 1, 6))
+
+    drop_partitions(conn, "weather_live", ["weather_live_m2025_01"])
+    assert any(
+        "DROP TABLE IF EXISTS weather_live_m2025_01" in c.args[0]
+        for c in cursor.execute.call_args_list
+    )
+
+    assert ensure_partitions(
+        conn, "weather_live", datetime(2025, 1, 5), datetime(2025, 1, 6)
+    ) == ["weather_live_m2025_01"]
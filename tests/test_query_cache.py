@@ -0,0 +1,99 @@
+import pandas as pd
+
+from src.utils.query_cache import QueryCache, cache_key
+
+
+def frame(n=10):
+    return pd.DataFrame({"a": range(n), "name": [f"station {i}" for i in range(n)]})
+
+
+def counting_loader(df):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return df
+
+    return load, calls
+
+
+# ---------- cache_key ----------
+def test_cache_key_normalizes_whitespace_and_params():
+    first = cache_key("SELECT *\n  FROM t WHERE a = ANY(%(a)s);", {"a": [1, 2], "b": 3})
+    second = cache_key("SELECT * FROM t WHERE a = ANY(%(a)s);", {"b": 3, "a": (1, 2)})
+
+    assert first == second
+    assert cache_key("SELECT 1", {"a": 1}) != cache_key("SELECT 1", {"a": 2})
+    hash(first)
+
+
+# ---------- QueryCache ----------
+def test_hit_returns_copy_without_query():
+    cache = QueryCache(watermark=lambda: (1,))
+    load, calls = counting_loader(frame())
+
+    first = cache.get_or_load("SELECT a FROM t", None, load)
+    first["a"] = -1
+    second = cache.get_or_load("SELECT a FROM t", None, load)
+
+    assert len(calls) == 1
+    assert list(second["a"]) == list(range(10))
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["entries"] == 1 and stats["bytes"] > 0
+
+
+def test_lru_eviction_keeps_bytes_under_cap():
+    size = int(frame().memory_usage(index=True, deep=True).sum())
+    cache = QueryCache(max_bytes=2 * size, watermark=lambda: (1,))
+
+    for query in ("q1", "q2"):
+        cache.get_or_load(query, None, lambda: frame())
+    # q1 is used again, so q2 is the least recently used one
+    cache.get_or_load("q1", None, lambda: frame())
+    cache.get_or_load("q3", None, lambda: frame())
+
+    load, calls = counting_loader(frame())
+    cache.get_or_load("q1", None, load)
+    cache.get_or_load("q2", None, load)
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["bytes"] <= 2 * size
+    assert stats["evictions"] >= 1
+
+
+def test_result_larger_than_cap_is_not_cached():
+    cache = QueryCache(max_bytes=10, watermark=lambda: (1,))
+    load, calls = counting_loader(frame())
+
+    cache.get_or_load("q", None, load)
+    cache.get_or_load("q", None, load)
+
+    assert len(calls) == 2
+    assert cache.stats()["bytes"] == 0
+
+
+def test_new_watermark_empties_cache():
+    watermark = [("2025-01-01", None, None)]
+    cache = QueryCache(check_every_s=0, watermark=lambda: watermark[0])
+    load, calls = counting_loader(frame())
+
+    cache.get_or_load("q", None, load)
+    cache.get_or_load("q", None, load)
+    # A loader run moved stations.last_update
+    watermark[0] = ("2025-01-02", None, None)
+    cache.get_or_load("q", None, load)
+
+    assert len(calls) == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_watermark_is_read_once_per_interval():
+    reads = []
+    cache = QueryCache(check_every_s=60, watermark=lambda: reads.append(1) or (1,))
+
+    for _ in range(5):
+        cache.get_or_load("q", None, lambda: frame())
+
+    assert len(reads) == 1
@@ -0,0 +1,165 @@
+"""
+EXPLAIN checks of the dashboard queries on a seeded throwaway database.
+
+Needs the local Postgres of the DB_* settings, skipped when it is not
+reachable.
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import psycopg2
+import pytest
+
+from src.utils import connect_db
+from src.utils.partitions import ensure_partitions
+from src.utils.queries import (
+    SELECT_DAILY_RANGE,
+    SELECT_HOURLY_DAY,
+    SELECT_STATIONS_AND_LATEST_DATA,
+)
+
+PLANS_DB = f"weather_plans_{os.getpid()}"
+STATIONS = range(15000, 15020)
+NOW = datetime(2025, 6, 15, 12)
+
+SEED = """
+INSERT INTO stations (name, country, wmo, timezone)
+SELECT 'station ' || wmo, 'RO', wmo, 'Europe/Bucharest'
+FROM generate_series(%(first)s, %(last)s) AS wmo;
+
+INSERT INTO weather_data_hourly (station_id, time, temp)
+SELECT wmo, t, random() * 30
+FROM generate_series(%(first)s, %(last)s) AS wmo,
+     generate_series(%(now)s - INTERVAL '2 years', %(now)s, INTERVAL '1 hour') AS t;
+
+INSERT INTO weather_data_daily (station_id, time, tavg, prcp)
+SELECT wmo, d::date, random() * 30, random() * 5
+FROM generate_series(%(first)s, %(last)s) AS wmo,
+     generate_series(%(now)s - INTERVAL '30 years', %(now)s, INTERVAL '1 day') AS d;
+
+-- Live snapshots arrive in time order, all stations at once
+INSERT INTO weather_live (station_id, lat, lon, dt, temp)
+SELECT wmo, 45, 25, t, 20
+FROM generate_series(%(now)s - INTERVAL '90 days', %(now)s, INTERVAL '10 minutes') AS t,
+     generate_series(%(first)s, %(last)s) AS wmo
+ORDER BY t;
+
+ANALYZE;
+"""
+
+
+@pytest.fixture(scope="module")
+def seeded_db():
+    try:
+        admin = connect_db.connect_to_db()
+    except psycopg2.Error as e:
+        pytest.skip(f"Postgres not reachable ({e})")
+
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE DATABASE {PLANS_DB} TEMPLATE template0 ENCODING 'UTF8';")
+    conn = None
+    try:
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(connect_db, "DB_NAME", PLANS_DB)
+            conn = connect_db.connect_to_db()
+        with conn.cursor() as cur, open("postgresql/create_tables.sql") as f:
+            cur.execute(f.read())
+        conn.commit()
+        start = NOW - timedelta(days=31 * 365)
+        ensure_partitions(conn, "weather_data_hourly", start, NOW)
+        ensure_partitions(conn, "weather_live", NOW - timedelta(days=90), NOW)
+
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(SEED, {"first": STATIONS[0], "last": STATIONS[-1], "now": NOW})
+            with open("postgresql/migrations/005_fill_live_latest.sql") as f:
+                cur.execute(f.read())
+        yield conn
+    finally:
+        if conn is not None:
+            conn.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP DATABASE IF EXISTS {PLANS_DB};")
+        admin.close()
+
+
+def plan_nodes(conn, query, params):
+    """Run EXPLAIN and return every node of the plan tree."""
+    with conn.cursor() as cur:
+        cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+        plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    nodes, todo = [], [plan[0]["Plan"]]
+    while todo:
+        node = todo.pop()
+        nodes.append(node)
+        todo.extend(node.get("Plans", []))
+    return nodes
+
+
+def scanned(nodes):
+    """(node type, relation, index) of every scan node."""
+    return [
+        (n["Node Type"], n.get("Relation Name"), n.get("Index Name"))
+        for n in nodes
+        if "Relation Name" in n or "Index Name" in n
+    ]
+
+
+# ---------- page queries ----------
+def test_hourly_day_uses_station_time_index_of_one_partition(seeded_db):
+    nodes = plan_nodes(
+        seeded_db,
+        SELECT_HOURLY_DAY,
+        {"station_id": 15005, "day": date(2024, 3, 10)},
+    )
+    scans = scanned(nodes)
+
+    assert all(node != "Seq Scan" for node, _, _ in scans)
+    assert {rel for _, rel, _ in scans if rel} == {"weather_data_hourly_y2024"}
+    assert any(index and "station_id_time" in index for _, _, index in scans)
+
+
+def test_daily_range_uses_station_time_index(seeded_db):
+    nodes = plan_nodes(
+        seeded_db,
+        SELECT_DAILY_RANGE,
+        {"station_id": 15005, "start": date(2020, 1, 1), "end": date(2020, 12, 31)},
+    )
+    scans = scanned(nodes)
+
+    assert all(node != "Seq Scan" for node, _, _ in scans)
+    assert "weather_data_daily_station_id_time_key" in {i for _, _, i in scans}
+
+
+def test_live_map_reads_latest_table_not_history(seeded_db):
+    nodes = plan_nodes(seeded_db, SELECT_STATIONS_AND_LATEST_DATA, None)
+
+    assert {rel for _, rel, _ in scanned(nodes) if rel} == {
+        "stations",
+        "weather_live_latest",
+    }
+
+
+def test_live_map_shows_every_station_however_old(seeded_db):
+    # The seeded snapshots end at NOW, long before today
+    with seeded_db.cursor() as cur:
+        cur.execute(SELECT_STATIONS_AND_LATEST_DATA)
+        rows = cur.fetchall()
+
+    assert len(rows) == len(STATIONS)
+
+
+def test_all_station_time_range_uses_brin(seeded_db):
+    nodes = plan_nodes(
+        seeded_db,
+        "SELECT count(*) FROM weather_live WHERE dt >= %(start)s AND dt < %(end)s;",
+        {"start": datetime(2025, 5, 10), "end": datetime(2025, 5, 11)},
+    )
+
+    assert "weather_live_m2025_05_dt_idx" in {i for _, _, i in scanned(nodes)}
@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.utils.rollups import load_rollups, refresh_rollups
+
+
+# ---------- refresh_rollups ----------
+def test_refresh_rollups_recomputes_monthly_and_yearly():
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.rowcount = 2
+
+    changed = refresh_rollups(
+        conn, 15120, pd.Timestamp("2020-12-30"), datetime(2021, 1, 2)
+    )
+
+    assert changed == 4
+    sqls = [c.args[0] for c in cursor.execute.call_args_list]
+    assert "weather_rollup_monthly" in sqls[0]
+    assert "date_trunc('month'" in sqls[0]
+    assert "weather_rollup_yearly" in sqls[1]
+    assert "date_trunc('year'" in sqls[1]
+    assert cursor.execute.call_args.args[1] == {
+        "station_id": 15120,
+        "start": date(2020, 12, 30),
+        "end": date(2021, 1, 2),
+    }
+    # The loader commits together with its checkpoint
+    assert not conn.commit.called
+
+
+def test_refresh_rollups_skips_empty_range():
+    conn = MagicMock()
+
+    assert refresh_rollups(conn, 15120, pd.NaT, pd.NaT) == 0
+    assert not conn.cursor.called
+
+
+# ---------- load_rollups ----------
+def test_load_rollups_indexes_by_period():
+    rows = pd.DataFrame(
+        {
+            "period": [date(2024, 1, 1)],
+            "days": [366],
+            "tavg": [None],
+            "tmin": [None],
+            "tmax": [None],
+            "prcp_sum": [512.5],
+        }
+    )
+    with patch("src.utils.rollups.load_data_into_df", return_value=rows) as mock_load:
+        df = load_rollups("weather_rollup_yearly", 15120, [date(2024, 1, 1)])
+
+    assert mock_load.call_args.kwargs["params"] == {
+        "station_id": 15120,
+        "periods": [date(2024, 1, 1)],
+    }
+    assert "FROM weather_rollup_yearly" in mock_load.call_args.args[0]
+    row = df.loc[pd.Timestamp("2024-01-01")]
+    assert pd.isna(row["tavg"]) and row["prcp_sum"] == 512.5
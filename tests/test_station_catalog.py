@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.celan_and_validate.clean_and_validate import is_valid_wmo
+from src.ingestion.station_catalog import (
+    catalog_fingerprint,
+    parse_wmo,
+    prepare_catalog,
+    sync_stations,
+)
+
+WMO_VALUES = [123, "123", " 123 ", "123.0", 123.0, "123.4", None, pd.NA]
+WMO_VALUES += [float("nan"), "", "<NA>", "NA", "n/a", "abc"]
+
+
+def raw_catalog():
+    return pd.DataFrame(
+        {
+            "name": ["Miercurea Ciuc", "Bad", "Odorheiu", "Cluj"],
+            "country": ["RO"] * 4,
+            "region": ["HA", "HA", "HA", "CJ"],
+            "wmo": ["15120", "<NA>", "15115.0", "15120"],
+            "icao": [None, None, None, "LRCL"],
+            "latitude": [46.37, 46.0, 46.3, 46.78],
+            "longitude": [25.77, 25.0, 25.3, 23.57],
+            "elevation": [661.0, 1.0, 500.0, 410.0],
+            "timezone": ["Europe/Bucharest"] * 4,
+            "hourly_start": ["1973-01-01", None, "1980-01-01", "1973-01-01"],
+            "hourly_end": ["2025-01-01"] * 4,
+            "daily_start": ["1960-01-01"] * 4,
+            "daily_end": ["2025-01-01"] * 4,
+        }
+    )
+
+
+# ---------- parse_wmo ----------
+@pytest.mark.parametrize("value", WMO_VALUES)
+def test_parse_wmo_matches_is_valid_wmo(value):
+    parsed = parse_wmo(pd.Series([value], dtype=object))
+    assert parsed.notna().iloc[0] == is_valid_wmo(value)
+    if is_valid_wmo(value):
+        assert parsed.iloc[0] == 123
+
+
+# ---------- prepare_catalog ----------
+def test_prepare_catalog_filters_and_types():
+    catalog = prepare_catalog(raw_catalog(), regions=["HA"])
+
+    assert catalog["wmo"].tolist() == [15115, 15120]
+    assert str(catalog["wmo"].dtype) == "Int64"
+    assert pd.api.types.is_datetime64_any_dtype(catalog["hourly_start"])
+
+
+# ---------- catalog_fingerprint ----------
+def test_catalog_fingerprint_detects_changes_only():
+    catalog = prepare_catalog(raw_catalog(), regions=["HA"])
+    fingerprint = catalog_fingerprint(catalog)
+
+    assert catalog_fingerprint(catalog.iloc[::-1]) == fingerprint
+    changed = catalog.copy()
+    changed.loc[0, "hourly_end"] = pd.Timestamp("2025-06-01")
+    assert catalog_fingerprint(changed) != fingerprint
+
+
+# ---------- sync_stations ----------
+def test_sync_stations_skips_unchanged_catalog():
+    catalog = prepare_catalog(raw_catalog(), regions=["HA"])
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = (catalog_fingerprint(catalog),)
+
+    with patch("src.ingestion.station_catalog.execute_values") as mock_execute:
+        result = sync_stations(mock_conn, catalog)
+
+    assert result["skipped"]
+    assert not mock_execute.called
+    assert not mock_conn.commit.called
+
+
+def test_sync_stations_upserts_changed_catalog():
+    catalog = prepare_catalog(raw_catalog(), regions=["HA"])
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = ("old fingerprint",)
+
+    with patch(
+        "src.ingestion.station_catalog.execute_values", return_value=[(True,)]
+    ) as mock_execute:
+        result = sync_stations(mock_conn, catalog)
+
+    assert result == {"inserted": 1, "updated": 0, "skipped": False}
+    records = mock_execute.call_args.args[2]
+    assert [r[3] for r in records] == [15115, 15120]
+    assert records[0][9] == pd.Timestamp("1980-01-01")
+    # Missing values are written as NULL
+    assert records[0][4] is None
+    assert mock_conn.commit.called
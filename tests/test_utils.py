@@ -5,11 +5,12 @@ from unittest.mock import MagicMock, patch
 from src.utils.utils import (
     get_start_date,
     rename_index_to_time,
-    prepare_to_records,
-    copy_to_db,
-    insert_into_db,
+    column_to_values,
+    upsert_to_db,
     calc_days_of_year,
     load_data_into_df,
+    iter_df_chunks,
+    read_df,
 )
 
 
@@ -32,56 +33,37 @@ def test_rename_index_to_time():
     assert df2["timestamp"].tolist() == [10, 20, 30]
 
 
-def test_prepare_to_records():
-    df = pd.DataFrame({"col1": [1, None], "col2": [None, 2]})
-    records, df_out = prepare_to_records(
-        df, station_id=5, cols=["col1", "col2", "station_id"]
-    )
-
-    # Check that station_id added
-    assert all(df_out["station_id"] == 5)
-
-    # Check records format
-    assert records[0] == (1, None, 5)
-    assert records[1] == (None, 2, 5)
+# ---------- column_to_values ----------
+def test_column_to_values_nulls():
+    assert column_to_values(pd.Series([1.0, None, float("nan")])) == [1.0, None, None]
+    assert column_to_values(pd.Series(pd.to_datetime([None]))) == [None]
 
 
-# ---------- copy_to_db ----------
-def test_copy_to_db_mock():
-    df = pd.DataFrame({"col1": [1, 2]})
+# ---------- upsert_to_db ----------
+def test_upsert_to_db_mock():
+    df = pd.DataFrame(
+        {"time": pd.to_datetime(["2025-01-01", "2025-01-02"]), "tavg": [1.0, 2.0]}
+    )
     mock_conn = MagicMock()
-    # Mock the cursor context manager
     mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
-    # Run the function
-    copy_to_db(df, mock_conn, station_id=1, cols=["col1", "station_id"])
-    # Assert copy_expert called
-    assert mock_cursor.copy_expert.called
-    assert mock_conn.commit.called
-
 
-# ---------- insert_into_db ----------
-def test_insert_into_db_mock():
-    df = pd.DataFrame({"col1": [1, 2]})
-    insert_sql = "INSERT INTO table (col1, station_id) VALUES %s"
+    upsert_to_db(
+        df,
+        mock_conn,
+        station_id=1,
+        table="weather_data_daily",
+        cols=["station_id", "time", "tavg"],
+        types={"station_id": "int4", "time": "date"},
+    )
 
-    mock_conn = MagicMock()
-    mock_cursor = MagicMock()
-    # cursor context manager belépés
-    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-
-    # Patch execute_values, mert nem akarunk valódi DB-t
-    with patch("src.utils.utils.execute_values") as mock_execute_values:
-        insert_into_db(
-            df,
-            mock_conn,
-            station_id=3,
-            insert_sql=insert_sql,
-            cols=["col1", "station_id"],
-        )
-        # ellenőrizzük, hogy execute_values hívódott
-        mock_execute_values.assert_called_once()
-        # commit hívása
-        mock_conn.commit.assert_called_once()
+    create_sql, upsert_sql = [c.args[0] for c in mock_cursor.execute.call_args_list]
+    assert "CREATE TEMP TABLE staging_weather_data_daily" in create_sql
+    assert "COPY staging_weather_data_daily" in (
+        mock_cursor.copy_expert.call_args.kwargs["sql"]
+    )
+    assert "ON CONFLICT (station_id, time) DO UPDATE" in upsert_sql
+    assert "tavg = EXCLUDED.tavg" in upsert_sql
+    mock_conn.commit.assert_called_once()
 
 
 # ---------- calc_days_of_year ----------
@@ -94,16 +76,73 @@ def test_calc_days_of_year():
 
 
 # ---------- load_data_into_df ----------
-def test_load_data_into_df_mock():
-    mock_df = pd.DataFrame({"a": [1, 2]})
-    with patch("src.utils.utils.connect_to_db") as mock_conn_func, patch(
-        "pandas.read_sql"
-    ) as mock_read_sql:
-        mock_conn = MagicMock()
-        mock_conn_func.return_value = mock_conn
-        mock_read_sql.return_value = mock_df
-        df = load_data_into_df("SELECT 1")
-        # Check returned DataFrame
-        pd.testing.assert_frame_equal(df, mock_df)
-        # Check connection closed
-        assert mock_conn.close.called
+def reader_connection(chunks, columns=("a", "b")):
+    """Pool whose connection's named cursor returns `chunks` from fetchmany."""
+    pool = MagicMock()
+    conn = pool.connection.return_value.__enter__.return_value
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.description = [(name,) for name in columns]
+    cur.fetchmany.side_effect = list(chunks) + [[]]
+    return pool, cur
+
+
+def test_read_df_mock():
+    pool, cur = reader_connection([[(1, None), (2, None)], [(3, 4.5)]])
+    conn = pool.connection.return_value.__enter__.return_value
+    with patch("src.utils.utils.get_pool", return_value=pool):
+        df = read_df(
+            "SELECT a, b FROM t WHERE a > %(a)s", params={"a": 0}, chunk_rows=2
+        )
+
+    pd.testing.assert_frame_equal(
+        df, pd.DataFrame({"a": [1, 2, 3], "b": [None, None, 4.5]})
+    )
+    # Server-side cursor, parameters passed to the driver
+    assert conn.cursor.call_args.kwargs == {"name": "load_data_reader"}
+    cur.execute.assert_called_once_with("SELECT a, b FROM t WHERE a > %(a)s", {"a": 0})
+    assert cur.fetchmany.call_args.args == (2,)
+    # Check connection given back to the pool
+    assert pool.connection.return_value.__exit__.called
+
+
+def test_read_df_empty_result_keeps_columns():
+    pool, _ = reader_connection([[]])
+    with patch("src.utils.utils.get_pool", return_value=pool):
+        df = read_df("SELECT a, b FROM t")
+
+    assert df.empty
+    assert list(df.columns) == ["a", "b"]
+
+
+def test_iter_df_chunks_releases_connection_when_stopped_early():
+    pool, cur = reader_connection([[(1, 2)], [(3, 4)]])
+    with patch("src.utils.utils.get_pool", return_value=pool):
+        chunks = iter_df_chunks("SELECT a, b FROM t", chunk_rows=1)
+        first = next(chunks)
+        chunks.close()
+
+    assert first.to_dict("list") == {"a": [1], "b": [2]}
+    assert cur.fetchmany.call_count == 1
+    assert pool.connection.return_value.__exit__.called
+
+
+def test_load_data_into_df_uses_query_cache():
+    with patch("src.utils.utils.QUERY_CACHE") as mock_cache, patch(
+        "src.utils.utils.read_df", return_value=pd.DataFrame({"a": [1]})
+    ) as mock_read:
+        load_data_into_df("SELECT a FROM t WHERE a = %(a)s", {"a": 1})
+        query, params, load = mock_cache.get_or_load.call_args.args
+        load()
+
+    assert (query, params) == ("SELECT a FROM t WHERE a = %(a)s", {"a": 1})
+    mock_read.assert_called_once_with(query, params)
+
+
+def test_load_data_into_df_without_cache():
+    with patch("src.utils.utils.USE_QUERY_CACHE", False), patch(
+        "src.utils.utils.QUERY_CACHE"
+    ) as mock_cache, patch("src.utils.utils.read_df") as mock_read:
+        load_data_into_df("SELECT 1")
+
+    assert not mock_cache.get_or_load.called
+    mock_read.assert_called_once_with("SELECT 1", None)